@@ -0,0 +1,351 @@
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import tornado.web
+from PIL import Image
+
+import batch_scoring
+import labels
+from image_preprocessing import preprocess, PEST_INPUT_SIZE, DISEASE_INPUT_SIZE
+from inference_server import get_batcher, batcher_stats
+import irrigation
+from knowledge_base import get_knowledge_base
+import tracing
+from model_registry import registry
+from prediction_cache import prediction_cache
+from weather import get_weather_service
+from gazetteer import get_gazetteer
+from tta import predict_with_tta, cache_variant, TTA_BUDGET
+from predictions import from_top_k
+
+# --- API Configuration ---
+API_HOST = os.environ.get('AGRIZEN_API_HOST', '0.0.0.0')
+API_PORT = int(os.environ.get('AGRIZEN_API_PORT', '8600'))
+# Threads for preprocessing and model calls; the event loop itself never blocks
+API_WORKERS = int(os.environ.get('AGRIZEN_API_WORKERS', '16'))
+API_MAX_UPLOAD_MB = float(os.environ.get('AGRIZEN_API_MAX_UPLOAD_MB', '20'))
+# Rows accepted in one JSON recommendation request
+API_MAX_ROWS = int(os.environ.get('AGRIZEN_API_MAX_ROWS', '10000'))
+
+IMAGE_MODELS = {
+    'pest': {'model': 'pest_model', 'size': PEST_INPUT_SIZE, 'labels': labels.pest_class_names},
+    'disease': {'model': 'disease_model', 'size': DISEASE_INPUT_SIZE, 'labels': labels.disease_class_labels},
+}
+
+
+class APIError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# --- Blocking Work (runs on the executor) ---
+def require_model(name, load):
+    try:
+        return load(name)
+    except Exception as e:
+        raise APIError(503, f"Model {name} unavailable: {e}")
+
+
+def predict_image(kind, image_bytes, budget=1, language='en'):
+    spec = IMAGE_MODELS[kind]
+    name = spec['model']
+    if not registry.available(name):
+        raise APIError(503, f"Model {name} unavailable: file not found")
+
+    def compute():
+        # Concurrent requests from every executor thread share one batch
+        batcher = require_model(name, get_batcher)
+        try:
+            with tracing.span('preprocess'):
+                tensor, _ = preprocess(image_bytes, spec['size'])
+        except Image.DecompressionBombError as e:
+            # Small upload, huge canvas: refused before PIL allocates the pixels
+            raise APIError(413, f"Image too large: {e}")
+        except (OSError, SyntaxError, ValueError) as e:
+            # PIL raises these for truncated or non-image uploads
+            raise APIError(400, f"Could not decode image: {e}")
+        with tracing.span('inference'):
+            return predict_with_tta(batcher, tensor, budget)
+
+    tracing.set_page(f"api/{kind}")
+    top_predictions = prediction_cache.get_or_compute(image_bytes, name, compute, variant=cache_variant(budget))
+    with tracing.span('postprocess'):
+        result = from_top_k(name, top_predictions, spec['labels']).as_dict()
+        result['remedy'] = get_knowledge_base().remedy(name, result['index'], language)
+    return result
+
+
+def recommend(kind, rows):
+    model = require_model(batch_scoring.SCHEMAS[kind]['model'], registry.get)
+    tracing.set_page(f"api/{kind}")
+    # Plain arrays: building a DataFrame costs more than the forest itself
+    with tracing.span('preprocess'):
+        features = batch_scoring.encode_records(rows, kind)
+    with tracing.span('inference'):
+        results = batch_scoring.predict_top_k(model, features, kind)
+    return [result.as_dict() for result in results]
+
+
+def irrigation_advice(body):
+    if 'soil_moisture' not in body:
+        raise APIError(400, "soil_moisture is required")
+    if 'crop_type' not in body:
+        raise APIError(400, f"crop_type is required: one of {', '.join(irrigation.CROP_TYPES)}")
+    options = dict(irrigation.FIELD_DEFAULTS, **body)
+    numbers = {}
+    for name in ('soil_moisture', 'temperature', 'humidity', 'days_since_rain'):
+        try:
+            numbers[name] = float(options[name])
+        except (TypeError, ValueError):
+            raise APIError(400, f"{name} must be a number")
+    latitude = irrigation.DEFAULT_LATITUDE
+    if body.get('latitude') is not None:
+        try:
+            latitude = float(body['latitude'])
+        except (TypeError, ValueError):
+            raise APIError(400, "latitude must be a number")
+    elif body.get('location'):
+        place = get_gazetteer().resolve(str(body['location']))
+        if place is None:
+            raise APIError(422, f"Unknown location {body['location']!r}")
+        latitude = place.latitude
+    try:
+        return irrigation.recommend_irrigation(numbers['soil_moisture'], body['crop_type'], options['soil_type'],
+                                               numbers['temperature'], numbers['humidity'],
+                                               numbers['days_since_rain'], latitude=latitude)
+    except ValueError as e:
+        raise APIError(422, str(e))
+
+
+def irrigation_schedule(rows):
+    import pandas as pd
+    tracing.set_page("api/irrigation")
+    fields = pd.DataFrame.from_records(rows)
+    try:
+        with tracing.span('inference'):
+            result = irrigation.simulate_frame(fields)
+    except (TypeError, ValueError) as e:
+        raise APIError(422, str(e))
+    ids = fields['field_id'] if 'field_id' in fields.columns else None
+    return irrigation.schedule(result, ids).to_dict(orient='records')
+
+
+def weather_report(location, days):
+    place = get_gazetteer().resolve(location)
+    if place is None:
+        raise APIError(404, f"No place called {location!r} in the gazetteer")
+    forecast, km = get_weather_service().forecast_near(place)
+    if forecast is None:
+        raise APIError(404, f"No forecast data near {place.label}")
+    current = forecast.current()
+    current['time'] = current['time'].isoformat()
+    return {'place': place.as_dict(), 'location': forecast.name, 'distance_km': round(km, 1), 'current': current,
+            'daily': forecast.daily(days).to_dict(orient='records')}
+
+
+# --- Handlers ---
+class BaseHandler(tornado.web.RequestHandler):
+    def initialize(self, executor):
+        self.executor = executor
+
+    def set_default_headers(self):
+        self.set_header('Content-Type', 'application/json')
+
+    def run_blocking(self, fn, *args):
+        return asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def json_body(self):
+        try:
+            return json.loads(self.request.body or b'null')
+        except ValueError:
+            raise APIError(400, "Request body is not valid JSON")
+
+    def on_finish(self):
+        # Whole request including executor queueing; unmatched paths share one series
+        page = 'api/not_found' if self.get_status() == 404 else f"api{self.request.path}"
+        tracing.record('request', self.request.request_time(), page=page)
+
+    def write_json(self, payload, status=200):
+        self.set_status(status)
+        self.finish(json.dumps(payload))
+
+    def write_error(self, status_code, **kwargs):
+        error = kwargs.get('exc_info', (None, None, None))[1]
+        if isinstance(error, APIError):
+            self.set_status(error.status)
+            message = error.message
+        elif isinstance(error, batch_scoring.SchemaError):
+            self.set_status(422)
+            message = str(error)
+        else:
+            message = self._reason
+        self.finish(json.dumps({'error': message}))
+
+    def log_exception(self, typ, value, tb):
+        # Client mistakes are answered with 4xx/503 bodies, not logged as crashes
+        if not isinstance(value, (APIError, batch_scoring.SchemaError)):
+            super().log_exception(typ, value, tb)
+
+
+class MetricsHandler(BaseHandler):
+    def get(self):
+        self.set_header('Content-Type', 'text/plain; version=0.0.4')
+        self.write(tracing.prometheus_text())
+
+
+class HealthHandler(BaseHandler):
+    def get(self):
+        status = registry.status()
+        ready = all(info['ready'] for info in status.values() if info['available'])
+        self.write_json({'ready': ready, 'models': status, 'batchers': batcher_stats(),
+                         'prediction_cache': prediction_cache.stats()})
+
+
+class ImagePredictionHandler(BaseHandler):
+    def image_bytes(self):
+        """Image from a multipart "image" field, a raw image body or JSON base64."""
+        files = self.request.files
+        if files:
+            uploads = files.get('image') or next(iter(files.values()))
+            return uploads[0]['body']
+        content_type = self.request.headers.get('Content-Type', '')
+        if content_type.startswith('image/') or content_type == 'application/octet-stream':
+            return self.request.body
+        body = self.json_body()
+        if isinstance(body, dict) and body.get('image_base64'):
+            try:
+                return base64.b64decode(body['image_base64'], validate=True)
+            except (binascii.Error, ValueError):
+                raise APIError(400, "image_base64 is not valid base64")
+        raise APIError(400, "Send the image as multipart field 'image', a raw image body or image_base64")
+
+    def tta_budget(self):
+        """?tta=1 uses the configured budget, ?tta=<n> asks for n views."""
+        value = self.get_argument('tta', '0').strip().lower()
+        if value in ('', '0', 'false', 'no'):
+            return 1
+        if value in ('true', 'yes'):
+            return TTA_BUDGET
+        try:
+            budget = int(value)
+        except ValueError:
+            raise APIError(400, "tta must be a boolean or a view count")
+        return TTA_BUDGET if budget == 1 else budget
+
+    async def post(self, kind):
+        image_bytes = self.image_bytes()
+        if not image_bytes:
+            raise APIError(400, "Empty image upload")
+        budget = self.tta_budget()
+        start = time.perf_counter()
+        language = self.get_argument('lang', 'en')
+        payload = await self.run_blocking(predict_image, kind, image_bytes, budget, language)
+        payload['seconds'] = time.perf_counter() - start
+        self.write_json(payload)
+
+
+class RecommendationHandler(BaseHandler):
+    async def post(self, kind):
+        body = self.json_body()
+        single = isinstance(body, dict)
+        rows = [body] if single else body
+        if not isinstance(rows, list) or not rows or not all(isinstance(r, dict) for r in rows):
+            raise APIError(400, "Send one JSON object of features or a non-empty list of them")
+        if len(rows) > API_MAX_ROWS:
+            raise APIError(413, f"At most {API_MAX_ROWS} rows per request; use batch_scoring.py for files")
+        start = time.perf_counter()
+        results = await self.run_blocking(recommend, kind, rows)
+        payload = dict(results[0]) if single else {'model': results[0]['model'], 'results': results}
+        payload['seconds'] = time.perf_counter() - start
+        self.write_json(payload)
+
+
+class IrrigationHandler(BaseHandler):
+    async def post(self):
+        body = self.json_body()
+        single = isinstance(body, dict)
+        rows = [body] if single else body
+        if not isinstance(rows, list) or not rows or not all(isinstance(r, dict) for r in rows):
+            raise APIError(400, "Send one JSON object of field readings or a non-empty list of them")
+        if len(rows) > API_MAX_ROWS:
+            raise APIError(413, f"At most {API_MAX_ROWS} fields per request")
+        if single:
+            self.write_json(await self.run_blocking(irrigation_advice, body))
+            return
+        start = time.perf_counter()
+        plan = await self.run_blocking(irrigation_schedule, rows)
+        self.write_json({'schedule': plan, 'seconds': time.perf_counter() - start})
+
+
+class WeatherHandler(BaseHandler):
+    async def get(self):
+        location = self.get_query_argument('location', '').strip()
+        if not location:
+            raise APIError(400, "location is required")
+        try:
+            days = int(self.get_query_argument('days', '7'))
+        except ValueError:
+            raise APIError(400, "days must be an integer")
+        # Concurrent requests for one place share a single store lookup
+        self.write_json(await self.run_blocking(weather_report, location, max(1, min(days, 16))))
+
+
+class PlacesHandler(BaseHandler):
+    def get(self):
+        try:
+            limit = max(1, min(int(self.get_query_argument('limit', '10')), 50))
+        except ValueError:
+            raise APIError(400, "limit must be an integer")
+        # Sub-millisecond against the mapped index, so it runs on the event loop
+        places = get_gazetteer().search(self.get_query_argument('q', ''), limit)
+        self.write_json({'places': [place.as_dict() for place in places]})
+
+
+class NotFoundHandler(BaseHandler):
+    def prepare(self):
+        raise APIError(404, f"No endpoint at {self.request.path}")
+
+
+# --- Application ---
+def make_app(executor=None):
+    executor = executor or ThreadPoolExecutor(API_WORKERS, thread_name_prefix='api-worker')
+    options = {'executor': executor}
+    return tornado.web.Application([
+        (r'/health', HealthHandler, options),
+        (r'/metrics', MetricsHandler, options),
+        (r'/predict/(pest|disease)', ImagePredictionHandler, options),
+        (r'/recommend/(crop|fertilizer)', RecommendationHandler, options),
+        (r'/irrigation', IrrigationHandler, options),
+        (r'/weather', WeatherHandler, options),
+        (r'/places', PlacesHandler, options),
+    ], default_handler_class=NotFoundHandler, default_handler_args=options)
+
+
+async def serve(host=API_HOST, port=API_PORT):
+    app = make_app()
+    app.listen(port, address=host, max_body_size=int(API_MAX_UPLOAD_MB * 1024 * 1024))
+    print(f"AgriZen API listening on http://{host}:{port}", flush=True)
+    await asyncio.Event().wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless JSON/multipart API over the shared models.")
+    parser.add_argument('--host', default=API_HOST)
+    parser.add_argument('--port', type=int, default=API_PORT)
+    args = parser.parse_args(argv)
+    registry.preload_from_env()
+    asyncio.run(serve(args.host, args.port))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
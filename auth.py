@@ -0,0 +1,226 @@
+import base64
+import hashlib
+import hmac
+import os
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import tracing
+from db import get_database, DatabaseError, IntegrityError
+
+# --- Auth Configuration ---
+# Tokens are signed with this key; unset, a random key is drawn per process
+# and every session ends when the process restarts (they live in memory anyway).
+AUTH_SECRET = os.environ.get('AGRIZEN_AUTH_SECRET', '')
+SESSION_TTL_SECONDS = float(os.environ.get('AGRIZEN_SESSION_TTL_SECONDS', str(12 * 3600)))
+SESSION_CACHE_MAX_ENTRIES = int(os.environ.get('AGRIZEN_SESSION_CACHE_MAX_ENTRIES', '10000'))
+# scrypt needs 128 * n * r bytes per hash (16 MiB at the defaults), so the
+# worker count bounds both CPU and memory spent on logins.
+SCRYPT_N = int(os.environ.get('AGRIZEN_SCRYPT_N', str(2 ** 14)))
+SCRYPT_R = int(os.environ.get('AGRIZEN_SCRYPT_R', '8'))
+SCRYPT_P = int(os.environ.get('AGRIZEN_SCRYPT_P', '1'))
+HASH_WORKERS = int(os.environ.get('AGRIZEN_AUTH_HASH_WORKERS', '4'))
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+EMAIL_PATTERN = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+
+
+class AuthError(Exception):
+    pass
+
+
+class EmailTaken(AuthError):
+    pass
+
+
+def is_valid_email(email):
+    return EMAIL_PATTERN.match(email) is not None
+
+
+# --- Password Hashing ---
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, dklen=KEY_BYTES,
+                          maxmem=2 * 128 * n * r * p + (1 << 20))
+
+
+def hash_password(password, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P):
+    """Salted scrypt hash, stored as scrypt$n$r$p$salt$key."""
+    salt = os.urandom(SALT_BYTES)
+    return f"scrypt${n}${r}${p}${_b64encode(salt)}${_b64encode(_scrypt(password, salt, n, r, p))}"
+
+
+def verify_password(password, stored):
+    """Return (matches, needs_rehash) for a stored hash.
+
+    Accounts created before salted hashes carry a bare SHA-256 hex digest;
+    those still verify and are flagged for an upgrade.
+    """
+    if stored.startswith('scrypt$'):
+        try:
+            _, n, r, p, salt, key = stored.split('$')
+            n, r, p = int(n), int(r), int(p)
+            salt, key = _b64decode(salt), _b64decode(key)
+        except ValueError:
+            return False, False
+        matches = hmac.compare_digest(_scrypt(password, salt, n, r, p), key)
+        return matches, matches and (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    legacy = hashlib.sha256(password.encode()).hexdigest()
+    matches = hmac.compare_digest(legacy, stored)
+    return matches, matches
+
+
+# --- Session Tokens ---
+class Session:
+    __slots__ = ('session_id', 'user_id', 'username', 'expires_at')
+
+    def __init__(self, session_id, user_id, username, expires_at):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.username = username
+        self.expires_at = expires_at
+
+
+class SessionStore:
+    """Signed session tokens validated against an in-memory LRU with a TTL.
+
+    A token is "<session id>.<expiry>.<signature>". The signature lets
+    forged or corrupted tokens be rejected without a lookup; the LRU holds
+    the user behind each live session, so a page view never reaches the
+    database. Logging out, eviction and expiry all end a session.
+    """
+
+    def __init__(self, secret=AUTH_SECRET, ttl=SESSION_TTL_SECONDS, max_entries=SESSION_CACHE_MAX_ENTRIES):
+        self._secret = secret.encode() if secret else secrets.token_bytes(32)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'issued': 0, 'hits': 0, 'misses': 0, 'rejected': 0, 'expired': 0, 'evicted': 0,
+                       'revoked': 0}
+
+    def _sign(self, payload):
+        return _b64encode(hmac.new(self._secret, payload.encode(), hashlib.sha256).digest())
+
+    def _parse(self, token):
+        parts = token.split('.') if token else ()
+        if len(parts) != 3 or not hmac.compare_digest(self._sign(f"{parts[0]}.{parts[1]}"), parts[2]):
+            return None, None
+        try:
+            return parts[0], int(parts[1])
+        except ValueError:
+            return None, None
+
+    def issue(self, user_id, username):
+        session_id = secrets.token_urlsafe(18)
+        expires_at = int(time.time() + self.ttl)
+        payload = f"{session_id}.{expires_at}"
+        with self._lock:
+            self._sessions[session_id] = Session(session_id, user_id, username, expires_at)
+            self._stats['issued'] += 1
+            while len(self._sessions) > self.max_entries:
+                self._sessions.popitem(last=False)
+                self._stats['evicted'] += 1
+        return f"{payload}.{self._sign(payload)}"
+
+    def validate(self, token):
+        """Return the Session behind a token, or None if it is not live."""
+        session_id, expires_at = self._parse(token)
+        with self._lock:
+            if session_id is None:
+                self._stats['rejected'] += 1
+                return None
+            if expires_at <= time.time():
+                self._sessions.pop(session_id, None)
+                self._stats['expired'] += 1
+                return None
+            session = self._sessions.get(session_id)
+            if session is None:
+                self._stats['misses'] += 1
+                return None
+            self._sessions.move_to_end(session_id)
+            self._stats['hits'] += 1
+            return session
+
+    def revoke(self, token):
+        session_id, _ = self._parse(token)
+        with self._lock:
+            if session_id is not None and self._sessions.pop(session_id, None) is not None:
+                self._stats['revoked'] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, entries=len(self._sessions), max_entries=self.max_entries)
+
+
+# --- Authenticator ---
+class Authenticator:
+    """Login and registration over the users table.
+
+    Hashing runs on a small dedicated pool: scrypt releases the GIL, so
+    other sessions' scripts keep running while a login waits on it.
+    """
+
+    def __init__(self, db, sessions, workers=HASH_WORKERS):
+        self.db = db
+        self.sessions = sessions
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='auth-hash')
+        # Unknown emails are checked against this so they take as long as a wrong password
+        self._decoy = hash_password(secrets.token_urlsafe(16))
+
+    def _hash(self, fn, *args):
+        with tracing.span('password_hash'):
+            return self._executor.submit(fn, *args).result()
+
+    def _upgrade(self, user_id, password):
+        try:
+            self.db.execute('update_password', (hash_password(password), user_id))
+        except DatabaseError:
+            pass  # Retried on the next login
+
+    def login(self, email, password):
+        """Return (token, session) for valid credentials, else None."""
+        user = self.db.execute('find_login', (email.strip(),), fetch='one')
+        matches, needs_rehash = self._hash(verify_password, password, user['password'] if user else self._decoy)
+        if user is None or not matches:
+            return None
+        if needs_rehash:
+            self._executor.submit(self._upgrade, user['id'], password)
+        token = self.sessions.issue(user['id'], user['username'])
+        return token, self.sessions.validate(token)
+
+    def register(self, username, email, password):
+        hashed = self._hash(hash_password, password)
+        try:
+            return self.db.execute('insert_user', (username.strip(), email.strip(), hashed))
+        except IntegrityError as e:
+            raise EmailTaken(f"An account with {email.strip()} already exists") from e
+
+    def logout(self, token):
+        self.sessions.revoke(token)
+
+
+_authenticator = None
+_authenticator_lock = threading.Lock()
+
+
+def get_authenticator():
+    """Process-wide authenticator; sessions are shared by every browser tab it issued them to."""
+    global _authenticator
+    if _authenticator is None:
+        with _authenticator_lock:
+            if _authenticator is None:
+                _authenticator = Authenticator(get_database(), SessionStore())
+    return _authenticator
@@ -0,0 +1,233 @@
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# --- Schemas and Label Tables ---
+CROP_FEATURES = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
+FERTILIZER_FEATURES = ['Temparature', 'Humidity', 'Moisture', 'Soil_Type', 'Crop_Type',
+                       'Nitrogen', 'Potassium', 'Phosphorous']
+
+crop_dict = {
+    0: 'rice', 1: 'maize', 2: 'chickpea', 3: 'kidneybeans', 4: 'pigeonpeas',
+    5: 'mothbeans', 6: 'mungbean', 7: 'blackgram', 8: 'lentil', 9: 'pomegranate',
+    10: 'banana', 11: 'mango', 12: 'grapes', 13: 'watermelon', 14: 'muskmelon',
+    15: 'apple', 16: 'orange', 17: 'papaya', 18: 'coconut', 19: 'cotton',
+    20: 'jute', 21: 'coffee'
+}
+soil_dict = {'Clayey': 0, 'Loamy': 1, 'Red': 2, 'Black': 3, 'Sandy': 4}
+fertilizer_crop_dict = {
+    'rice': 0, 'Wheat': 1, 'Tobacco': 2, 'Sugarcane': 3, 'Pulses': 4,
+    'pomegranate': 5, 'Paddy': 6, 'Oil seeds': 7, 'Millets': 8, 'Maize': 9,
+    'Ground Nuts': 10, 'Cotton': 11, 'coffee': 12, 'watermelon': 13,
+    'Barley': 14, 'kidneybeans': 15, 'orange': 16
+}
+fertilizer_dict = {
+    'Urea': 0, 'TSP': 1, 'Superphosphate': 2, 'Potassium sulfate.': 3,
+    'Potassium chloride': 4, 'DAP': 5, '28-28': 6, '20-20': 7,
+    '17-17-17': 8, '15-15-15': 9, '14-35-14': 10, '14-14-14': 11,
+    '10-26-26': 12, '10-10-10': 13
+}
+inv_fertilizer_dict = {v: k for k, v in fertilizer_dict.items()}
+
+SCHEMAS = {
+    'crop': {
+        'model': 'crop_model',
+        'features': CROP_FEATURES,
+        'categorical': {},
+        'labels': crop_dict,
+        'unknown': "Unknown Crop",
+        'output_column': 'recommended_crop',
+    },
+    'fertilizer': {
+        'model': 'fertilizer_model',
+        'features': FERTILIZER_FEATURES,
+        'categorical': {'Soil_Type': soil_dict, 'Crop_Type': fertilizer_crop_dict},
+        'labels': inv_fertilizer_dict,
+        'unknown': "Unknown",
+        'output_column': 'recommended_fertilizer',
+    },
+}
+
+DEFAULT_CHUNK_SIZE = 50000
+
+
+class SchemaError(ValueError):
+    pass
+
+
+# --- Validation and Encoding ---
+def validate_columns(columns, kind):
+    missing = [c for c in SCHEMAS[kind]['features'] if c not in columns]
+    if missing:
+        raise SchemaError(f"Missing columns for {kind} scoring: {', '.join(missing)}")
+
+
+def encode_features(frame, kind):
+    schema = SCHEMAS[kind]
+    validate_columns(frame.columns, kind)
+    features = frame[schema['features']].copy()
+    for column, mapping in schema['categorical'].items():
+        # Categorical columns may hold either the label or its numeric code
+        values = features[column]
+        if pd.api.types.is_numeric_dtype(values):
+            codes = values
+        else:
+            codes = values.map(mapping).fillna(pd.to_numeric(values, errors='coerce'))
+        # Blank cells are reported below with the other missing values
+        bad = values[values.notna() & ~codes.isin(list(mapping.values()))].unique()
+        if len(bad):
+            raise SchemaError(f"Unknown {column} values: {', '.join(map(str, bad[:10]))}")
+        features[column] = codes
+    try:
+        features = features.astype(np.float64)
+    except (TypeError, ValueError) as e:
+        raise SchemaError(f"Non-numeric values in {kind} features: {e}")
+    # Blank CSV cells read as NaN, which the forests would score without complaint
+    invalid = ~np.isfinite(features.to_numpy())
+    if invalid.any():
+        rows = features.index[invalid.any(axis=1)]
+        columns = features.columns[invalid.any(axis=0)]
+        raise SchemaError(f"Missing or non-finite {kind} features ({', '.join(columns)}) in {len(rows)} rows: "
+                          f"{', '.join(map(str, rows[:10]))}{', ...' if len(rows) > 10 else ''}")
+    return features
+
+
+def encode_records(records, kind):
+    """encode_features for a few JSON-style dicts, without building a DataFrame."""
+    schema = SCHEMAS[kind]
+    features = schema['features']
+    matrix = np.empty((len(records), len(features)), dtype=np.float64)
+    for i, record in enumerate(records):
+        validate_columns(record, kind)
+        for j, column in enumerate(features):
+            value = record[column]
+            mapping = schema['categorical'].get(column)
+            if mapping is not None and value is not None:
+                if isinstance(value, str) and value in mapping:
+                    value = mapping[value]
+                else:
+                    try:
+                        code = float(value)
+                    except (TypeError, ValueError):
+                        code = None
+                    if code not in mapping.values():
+                        raise SchemaError(f"Unknown {column} values: {value}")
+                    value = code
+            try:
+                matrix[i, j] = value
+            except (TypeError, ValueError):
+                raise SchemaError(f"Non-numeric values in {kind} features: {column}={value!r}")
+            # numpy stores None and "NaN"/"inf" strings without complaint
+            if not np.isfinite(matrix[i, j]):
+                raise SchemaError(f"Missing or non-finite value in {kind} record {i}: {column}={value!r}")
+    return matrix
+
+
+def predict_top_k(model, features, kind, k=None):
+    """Calibrated top-k Predictions from one predict_proba pass over encoded features."""
+    from predictions import from_probabilities, TOP_K
+    schema = SCHEMAS[kind]
+    return from_probabilities(schema['model'], model.predict_proba(features), schema['labels'],
+                              k=k or TOP_K, classes=model.classes_, unknown=schema['unknown'])
+
+
+def score_frame(model, frame, kind):
+    schema = SCHEMAS[kind]
+    predictions = model.predict(encode_features(frame, kind))
+    result = frame.copy()
+    result[schema['output_column']] = pd.Series(predictions, index=frame.index).map(
+        lambda p: schema['labels'].get(p, schema['unknown']))
+    return result
+
+
+# --- File Streaming ---
+def _is_parquet(name):
+    return str(name).lower().endswith(('.parquet', '.pq'))
+
+
+def iter_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE, parquet=None):
+    if parquet is None:
+        parquet = _is_parquet(getattr(source, 'name', source))
+    try:
+        if parquet:
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(source, chunksize=chunk_size)
+    except FileNotFoundError:
+        raise
+    except (ValueError, UnicodeError, OSError) as e:
+        # Malformed CSV, wrong encoding or a corrupt Parquet file (pyarrow's errors
+        # derive from ValueError/OSError): the upload is at fault, not the model
+        raise SchemaError(f"Could not read the file as {'Parquet' if parquet else 'CSV'}: {e}") from e
+
+
+def score_file(model, source, kind, output, chunk_size=DEFAULT_CHUNK_SIZE, parquet_out=None):
+    """Score a CSV/Parquet source chunk by chunk into output; returns throughput stats."""
+    if parquet_out is None:
+        parquet_out = _is_parquet(getattr(output, 'name', output))
+    rows = 0
+    writer = None
+    start = time.perf_counter()
+    for index, chunk in enumerate(iter_chunks(source, chunk_size)):
+        if index == 0:
+            validate_columns(chunk.columns, kind)
+        scored = score_frame(model, chunk, kind)
+        if parquet_out:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(scored, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(output, table.schema)
+            writer.write_table(table)
+        else:
+            scored.to_csv(output, header=(index == 0), index=False,
+                          mode='w' if index == 0 else 'a')
+        rows += len(scored)
+    if writer is not None:
+        writer.close()
+    seconds = time.perf_counter() - start
+    return {'rows': rows, 'seconds': seconds, 'rows_per_second': rows / seconds if seconds > 0 else 0.0}
+
+
+def score_to_bytes(model, source, kind, chunk_size=DEFAULT_CHUNK_SIZE, parquet_out=False):
+    if parquet_out:
+        buffer = io.BytesIO()
+        stats = score_file(model, source, kind, buffer, chunk_size, parquet_out=True)
+        return buffer.getvalue(), stats
+    buffer = io.StringIO()
+    stats = score_file(model, source, kind, buffer, chunk_size, parquet_out=False)
+    return buffer.getvalue().encode('utf-8'), stats
+
+
+# --- Command Line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score soil-test spreadsheets against the crop or fertilizer model.")
+    parser.add_argument('kind', choices=sorted(SCHEMAS))
+    parser.add_argument('input', help="CSV or Parquet file")
+    parser.add_argument('-o', '--output', help="output file (defaults to <input>_scored.<ext>)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    from model_registry import registry
+    root, ext = os.path.splitext(args.input)
+    output = args.output or f"{root}_scored{ext or '.csv'}"
+    model = registry.get(SCHEMAS[args.kind]['model'])
+    try:
+        stats = score_file(model, args.input, args.kind, output, args.chunk_size)
+    except SchemaError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(f"Scored {stats['rows']} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_second']:.0f} rows/s) -> {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
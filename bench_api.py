@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+import numpy as np
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError, HTTPRequest
+
+# --- Request Payloads ---
+SAMPLE_JSON = {
+    'crop': {'N': 90, 'P': 42, 'K': 43, 'temperature': 20.9, 'humidity': 82.0, 'ph': 6.5, 'rainfall': 202.9},
+    'fertilizer': {'Temparature': 26, 'Humidity': 52, 'Moisture': 38, 'Soil_Type': 'Sandy',
+                   'Crop_Type': 'Maize', 'Nitrogen': 37, 'Potassium': 0, 'Phosphorous': 0},
+    'irrigation': {'soil_moisture': 25, 'crop_type': 'Rice'},
+}
+ENDPOINTS = {
+    'crop': '/recommend/crop',
+    'fertilizer': '/recommend/fertilizer',
+    'irrigation': '/irrigation',
+    'pest': '/predict/pest',
+    'disease': '/predict/disease',
+}
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def multipart_body(image_bytes, filename='upload.jpg'):
+    boundary = uuid.uuid4().hex
+    body = (f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="image"; filename="{filename}"\r\n'
+            f"Content-Type: image/jpeg\r\n\r\n").encode() + image_bytes + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def build_request(base_url, endpoint, image_bytes=None):
+    url = base_url.rstrip('/') + ENDPOINTS[endpoint]
+    if endpoint in ('pest', 'disease'):
+        body, content_type = multipart_body(image_bytes)
+    else:
+        body, content_type = json.dumps(SAMPLE_JSON[endpoint]).encode(), 'application/json'
+    return HTTPRequest(url, method='POST', body=body, headers={'Content-Type': content_type},
+                       request_timeout=120)
+
+
+# --- Load Generator ---
+async def run_load(request, total, concurrency):
+    client = AsyncHTTPClient(max_clients=concurrency)
+    latencies, errors = [], {}
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                await client.fetch(request)
+            except HTTPClientError as e:
+                errors[e.code] = errors.get(e.code, 0) + 1
+                continue
+            except OSError as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def summarize(endpoint, concurrency, latencies, errors, elapsed):
+    ms = 1000 * np.asarray(latencies) if latencies else np.zeros(1)
+    return {
+        'endpoint': endpoint,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors,
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p90_ms': float(np.percentile(ms, 90)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'max_ms': float(ms.max()),
+    }
+
+
+def start_server(port):
+    env = dict(os.environ, AGRIZEN_API_PORT=str(port))
+    server = subprocess.Popen([sys.executable, os.path.join(BASE_DIR, 'api_server.py'), '--host', '127.0.0.1'],
+                              cwd=BASE_DIR, env=env, stdout=subprocess.PIPE, text=True)
+    # The server prints its address once it is accepting connections
+    server.stdout.readline()
+    return server
+
+
+async def main_async(args):
+    image_bytes = None
+    if args.image:
+        with open(args.image, 'rb') as f:
+            image_bytes = f.read()
+    results = []
+    for endpoint in args.endpoints:
+        if endpoint in ('pest', 'disease') and image_bytes is None:
+            print(f"skipping {endpoint}: pass --image to load-test image endpoints")
+            continue
+        request = build_request(args.url, endpoint, image_bytes)
+        # Warm-up so model loading is not counted against the first requests
+        await run_load(request, min(args.concurrency, args.requests), args.concurrency)
+        for concurrency in args.concurrency_levels or [args.concurrency]:
+            result = summarize(endpoint, concurrency, *await run_load(request, args.requests, concurrency))
+            results.append(result)
+            print(f"{endpoint:11} c={concurrency:<4} {result['requests_per_second']:8.1f} req/s  "
+                  f"p50 {result['p50_ms']:7.1f} ms  p99 {result['p99_ms']:7.1f} ms  errors {result['errors']}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the REST API and report latency percentiles.")
+    parser.add_argument('--url', default='http://127.0.0.1:8600')
+    parser.add_argument('--endpoints', nargs='*', default=['crop', 'fertilizer', 'irrigation'],
+                        choices=sorted(ENDPOINTS))
+    parser.add_argument('--image', help="JPEG/PNG used for the pest and disease endpoints")
+    parser.add_argument('-n', '--requests', type=int, default=500)
+    parser.add_argument('-c', '--concurrency', type=int, default=32)
+    parser.add_argument('--concurrency-levels', type=int, nargs='*',
+                        help="sweep several concurrency levels instead of --concurrency")
+    parser.add_argument('--spawn', action='store_true', help="start api_server.py locally for the run")
+    parser.add_argument('-o', '--output', default='api_benchmark.json')
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        port = int(args.url.rsplit(':', 1)[-1].strip('/'))
+        server = start_server(port)
+    try:
+        results = asyncio.run(main_async(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+import auth
+from db import Database, SQLiteBackend
+
+PASSWORD = 'correct horse battery staple'
+
+
+def seed(db, users, hashed):
+    # One shared hash keeps setup short; verifying it costs the same as a per-user hash
+    db.executemany('insert_user', [(f"farmer{i}", f"farmer{i}@example.in", hashed) for i in range(users)])
+
+
+def uses_email_index(db):
+    with db.pool.connection() as conn:
+        plan = conn.execute("EXPLAIN QUERY PLAN " + db._statements['find_login'], ('x',)).fetchall()
+    return any('idx_users_email' in str(row) for row in plan)
+
+
+class StallProbe:
+    """Measures how late a short sleep wakes up while logins run, as another script thread would see it."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.worst = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            time.sleep(self.interval)
+            self.worst = max(self.worst, time.perf_counter() - start - self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def concurrent_logins(authenticator, users, concurrency):
+    latencies = [None] * users
+    tokens = [None] * users
+    failures = []
+    barrier = threading.Barrier(concurrency)
+
+    def worker(indices):
+        barrier.wait()
+        for i in indices:
+            start = time.perf_counter()
+            try:
+                login = authenticator.login(f"farmer{i}@example.in", PASSWORD)
+            except Exception as e:
+                failures.append(repr(e))
+                continue
+            latencies[i] = time.perf_counter() - start
+            if login is None:
+                failures.append(f"farmer{i} rejected")
+            else:
+                tokens[i] = login[0]
+
+    threads = [threading.Thread(target=worker, args=(range(t, users, concurrency),)) for t in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return elapsed, np.array([x for x in latencies if x is not None]), [t for t in tokens if t], failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent logins and session validation against a SQLite stand-in.")
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=1000)
+    parser.add_argument('--scrypt-n', type=int, default=auth.SCRYPT_N)
+    parser.add_argument('--workers', type=int, default=auth.HASH_WORKERS)
+    parser.add_argument('--validations', type=int, default=100_000)
+    parser.add_argument('-o', '--output', default='auth_benchmark.json')
+    args = parser.parse_args(argv)
+
+    # The stored hash carries its own cost, so verification follows --scrypt-n
+    auth.SCRYPT_N = args.scrypt_n
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(SQLiteBackend(os.path.join(tmp, 'auth.db')))
+        db.migrate()
+        hash_start = time.perf_counter()
+        hashed = auth.hash_password(PASSWORD, n=args.scrypt_n)
+        hash_seconds = time.perf_counter() - hash_start
+        seed(db, args.users, hashed)
+
+        authenticator = auth.Authenticator(db, auth.SessionStore(), workers=args.workers)
+        with StallProbe() as probe:
+            elapsed, latencies, tokens, failures = concurrent_logins(authenticator, args.users,
+                                                                     min(args.concurrency, args.users))
+        queries_after_login = db.stats()['queries']['find_login']['count']
+
+        rng = np.random.default_rng(0)
+        picks = [tokens[i] for i in rng.integers(0, len(tokens), args.validations)] if tokens else []
+        validate_start = time.perf_counter()
+        valid = sum(authenticator.sessions.validate(token) is not None for token in picks)
+        validate_seconds = time.perf_counter() - validate_start
+        db_stats = db.stats()
+
+        report = {
+            'users': args.users,
+            'concurrency': min(args.concurrency, args.users),
+            'scrypt_n': args.scrypt_n,
+            'hash_workers': args.workers,
+            'single_hash_ms': 1000 * hash_seconds,
+            'login_seconds': elapsed,
+            'logins_per_second': len(latencies) / elapsed,
+            'login_latency_ms': {f"p{int(q * 100)}": 1000 * float(np.quantile(latencies, q))
+                                 for q in (0.5, 0.95, 0.99)} if len(latencies) else {},
+            'failures': len(failures),
+            'max_script_stall_ms': 1000 * probe.worst,
+            'uses_email_index': uses_email_index(db),
+            'find_login_mean_ms': db_stats['queries']['find_login']['mean_ms'],
+            'pool': db_stats['pool'],
+            'validations': len(picks),
+            'validation_us': 1e6 * validate_seconds / max(len(picks), 1),
+            'valid_sessions': valid,
+            'db_queries_during_validation': db_stats['queries']['find_login']['count'] - queries_after_login,
+            'sessions': authenticator.sessions.stats(),
+        }
+        db.pool.close()
+
+    latency = report['login_latency_ms']
+    print(f"{report['users']} logins from {report['concurrency']} threads in {elapsed:.1f}s "
+          f"({report['logins_per_second']:.0f}/s, {args.workers} hash workers, one hash {report['single_hash_ms']:.0f} ms); "
+          f"p50 {latency.get('p50', 0):.0f} ms, p99 {latency.get('p99', 0):.0f} ms, {report['failures']} failures; "
+          f"worst stall seen by another thread {report['max_script_stall_ms']:.1f} ms")
+    print(f"{report['validations']} token validations at {report['validation_us']:.1f} us each, "
+          f"{report['db_queries_during_validation']} database queries; email index used: {report['uses_email_index']}")
+    for failure in failures[:5]:
+        print(f"  {failure}")
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import gazetteer
+
+SYLLABLES = ['ka', 'ra', 'pur', 'na', 'gar', 'la', 'ma', 'vi', 'sa', 'ha', 'bad', 'ko', 'ta', 'li', 'ga', 'ni',
+             'dha', 'ban', 'chi', 'ya', 'pa', 'khe', 'da', 'ri', 'wa', 'sh', 'ro', 'mu', 'je', 'tha']
+
+
+def synthetic_rows(n, seed=0):
+    """Village-like names built from common syllables, spread over India's bounding box."""
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(2, 5, n)
+    parts = rng.integers(0, len(SYLLABLES), (n, 4))
+    latitudes = rng.uniform(8, 34, n)
+    longitudes = rng.uniform(69, 95, n)
+    populations = (rng.pareto(1.2, n) * 800).astype(np.int64)
+    for i in range(n):
+        name = ''.join(SYLLABLES[p] for p in parts[i, :lengths[i]]).capitalize()
+        kind = 'city' if populations[i] >= 100000 else 'town' if populations[i] >= 5000 else 'village'
+        yield name, [], f"State {i % 30}", kind, float(latitudes[i]), float(longitudes[i]), int(populations[i])
+
+
+def percentiles(timings):
+    timings = 1000 * np.asarray(timings)
+    return {'p50_ms': float(np.percentile(timings, 50)), 'p99_ms': float(np.percentile(timings, 99)),
+            'mean_ms': float(timings.mean())}
+
+
+def timed_queries(fn, queries):
+    fn(queries[0])
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        timings.append(time.perf_counter() - start)
+    return percentiles(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index build, open and lookup latency of the gazetteer.")
+    parser.add_argument('--places', type=int, default=600_000, help="synthetic places (India has ~650k villages)")
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('-o', '--output', default='gazetteer_benchmark.json')
+    args = parser.parse_args(argv)
+
+    rows = list(synthetic_rows(args.places))
+    rng = np.random.default_rng(1)
+    sample = [rows[i][0] for i in rng.integers(0, len(rows), args.queries)]
+    prefixes = [name[:rng.integers(2, len(name) + 1)] for name in sample]
+    typos = []
+    for name in sample:
+        i = rng.integers(1, len(name))
+        typos.append(name[:i] + name[i + 1:] if len(name) > 6 else name + 'x')
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'places.csv')
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['name', 'alternate_names', 'state', 'kind', 'latitude', 'longitude', 'population'])
+            for name, alternates, state, kind, latitude, longitude, population in rows:
+                writer.writerow([name, '|'.join(alternates), state, kind, latitude, longitude, population])
+        index_path = os.path.join(directory, 'places.idx')
+
+        start = time.perf_counter()
+        arrays, states = gazetteer.compile_index(gazetteer.read_seed(csv_path))
+        gazetteer.save_index(arrays, states, gazetteer.source_fingerprint(csv_path), index_path)
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        list(gazetteer.read_seed(csv_path))
+        parse_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        index = gazetteer.Gazetteer(index_path)
+        open_seconds = time.perf_counter() - start
+
+        report = {
+            'places': len(index),
+            'keys': len(index.keys),
+            'csv_bytes': os.path.getsize(csv_path),
+            'index_bytes': os.path.getsize(index_path),
+            'build_seconds': build_seconds,
+            'csv_parse_seconds': parse_seconds,
+            'index_open_seconds': open_seconds,
+            'prefix': timed_queries(lambda q: index.prefix(q, 10), prefixes),
+            'fuzzy': timed_queries(lambda q: index.fuzzy(q, 10), typos),
+            'search': timed_queries(lambda q: index.search(q, 10), prefixes),
+        }
+        del index
+    print(f"{report['places']} places, {report['keys']} keys: build {report['build_seconds']:.1f}s, "
+          f"open {1000 * report['index_open_seconds']:.2f} ms vs CSV parse {report['csv_parse_seconds']:.2f}s")
+    for name in ('prefix', 'fuzzy', 'search'):
+        print(f"  {name:7} p50 {report[name]['p50_ms']:.3f} ms  p99 {report[name]['p99_ms']:.3f} ms")
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
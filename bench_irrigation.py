@@ -0,0 +1,107 @@
+import argparse
+import datetime
+import json
+import math
+import time
+
+import numpy as np
+
+import irrigation
+
+
+def synthetic_fields(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'crop': rng.integers(0, len(irrigation.CROP_TYPES), n),
+        'soil': rng.integers(0, len(irrigation.SOIL_TYPES), n),
+        'moisture': rng.uniform(0, 100, n),
+        'days_since_rain': rng.integers(0, 15, n),
+        'temperature': rng.uniform(15, 42, n),
+        'humidity': rng.uniform(20, 95, n),
+    }
+
+
+def scalar_simulate(fields, i, days, start, latitude=irrigation.DEFAULT_LATITUDE):
+    """The same water balance for one field in plain Python, as a per-field loop would run it."""
+    crop, soil = int(fields['crop'][i]), int(fields['soil'][i])
+    kc, root_depth, fraction = irrigation.CROP_PARAMETERS[irrigation.CROP_TYPES[crop]]
+    capacity, wilting = irrigation.SOIL_PARAMETERS[irrigation.SOIL_TYPES[soil]]
+    total = (capacity - wilting) * 1000 * root_depth
+    readily = fraction * total
+    depletion = (1 - min(max(float(fields['moisture'][i]), 0.0), 100.0) / 100) * total
+    dry_days = float(fields['days_since_rain'][i])
+    temperature, humidity = float(fields['temperature'][i]), float(fields['humidity'][i])
+    schedule = []
+    for day in range(days):
+        radiation = float(irrigation.extraterrestrial_radiation(latitude, start.timetuple().tm_yday + day))
+        et0 = float(irrigation.hargreaves_et0(temperature, humidity, radiation))
+        if depletion > readily:
+            schedule.append(depletion)
+            depletion = 0.0
+        else:
+            schedule.append(0.0)
+        crop_et = (kc + irrigation.SURFACE_EVAPORATION * math.exp(-dry_days / irrigation.SURFACE_DRYING_DAYS)) * et0
+        depletion = min(max(depletion + crop_et, 0.0), total)
+        dry_days += 1
+    return schedule
+
+
+def timed(fn, repeats):
+    fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput of the vectorized irrigation engine vs a per-field loop.")
+    parser.add_argument('--fields', type=int, default=100_000)
+    parser.add_argument('--days', type=int, default=14)
+    parser.add_argument('--loop-sample', type=int, default=2000,
+                        help="fields run through the scalar loop; its time is extrapolated to --fields")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('-o', '--output', default='irrigation_benchmark.json')
+    args = parser.parse_args(argv)
+
+    fields = synthetic_fields(args.fields)
+    start = datetime.date.today()
+
+    def run():
+        return irrigation.simulate(fields['crop'], fields['soil'], fields['moisture'], fields['days_since_rain'],
+                                   fields['temperature'], fields['humidity'], days=args.days, start=start)
+
+    result = run()
+    simulate_seconds = timed(run, args.repeats)
+    schedule_seconds = timed(lambda: irrigation.schedule(result), args.repeats)
+
+    sample = min(args.loop_sample, args.fields)
+    loop_start = time.perf_counter()
+    reference = np.array([scalar_simulate(fields, i, args.days, start) for i in range(sample)])
+    loop_seconds = (time.perf_counter() - loop_start) * args.fields / sample
+    max_error = float(np.abs(result['irrigation_mm'][:sample] - reference).max())
+
+    report = {
+        'fields': args.fields,
+        'days': args.days,
+        'simulate_seconds': simulate_seconds,
+        'schedule_seconds': schedule_seconds,
+        'field_days_per_second': args.fields * args.days / simulate_seconds,
+        'loop_seconds_extrapolated': loop_seconds,
+        'speedup_vs_loop': loop_seconds / (simulate_seconds + schedule_seconds),
+        'max_irrigation_error_mm': max_error,
+        'irrigating_today': int((result['first_irrigation_day'] == 0).sum()),
+    }
+    print(f"{args.fields} fields x {args.days} days: simulate {1000 * simulate_seconds:.1f} ms, "
+          f"schedule {1000 * schedule_seconds:.1f} ms ({report['field_days_per_second'] / 1e6:.1f}M field-days/s); "
+          f"per-field loop ~{loop_seconds:.1f}s (x{report['speedup_vs_loop']:.0f}), "
+          f"max difference {max_error:.2g} mm")
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import model_server
+
+# --- Workload ---
+# Forest rows run everywhere; image models only where TensorFlow and the
+# real weights are installed
+SAMPLE_ROWS = {
+    'crop_model': [90, 42, 43, 20.9, 82.0, 6.5, 202.9],
+    'fertilizer_model': [26, 52, 38, 4, 9, 37, 0, 0],
+}
+IMAGE_INPUTS = {
+    'pest_model': (225, 225, 3),
+    'disease_model': (128, 128, 3),
+}
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def rss_mb(pid='self'):
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run_worker(models, requests):
+    """One UI-like process: load (or connect to) the models, then predict."""
+    from model_registry import registry
+    start = time.perf_counter()
+    loaded = {name: registry.get(name) for name in models}
+    load_seconds = time.perf_counter() - start
+    timings = []
+    for i in range(requests):
+        name = models[i % len(models)]
+        model = loaded[name]
+        started = time.perf_counter()
+        if name in IMAGE_INPUTS:
+            model.predict_on_batch(np.zeros((1,) + IMAGE_INPUTS[name], dtype=np.float32))
+        else:
+            model.predict(np.array([SAMPLE_ROWS[name]], dtype=np.float64))
+        timings.append(time.perf_counter() - started)
+    return {'load_seconds': load_seconds, 'rss_mb': rss_mb(),
+            'p50_ms': 1000 * float(np.median(timings)), 'p99_ms': 1000 * float(np.percentile(timings, 99))}
+
+
+def run_mode(mode, workers, models, requests, socket_path):
+    env = dict(os.environ, AGRIZEN_PRELOAD_MODELS='none')
+    env.pop('AGRIZEN_MODEL_SERVER', None)
+    server = None
+    if mode == 'shared':
+        server = subprocess.Popen([sys.executable, os.path.join(BASE_DIR, 'model_server.py'),
+                                   '--socket', socket_path, '--preload', ','.join(models)],
+                                  cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL)
+        model_server.wait_until_ready(socket_path)
+        env['AGRIZEN_MODEL_SERVER'] = socket_path
+    try:
+        start = time.perf_counter()
+        children = [subprocess.Popen([sys.executable, __file__, '--child', ','.join(models), str(requests)],
+                                     cwd=BASE_DIR, env=env, stdout=subprocess.PIPE, text=True)
+                    for _ in range(workers)]
+        results = [json.loads(child.communicate()[0].splitlines()[-1]) for child in children]
+        elapsed = time.perf_counter() - start
+        extra = rss_mb(server.pid) if server is not None else 0.0
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    return {
+        'mode': mode,
+        'workers': workers,
+        'total_rss_mb': sum(r['rss_mb'] for r in results) + extra,
+        'server_rss_mb': extra,
+        'mean_worker_rss_mb': float(np.mean([r['rss_mb'] for r in results])),
+        'requests_per_second': workers * requests / elapsed,
+        'p50_ms': float(np.median([r['p50_ms'] for r in results])),
+        'p99_ms': float(max(r['p99_ms'] for r in results)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory and throughput of N UI processes, each loading models vs one shared server.")
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    parser.add_argument('--workers', type=int, nargs='*', default=[1, 4, 8])
+    parser.add_argument('--models', nargs='*', default=sorted(SAMPLE_ROWS))
+    parser.add_argument('-n', '--requests', type=int, default=2000, help="requests per worker")
+    parser.add_argument('--socket', default=os.path.join(model_server.SOCKET_DIR, 'agrizen-bench-models.sock'))
+    parser.add_argument('-o', '--output', default='model_server_benchmark.json')
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_worker(args.child[0].split(','), int(args.child[1]))))
+        return 0
+
+    results = []
+    for workers in args.workers:
+        for mode in ('local', 'shared'):
+            result = run_mode(mode, workers, args.models, args.requests, args.socket)
+            results.append(result)
+            print(f"{mode:6} x{workers:<3} total RSS {result['total_rss_mb']:8.1f} MB "
+                  f"(per worker {result['mean_worker_rss_mb']:6.1f} MB, server {result['server_rss_mb']:6.1f} MB)  "
+                  f"{result['requests_per_second']:8.0f} req/s  p50 {result['p50_ms']:.2f} ms  p99 {result['p99_ms']:.2f} ms")
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+# --- Synthetic Uploads ---
+SIZES = {
+    'small': (640, 480),
+    '12mp': (4000, 3000),
+}
+TARGETS = {
+    'pest': (225, 225),
+    'disease': (128, 128),
+}
+
+
+def synthetic_jpeg(size, seed=0):
+    """Smooth gradients plus noise, so the JPEG is photo-like in size."""
+    width, height = size
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = np.stack([x / width, y / height, (x + y) / (width + height)], axis=-1) * 200
+    noise = rng.integers(0, 55, size=(height, width, 3), dtype=np.uint8)
+    pixels = (base + noise).clip(0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='JPEG', quality=90)
+    return buffer.getvalue()
+
+
+# --- Pipelines ---
+def legacy_pipeline(image_bytes, size):
+    # app4.py before the shared module: full decode, full-size display copy,
+    # float64 normalisation and expand_dims
+    image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    display = np.asarray(image)
+    image_resized = image.resize(size)
+    image_array = np.array(image_resized) / 255.0
+    image_array = np.expand_dims(image_array, axis=0)
+    return image_array, display
+
+
+def shared_pipeline(image_bytes, size):
+    from image_preprocessing import preprocess, THUMBNAIL_SIZE
+    tensor, thumbnail = preprocess(image_bytes, size, thumbnail_size=THUMBNAIL_SIZE)
+    return tensor, np.asarray(thumbnail)
+
+
+PIPELINES = {'legacy': legacy_pipeline, 'shared': shared_pipeline}
+
+
+def memory_kib(field):
+    """VmRSS/VmHWM from /proc; ru_maxrss would include the parent's peak after fork."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # Non-Linux fallback: ru_maxrss (bytes on macOS, KiB elsewhere)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def measure(pipeline, image_path, target, repeats):
+    """Run in a fresh interpreter so the high-water mark reflects only this pipeline."""
+    with open(image_path, 'rb') as f:
+        image_bytes = f.read()
+    image_name = os.path.splitext(os.path.basename(image_path))[0]
+    run = PIPELINES[pipeline]
+    size = TARGETS[target]
+    baseline_rss = memory_kib('VmRSS')
+    run(image_bytes, size)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run(image_bytes, size)
+        timings.append(time.perf_counter() - start)
+    peak_rss = memory_kib('VmHWM')
+    return {
+        'pipeline': pipeline,
+        'image': image_name,
+        'target': target,
+        'upload_bytes': len(image_bytes),
+        'median_ms': 1000 * float(np.median(timings)),
+        'p95_ms': 1000 * float(np.percentile(timings, 95)),
+        'peak_rss_delta_mb': (peak_rss - baseline_rss) / 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare peak RSS and latency of image preprocessing paths.")
+    parser.add_argument('--child', nargs=3, metavar=('PIPELINE', 'IMAGE_PATH', 'TARGET'), help=argparse.SUPPRESS)
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('-o', '--output', default='preprocessing_benchmark.json')
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(*args.child, args.repeats)))
+        return 0
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        # Generated once here so the generator's memory never counts against a child
+        paths = {}
+        for image_name, size in SIZES.items():
+            paths[image_name] = os.path.join(workdir, f"{image_name}.jpg")
+            with open(paths[image_name], 'wb') as f:
+                f.write(synthetic_jpeg(size))
+        for image_name in SIZES:
+            for target in TARGETS:
+                for pipeline in PIPELINES:
+                    results.append(run_child(here, pipeline, paths[image_name], target, args.repeats))
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    return 0
+
+
+def run_child(here, pipeline, image_path, target, repeats):
+    output = subprocess.run(
+        [sys.executable, __file__, '--child', pipeline, image_path, target, '--repeats', str(repeats)],
+        capture_output=True, text=True, cwd=here, check=True)
+    result = json.loads(output.stdout.splitlines()[-1])
+    print(f"{result['image']:6} {target:8} {pipeline:7} {result['median_ms']:8.1f} ms median  "
+          f"{result['p95_ms']:8.1f} ms p95  {result['peak_rss_delta_mb']:7.1f} MB peak RSS")
+    return result
+
+
+if __name__ == '__main__':
+    sys.exit(main())
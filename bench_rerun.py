@@ -0,0 +1,112 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# --- Pages Compared ---
+# Legacy ?page= title -> url path of the same page in streamlit_app.py
+PAGES = {
+    'Home': 'home',
+    'Pest Detection': 'pest',
+    'Disease Detection': 'disease',
+    'Crop Recommendation': 'crop',
+    'Fertilizer Recommendation': 'fertilizer',
+    'Irrigation Management': 'irrigation',
+    'Weather App': 'weather',
+    'Admin': 'admin',
+}
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def share_script_cache():
+    """Reuse compiled scripts across AppTest runs the way the server does.
+
+    AppTest builds a fresh ScriptCache for every run, so each rerun would
+    re-parse and recompile the entry script; a running server compiles it
+    once. Without this the comparison would mostly measure compile time.
+    """
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import local_script_runner
+    shared = ScriptCache()
+    local_script_runner.ScriptCache = lambda: shared
+
+
+def legacy_app(script, page):
+    from streamlit.testing.v1 import AppTest
+    test = AppTest.from_file(os.path.abspath(script), default_timeout=600)
+    test.query_params['page'] = page
+    return test
+
+
+def unified_app(url_path):
+    from streamlit.testing.v1 import AppTest
+    from streamlit.util import calc_md5
+    test = AppTest.from_file(os.path.join(BASE_DIR, 'streamlit_app.py'), default_timeout=600)
+    # What the browser sends for /<url_path>; AppTest.switch_page only knows file-based pages
+    test._page_hash = calc_md5(url_path)
+    return test
+
+
+def time_reruns(test, reruns):
+    """First run imports and builds the page; each later run is a widget-free rerun of the same page."""
+    start = time.perf_counter()
+    test.run()
+    first = time.perf_counter() - start
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        test.run()
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings)
+    return {
+        'first_run_ms': 1000 * first,
+        'rerun_p50_ms': 1000 * float(np.median(timings)),
+        'rerun_p90_ms': 1000 * float(np.quantile(timings, 0.9)),
+        'elements': len(list(test.main)) + len(list(test.sidebar)),
+        'exceptions': [e.message for e in test.exception],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-rerun cost of each page: a legacy dashboard vs streamlit_app.py.")
+    parser.add_argument('legacy', help="single-script dashboard to compare against; app4.py is now a thin "
+                                       "entry point, so extract it with `git show <rev>:app4.py > app4_legacy.py` "
+                                       "from a revision before the views/ migration and place it in the repo root")
+    parser.add_argument('--pages', nargs='*', default=list(PAGES))
+    parser.add_argument('--reruns', type=int, default=30)
+    parser.add_argument('--recompile', action='store_true',
+                        help="keep AppTest's per-run script compilation (as after every edit in development)")
+    parser.add_argument('-o', '--output', default='rerun_benchmark.json')
+    args = parser.parse_args(argv)
+
+    # Background model warm-up would otherwise race the measured reruns
+    os.environ.setdefault('AGRIZEN_PRELOAD_MODELS', 'none')
+    sys.path.insert(0, BASE_DIR)
+    if not args.recompile:
+        share_script_cache()
+
+    results = []
+    for page in args.pages:
+        legacy = time_reruns(legacy_app(args.legacy, page), args.reruns)
+        unified = time_reruns(unified_app(PAGES[page]), args.reruns)
+        speedup = legacy['rerun_p50_ms'] / unified['rerun_p50_ms']
+        results.append({'page': page, 'legacy': legacy, 'streamlit_app': unified, 'rerun_speedup': speedup})
+        print(f"{page:26} legacy {legacy['rerun_p50_ms']:7.1f} ms ({legacy['elements']:3} elements)  "
+              f"unified {unified['rerun_p50_ms']:7.1f} ms ({unified['elements']:3} elements)  x{speedup:.2f}"
+              + ("  exceptions!" if legacy['exceptions'] or unified['exceptions'] else ""))
+
+    legacy_total = sum(r['legacy']['rerun_p50_ms'] for r in results)
+    unified_total = sum(r['streamlit_app']['rerun_p50_ms'] for r in results)
+    print(f"{'all pages':26} legacy {legacy_total:7.1f} ms  unified {unified_total:7.1f} ms  "
+          f"x{legacy_total / unified_total:.2f}")
+    with open(args.output, 'w') as f:
+        json.dump({'reruns': args.reruns, 'recompile': args.recompile, 'pages': results,
+                   'total_rerun_p50_ms': {'legacy': legacy_total, 'streamlit_app': unified_total}}, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# --- Pages per App Entry Point ---
+# app*.py are thin entry points serving the same app, so only streamlit_app.py is timed
+APP_PAGES = {
+    # Reached through its ?page=<title> compatibility redirect
+    'streamlit_app.py': ['Home', 'Pest Detection', 'Disease Detection', 'Crop Recommendation',
+                         'Fertilizer Recommendation', 'Irrigation Management', 'Weather App', 'Translate',
+                         'Account', 'Feedback'],
+}
+HEAVY_MODULES = ['tensorflow', 'joblib', 'sklearn', 'mysql.connector',
+                 'google.cloud.translate_v2', 'googletrans']
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_page(app, page):
+    """Run in a fresh interpreter: time the first render of one page."""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    streamlit_import = time.perf_counter() - start
+    test = AppTest.from_file(os.path.join(BASE_DIR, app), default_timeout=600)
+    test.query_params['page'] = page
+    start = time.perf_counter()
+    test.run()
+    first_render = time.perf_counter() - start
+    return {
+        'app': app,
+        'page': page,
+        'streamlit_import_seconds': streamlit_import,
+        'first_render_seconds': first_render,
+        'exceptions': [e.message for e in test.exception],
+        'heavy_modules_loaded': [m for m in HEAVY_MODULES if m in sys.modules],
+    }
+
+
+def run_child(app, page):
+    env = dict(os.environ)
+    # Background model warm-up would otherwise race the measured render
+    env.setdefault('AGRIZEN_PRELOAD_MODELS', 'none')
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [BASE_DIR, env.get('PYTHONPATH')]))
+    output = subprocess.run([sys.executable, __file__, '--child', app, page],
+                            capture_output=True, text=True, env=env, cwd=BASE_DIR)
+    lines = [line for line in output.stdout.splitlines() if line.startswith('{')]
+    if output.returncode != 0 or not lines:
+        return {'app': app, 'page': page, 'error': output.stderr.strip()[-500:]}
+    return json.loads(lines[-1])
+
+
+def compare(results, baseline, tolerance):
+    previous = {(r['app'], r['page']): r for r in baseline if 'first_render_seconds' in r}
+    regressions = []
+    for result in results:
+        before = previous.get((result['app'], result['page']))
+        if before is None or 'first_render_seconds' not in result:
+            continue
+        if result['first_render_seconds'] > before['first_render_seconds'] * (1 + tolerance):
+            regressions.append((result, before))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time-to-first-render for each page in a cold interpreter.")
+    parser.add_argument('--child', nargs=2, metavar=('APP', 'PAGE'), help=argparse.SUPPRESS)
+    parser.add_argument('--apps', nargs='*', default=sorted(APP_PAGES))
+    parser.add_argument('-o', '--output', default='startup_benchmark.json')
+    parser.add_argument('--baseline', help="previous results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure_page(*args.child)))
+        return 0
+
+    results = []
+    for app in args.apps:
+        for page in APP_PAGES[app]:
+            result = run_child(app, page)
+            results.append(result)
+            if 'error' in result:
+                print(f"{app:8} {page:28} failed: {result['error'].splitlines()[-1] if result['error'] else ''}")
+            else:
+                print(f"{app:8} {page:28} {1000 * result['first_render_seconds']:8.1f} ms  "
+                      f"heavy: {', '.join(result['heavy_modules_loaded']) or '-'}"
+                      + (f"  exceptions: {'; '.join(result['exceptions'])}" if result['exceptions'] else ""))
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for result, before in regressions:
+            print(f"REGRESSION {result['app']} {result['page']}: "
+                  f"{1000 * before['first_render_seconds']:.1f} -> {1000 * result['first_render_seconds']:.1f} ms")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
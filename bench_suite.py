@@ -0,0 +1,322 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from bench_preprocessing import SIZES, TARGETS, memory_kib, synthetic_jpeg
+
+# --- Suite Definition ---
+# Every case runs in a fresh interpreter, so model loads are cold and the
+# peak RSS of one case never leaks into the next.
+MODELS = ['pest_model', 'disease_model', 'crop_model', 'fertilizer_model']
+PAGES = {
+    'Pest Detection': 'pest_model',
+    'Disease Detection': 'disease_model',
+    'Crop Recommendation': 'crop_model',
+    'Fertilizer Recommendation': 'fertilizer_model',
+    'Irrigation Management': None,
+}
+BATCH_SIZES = [1, 8, 32, 128]
+GROUPS = ['load', 'predict', 'throughput', 'preprocess']
+SEED = 0
+MIN_THROUGHPUT_SECONDS = 0.5
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Metrics where a larger value is an improvement; every other timing or
+# memory metric is lower-is-better
+HIGHER_IS_BETTER = ('per_second',)
+# Too small to compare reliably between runs
+MIN_COMPARABLE_MS = 0.05
+NOT_COMPARED = ('upload_bytes', 'items', 'repeats', 'peak_rss_mb')
+
+# Value ranges seen in the training spreadsheets for each forest feature
+FEATURE_RANGES = {
+    'crop': {'N': (0, 140), 'P': (5, 145), 'K': (5, 205), 'temperature': (8.8, 43.7),
+             'humidity': (14.3, 100), 'ph': (3.5, 9.9), 'rainfall': (20.2, 298.6)},
+    'fertilizer': {'Temparature': (25, 38), 'Humidity': (50, 72), 'Moisture': (25, 65),
+                   'Nitrogen': (4, 42), 'Potassium': (0, 19), 'Phosphorous': (0, 42)},
+}
+
+
+def cases(groups=GROUPS):
+    names = []
+    if 'load' in groups:
+        names += [f"load/{model}" for model in MODELS]
+    if 'predict' in groups:
+        names += [f"predict/{page}" for page in PAGES]
+    if 'throughput' in groups:
+        names += [f"throughput/{model}" for model in MODELS]
+    if 'preprocess' in groups:
+        names += [f"preprocess/{image}/{target}" for image in SIZES for target in TARGETS]
+    return names
+
+
+# --- Synthetic Inputs ---
+def synthetic_frame(kind, n_rows, seed=SEED):
+    """Rows in the batch_scoring schema, categoricals given as their labels like the UI sends them."""
+    import pandas as pd
+    import batch_scoring
+    schema = batch_scoring.SCHEMAS[kind]
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for column in schema['features']:
+        if column in schema['categorical']:
+            columns[column] = rng.choice(list(schema['categorical'][column]), size=n_rows)
+        else:
+            low, high = FEATURE_RANGES[kind][column]
+            columns[column] = rng.uniform(low, high, size=n_rows).round(1)
+    return pd.DataFrame(columns, columns=schema['features'])
+
+
+def synthetic_tensors(model_name, n, seed=SEED):
+    from tflite_export import MODEL_INPUTS
+    (width, height), _ = MODEL_INPUTS[model_name]
+    return np.random.default_rng(seed).random((n, height, width, 3), dtype=np.float32)
+
+
+def _timings(fn, repeats, warmup=1, min_seconds=0.0):
+    """Per-call timings: at least repeats calls, and more until min_seconds have elapsed."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    total = 0.0
+    while len(timings) < repeats or total < min_seconds:
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+        total += timings[-1]
+    return np.asarray(timings)
+
+
+def _latency(timings, prefix=''):
+    return {f'{prefix}median_ms': 1000 * float(np.median(timings)),
+            f'{prefix}p95_ms': 1000 * float(np.percentile(timings, 95))}
+
+
+# --- Cases (run in the child) ---
+def measure_load(model_name, repeats):
+    from model_registry import registry
+    if not registry.available(model_name):
+        raise FileNotFoundError(f"{registry.path(model_name)} not found")
+    start = time.perf_counter()
+    registry.get(model_name)
+    return {'cold_load_seconds': time.perf_counter() - start}
+
+
+def page_predictor(page, workdir):
+    """The predict path a page runs for one request, minus the prediction cache."""
+    model_name = PAGES[page]
+    if model_name is None:
+        from irrigation import recommend_irrigation
+        return lambda: recommend_irrigation(25, 'Rice')
+    if model_name in ('pest_model', 'disease_model'):
+        import labels
+        from image_preprocessing import preprocess, PEST_INPUT_SIZE, DISEASE_INPUT_SIZE
+        from inference_server import get_batcher
+        from predictions import from_probabilities
+        size, class_labels = ((PEST_INPUT_SIZE, labels.pest_class_names) if model_name == 'pest_model'
+                              else (DISEASE_INPUT_SIZE, labels.disease_class_labels))
+        with open(os.path.join(workdir, 'small.jpg'), 'rb') as f:
+            image_bytes = f.read()
+        batcher = get_batcher(model_name)
+
+        def predict():
+            tensor, _ = preprocess(image_bytes, size)
+            return from_probabilities(model_name, batcher.predict(tensor)[None], class_labels)[0]
+        return predict
+    import batch_scoring
+    from model_registry import registry
+    kind = 'crop' if model_name == 'crop_model' else 'fertilizer'
+    model = registry.get(model_name)
+    row = synthetic_frame(kind, 1)
+    return lambda: batch_scoring.predict_top_k(model, batch_scoring.encode_features(row, kind), kind)[0]
+
+
+def measure_predict(page, repeats, workdir):
+    start = time.perf_counter()
+    predict = page_predictor(page, workdir)
+    setup = time.perf_counter() - start
+    start = time.perf_counter()
+    predict()
+    first = time.perf_counter() - start
+    result = {'setup_seconds': setup, 'first_request_ms': 1000 * first}
+    result.update(_latency(_timings(predict, repeats, warmup=0)))
+    return result
+
+
+def measure_throughput(model_name, repeats):
+    from model_registry import registry
+    model = registry.get(model_name)
+    result = {}
+    for batch_size in BATCH_SIZES:
+        if model_name in ('pest_model', 'disease_model'):
+            batch = synthetic_tensors(model_name, batch_size)
+            run = lambda: model.predict_on_batch(batch)
+        else:
+            import batch_scoring
+            kind = 'crop' if model_name == 'crop_model' else 'fertilizer'
+            batch = batch_scoring.encode_features(synthetic_frame(kind, batch_size), kind)
+            run = lambda: model.predict_proba(batch)
+        # Millisecond-scale batches need many calls for a stable median
+        timings = _timings(run, repeats, min_seconds=MIN_THROUGHPUT_SECONDS)
+        result[f'batch_{batch_size}_ms'] = 1000 * float(np.median(timings))
+        result[f'batch_{batch_size}_per_second'] = batch_size / float(np.median(timings))
+    return result
+
+
+def measure_preprocess(image, target, repeats, workdir):
+    from image_preprocessing import preprocess, THUMBNAIL_SIZE
+    with open(os.path.join(workdir, f'{image}.jpg'), 'rb') as f:
+        image_bytes = f.read()
+    size = TARGETS[target]
+    result = {'upload_bytes': len(image_bytes)}
+    result.update(_latency(_timings(lambda: preprocess(image_bytes, size), repeats), 'tensor_'))
+    result.update(_latency(_timings(lambda: preprocess(image_bytes, size, thumbnail_size=THUMBNAIL_SIZE),
+                                    repeats), 'with_thumbnail_'))
+    return result
+
+
+def run_case(case, repeats, workdir):
+    group, _, target = case.partition('/')
+    baseline_rss = memory_kib('VmRSS')
+    if group == 'load':
+        result = measure_load(target, repeats)
+    elif group == 'predict':
+        result = measure_predict(target, repeats, workdir)
+    elif group == 'throughput':
+        result = measure_throughput(target, repeats)
+    elif group == 'preprocess':
+        image, _, target = target.partition('/')
+        result = measure_preprocess(image, target, repeats, workdir)
+    else:
+        raise ValueError(f"Unknown case {case!r}")
+    peak_rss = memory_kib('VmHWM')
+    result['peak_rss_mb'] = peak_rss / 1024
+    result['peak_rss_delta_mb'] = (peak_rss - baseline_rss) / 1024
+    return result
+
+
+# --- Parent ---
+def run_child(case, repeats, workdir):
+    env = dict(os.environ)
+    # Same conditions on every run: no background warm-up racing the
+    # measurement, models loaded in-process, fixed hash seed
+    env.update({'AGRIZEN_PRELOAD_MODELS': 'none', 'AGRIZEN_MODEL_SERVER': '', 'PYTHONHASHSEED': str(SEED)})
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [BASE_DIR, env.get('PYTHONPATH')]))
+    output = subprocess.run([sys.executable, __file__, '--child', case, '--repeats', str(repeats),
+                             '--workdir', workdir], capture_output=True, text=True, env=env, cwd=BASE_DIR)
+    lines = [line for line in output.stdout.splitlines() if line.startswith('{')]
+    if output.returncode != 0 or not lines:
+        error = output.stderr.strip().splitlines()
+        return {'error': error[-1] if error else f"exit status {output.returncode}"}
+    return json.loads(lines[-1])
+
+
+def run_case_repeatedly(case, repeats, workdir, runs):
+    """Median of each metric over several fresh interpreters; single runs vary too much between processes."""
+    samples = [run_child(case, repeats, workdir) for _ in range(max(1, runs))]
+    ok = [sample for sample in samples if 'error' not in sample]
+    if not ok:
+        return samples[0]
+    return {metric: float(np.median([sample[metric] for sample in ok])) for metric in ok[0]}
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=BASE_DIR).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+    }
+
+
+def regressed(metric, before, after, tolerance):
+    if metric in NOT_COMPARED or not isinstance(before, (int, float)) or not isinstance(after, (int, float)):
+        return False
+    if metric.endswith(HIGHER_IS_BETTER):
+        return after < before * (1 - tolerance)
+    if metric.endswith('_ms') and max(before, after) < MIN_COMPARABLE_MS:
+        return False
+    return after > before * (1 + tolerance)
+
+
+def compare(results, baseline, tolerance):
+    """(case, metric, before, after) for every metric worse than tolerance allows."""
+    regressions = []
+    for case, metrics in results.items():
+        before_metrics = baseline.get(case, {})
+        for metric, after in metrics.items():
+            before = before_metrics.get(metric)
+            if before is not None and regressed(metric, before, after, tolerance):
+                regressions.append((case, metric, before, after))
+    return regressions
+
+
+def format_metrics(metrics):
+    if 'error' in metrics:
+        return f"skipped: {metrics['error']}"
+    shown = [f"{name}={value:.4g}" for name, value in metrics.items() if name not in NOT_COMPARED]
+    return '  '.join(shown)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark suite for every model path, with baseline "
+                                                 "comparison.")
+    parser.add_argument('--child', metavar='CASE', help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    parser.add_argument('--groups', nargs='*', default=GROUPS, choices=GROUPS)
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--runs', type=int, default=3, help="fresh interpreters per case; metrics are medians")
+    parser.add_argument('-o', '--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="previous results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument('--save-baseline', metavar='PATH', help="also write these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_case(args.child, args.repeats, args.workdir)))
+        return 0
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        # Generated once, outside the measured children
+        for image, size in SIZES.items():
+            with open(os.path.join(workdir, f'{image}.jpg'), 'wb') as f:
+                f.write(synthetic_jpeg(size, seed=SEED))
+        for case in cases(args.groups):
+            results[case] = run_case_repeatedly(case, args.repeats, workdir, args.runs)
+            print(f"{case:40} {format_metrics(results[case])}", flush=True)
+
+    report = {'environment': environment(), 'repeats': args.repeats, 'runs': args.runs, 'results': results}
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline['environment'].get('platform') != report['environment']['platform']:
+            print(f"note: baseline was recorded on {baseline['environment'].get('platform')}")
+        regressions = compare(results, baseline['results'], args.tolerance)
+        for case, metric, before, after in regressions:
+            print(f"REGRESSION {case} {metric}: {before:.4g} -> {after:.4g}")
+        print(f"{len(regressions)} regressions beyond {args.tolerance:.0%} against {args.baseline}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from image_preprocessing import preprocess, PEST_INPUT_SIZE, DISEASE_INPUT_SIZE
+from tta import augment, average_probabilities, clamp_budget, MAX_TTA_BUDGET
+
+MODEL_INPUTS = {'pest_model': PEST_INPUT_SIZE, 'disease_model': DISEASE_INPUT_SIZE}
+
+
+def timed(fn, repeats):
+    fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return 1000 * float(np.median(timings))
+
+
+def measure(name, image_bytes, budgets, repeats):
+    """Latency of single-view vs TTA inference; model columns need the real weights."""
+    from model_registry import registry
+    size = MODEL_INPUTS[name]
+    tensor = preprocess(image_bytes, size)[0].copy()
+    try:
+        model = registry.get(name)
+        model_error = None
+    except Exception as e:
+        model, model_error = None, str(e)
+    single_ms = timed(lambda: model.predict_on_batch(tensor), repeats) if model is not None else None
+    preprocess_ms = timed(lambda: preprocess(image_bytes, size), repeats)
+    results = []
+    for budget in budgets:
+        budget = clamp_budget(budget)
+        result = {
+            'model': name,
+            'budget': budget,
+            'preprocess_ms': preprocess_ms,
+            'augment_ms': timed(lambda: augment(tensor, budget), repeats),
+            'model_error': model_error,
+        }
+        if model is not None:
+            views = augment(tensor, budget).copy()
+            result['single_view_ms'] = single_ms
+            result['batched_tta_ms'] = timed(
+                lambda: average_probabilities(model.predict_on_batch(views)), repeats)
+            # What N separate calls would cost instead of one batch
+            result['sequential_tta_ms'] = timed(
+                lambda: [model.predict_on_batch(views[i:i + 1]) for i in range(budget)], repeats)
+            result['overhead_vs_single'] = (result['augment_ms'] + result['batched_tta_ms']) / single_ms
+        results.append(result)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latency overhead of test-time augmentation vs one view.")
+    parser.add_argument('image', help="JPEG/PNG to run through the pipeline")
+    parser.add_argument('--models', nargs='*', default=sorted(MODEL_INPUTS), choices=sorted(MODEL_INPUTS))
+    parser.add_argument('--budgets', type=int, nargs='*', default=[1, 2, 4, 6, MAX_TTA_BUDGET])
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('-o', '--output', default='tta_benchmark.json')
+    args = parser.parse_args(argv)
+
+    with open(args.image, 'rb') as f:
+        image_bytes = f.read()
+    results = []
+    for name in args.models:
+        for result in measure(name, image_bytes, args.budgets, args.repeats):
+            results.append(result)
+            line = (f"{name:14} budget {result['budget']:2}  preprocess {result['preprocess_ms']:6.2f} ms  "
+                    f"augment {result['augment_ms']:6.2f} ms")
+            if 'batched_tta_ms' in result:
+                line += (f"  single {result['single_view_ms']:7.2f} ms  batched {result['batched_tta_ms']:7.2f} ms  "
+                         f"sequential {result['sequential_tta_ms']:7.2f} ms  x{result['overhead_vs_single']:.2f}")
+            else:
+                line += f"  (model unavailable: {result['model_error']})"
+            print(line)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
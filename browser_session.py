@@ -0,0 +1,97 @@
+import json
+from http.cookies import SimpleCookie, CookieError
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from auth import get_authenticator, SESSION_TTL_SECONDS
+
+# --- Session Cookie ---
+# Every link click is a full page load, which starts a fresh Streamlit
+# session. The signed token rides in a first-party cookie rather than the URL,
+# so it never reaches browser history, shared links or proxy logs. The cookie
+# arrives with the WebSocket handshake; it is written from the page because
+# Streamlit gives a script no way to set response headers.
+COOKIE_NAME = 'agrizen_session'
+
+
+def _handshake_cookies():
+    """Cookies from the WebSocket handshake headers, for Streamlit before st.context (1.37)."""
+    try:
+        # Internal and deprecated: it may move, change or vanish in any release
+        from streamlit.web.server.websocket_headers import _get_websocket_headers
+        header = (_get_websocket_headers() or {}).get('Cookie', '')
+    except Exception:
+        return {}  # Bare script run, AppTest, or the helper is gone
+    cookie = SimpleCookie()
+    try:
+        cookie.load(header)
+    except CookieError:
+        return {}
+    return {name: morsel.value for name, morsel in cookie.items()}
+
+
+def cookie_token():
+    """The token the browser sent when this session connected, or None."""
+    context = getattr(st, 'context', None)
+    if context is not None:
+        try:
+            return context.cookies.get(COOKIE_NAME)
+        except Exception:
+            return None  # No browser connection behind this run
+    return _handshake_cookies().get(COOKIE_NAME)
+
+
+def _write_cookie(token):
+    value = json.dumps(token or '')
+    max_age = int(SESSION_TTL_SECONDS) if token else 0
+    components.html(
+        f"""<script>
+        const secure = window.parent.location.protocol === 'https:' ? '; Secure' : '';
+        window.parent.document.cookie = '{COOKIE_NAME}=' + {value}
+            + '; Path=/; Max-Age={max_age}; SameSite=Strict' + secure;
+        </script>""",
+        height=0,
+    )
+
+
+# --- Per-Run Check ---
+def restore():
+    """Return the live Session for this browser tab, or None. Call at the top of every run.
+
+    The token is validated on every run against the in-memory session
+    cache in auth.py (no database round trip), so a logout in another tab,
+    expiry and eviction take effect on the next interaction.
+    """
+    state = st.session_state
+    if '_cookie_read' not in state:
+        state._cookie_read = True
+        state.session_token = state.get('session_token') or cookie_token()
+    if 'session' in st.query_params:
+        # Links from older builds carried the token; drop it rather than trust or repeat it
+        del st.query_params['session']
+
+    token = state.get('session_token')
+    session = get_authenticator().sessions.validate(token) if token else None
+    if token and session is None:
+        state.session_token = None
+        state._cookie_pending = True
+    if state.get('_cookie_pending'):
+        state._cookie_pending = False
+        _write_cookie(state.session_token)
+    return session
+
+
+def remember(token):
+    """Keep a freshly issued token for this tab and, from the next run, the browser."""
+    st.session_state.session_token = token
+    st.session_state._cookie_pending = True
+
+
+def forget():
+    """Revoke this tab's session and clear the browser's cookie."""
+    token = st.session_state.get('session_token')
+    if token:
+        get_authenticator().logout(token)
+    st.session_state.session_token = None
+    st.session_state._cookie_pending = True
@@ -0,0 +1,280 @@
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from image_preprocessing import preprocess
+from knowledge_base import get_knowledge_base
+from tflite_export import IMAGE_EXTENSIONS, MODEL_INPUTS
+
+# --- Bulk Diagnosis Configuration ---
+BULK_BATCH_SIZE = int(os.environ.get('AGRIZEN_BULK_BATCH_SIZE', '32'))
+BULK_DECODE_WORKERS = int(os.environ.get('AGRIZEN_BULK_DECODE_WORKERS', str(min(8, os.cpu_count() or 1))))
+# ZIP bomb limits. Photos barely compress, so a high ratio means a crafted member.
+BULK_MAX_IMAGE_BYTES = int(os.environ.get('AGRIZEN_BULK_MAX_IMAGE_BYTES', str(50 * 1024 * 1024)))
+BULK_MAX_COMPRESSION_RATIO = float(os.environ.get('AGRIZEN_BULK_MAX_COMPRESSION_RATIO', '100'))
+BULK_MAX_MEMBERS = int(os.environ.get('AGRIZEN_BULK_MAX_MEMBERS', '50000'))
+BULK_MAX_TOTAL_BYTES = int(os.environ.get('AGRIZEN_BULK_MAX_TOTAL_BYTES', str(4 * 1024 ** 3)))
+
+KINDS = {
+    'pest': {'model': 'pest_model'},
+    'disease': {'model': 'disease_model'},
+}
+
+
+def report_columns(k):
+    columns = ['image', 'status', 'error', 'label', 'confidence', 'near_tie']
+    for i in range(1, k + 1):
+        columns += [f'top{i}_label', f'top{i}_probability']
+    return columns + ['remedy']
+
+
+# --- Image Sources ---
+def member_problem(info):
+    """Why a ZIP member is refused before it is inflated, or None."""
+    if info.file_size > BULK_MAX_IMAGE_BYTES:
+        return f"{info.file_size} bytes uncompressed, over the {BULK_MAX_IMAGE_BYTES} byte limit"
+    if info.file_size > BULK_MAX_COMPRESSION_RATIO * max(info.compress_size, 1):
+        return f"compression ratio over {BULK_MAX_COMPRESSION_RATIO:g}:1"
+    return None
+
+
+class ImageSource:
+    """Images in a directory tree or ZIP archive, in a stable sorted order.
+
+    Names are relative paths, so a resumed run can match them against the
+    report; only the names are held in memory, never the image bytes.
+    ZIP members over the size, ratio or total limits land in rejected
+    (name -> reason) and are never read; members past the count limit are
+    only counted, in truncated.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._zip = None
+        self.rejected = {}
+        self.truncated = 0
+        if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+            self.names = []
+            for root, _, files in sorted(os.walk(source)):
+                for filename in sorted(files):
+                    if filename.lower().endswith(IMAGE_EXTENSIONS):
+                        self.names.append(os.path.relpath(os.path.join(root, filename), source))
+        else:
+            self._zip = zipfile.ZipFile(source)
+            members = sorted((info for info in self._zip.infolist()
+                              if not info.is_dir() and info.filename.lower().endswith(IMAGE_EXTENSIONS)
+                              and not os.path.basename(info.filename).startswith('._')),
+                             key=lambda info: info.filename)
+            self.truncated = max(0, len(members) - BULK_MAX_MEMBERS)
+            self.names = []
+            total = 0
+            for info in members[:BULK_MAX_MEMBERS]:
+                problem = member_problem(info)
+                if problem is None and total + info.file_size > BULK_MAX_TOTAL_BYTES:
+                    problem = f"archive over {BULK_MAX_TOTAL_BYTES} bytes uncompressed"
+                if problem is not None:
+                    self.rejected[info.filename] = problem
+                    continue
+                total += info.file_size
+                self.names.append(info.filename)
+
+    def read(self, name):
+        if self._zip is not None:
+            # ZipFile serialises reads of the shared handle; inflating runs in parallel.
+            # It stops at the member's declared size, which the limits above checked.
+            return self._zip.read(name)
+        with open(os.path.join(self.source, name), 'rb') as f:
+            return f.read()
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+
+
+# --- Decode Pipeline ---
+def _decode(source, name, size, out):
+    try:
+        preprocess(source.read(name), size, out=out)
+        return None
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def iter_batches(source, names, size, batch_size=BULK_BATCH_SIZE, workers=BULK_DECODE_WORKERS):
+    """Yield (names, tensors, errors) per fixed-size batch, decoding the next batch meanwhile.
+
+    Two preallocated batch buffers alternate, so memory stays at two batches
+    of tensors however large the folder is. The yielded tensors are only
+    valid until the generator is advanced again.
+    """
+    width, height = size
+    buffers = [np.empty((batch_size, height, width, 3), dtype=np.float32) for _ in range(2)]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending = None
+        for n, start in enumerate(range(0, len(names), batch_size)):
+            chunk = names[start:start + batch_size]
+            buffer = buffers[n % 2]
+            futures = [pool.submit(_decode, source, name, size, buffer[i:i + 1]) for i, name in enumerate(chunk)]
+            if pending is not None:
+                yield _collect(*pending)
+            pending = (chunk, buffer, futures)
+        if pending is not None:
+            yield _collect(*pending)
+
+
+def _collect(chunk, buffer, futures):
+    errors = [future.result() for future in futures]
+    return chunk, buffer[:len(chunk)], errors
+
+
+# --- Report ---
+def _error_row(name, error, k):
+    return [name, 'error', error] + [''] * (len(report_columns(k)) - 3)
+
+
+def _rows(kind, chunk, errors, results, k):
+    model = KINDS[kind]['model']
+    knowledge_base = get_knowledge_base()
+    results = iter(results)
+    rows = []
+    for name, error in zip(chunk, errors):
+        if error is not None:
+            rows.append(_error_row(name, error, k))
+            continue
+        result = next(results)
+        row = [name, 'ok', '', result.label, f"{result.confidence:.6f}", result.near_tie]
+        for i in range(k):
+            if i < len(result.labels):
+                row += [result.labels[i], f"{result.probabilities[i]:.6f}"]
+            else:
+                row += ['', '']
+        rows.append(row + [knowledge_base.remedy(model, result.index) or ''])
+    return rows
+
+
+def completed_images(path):
+    """Image names already in a report, trimming a batch cut off mid-write."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return set()
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        complete = f.read(1) == b'\n'
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    if not complete:
+        # Each batch is written with one flushed write, so only the last row can be partial
+        rows = rows[:-1]
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(rows)
+    return {row[0] for row in rows[1:]}
+
+
+def _journal_path(output):
+    # Parquet cannot be appended to, so progress goes to a CSV journal first
+    return f"{output}.partial.csv" if output.lower().endswith(('.parquet', '.pq')) else output
+
+
+def diagnose(source, kind, output, model=None, batch_size=BULK_BATCH_SIZE, workers=BULK_DECODE_WORKERS,
+             k=None, resume=True, progress=None):
+    """Diagnose every image in a folder or ZIP into a CSV/Parquet report; returns throughput stats.
+
+    Rows are appended a batch at a time, so an interrupted run re-run with
+    resume=True skips the images it already reported.
+    """
+    from predictions import from_probabilities, TOP_K
+    k = k or TOP_K
+    name = KINDS[kind]['model']
+    size, class_labels = MODEL_INPUTS[name]
+    if model is None:
+        from model_registry import registry
+        model = registry.get(name)
+
+    journal = _journal_path(output)
+    done = completed_images(journal) if resume else set()
+    images = ImageSource(source)
+    todo = [n for n in images.names if n not in done]
+    rejected = [n for n in images.rejected if n not in done]
+    total = len(images.names) + len(images.rejected)
+    stats = {'images': total, 'skipped': total - len(todo) - len(rejected), 'processed': 0,
+             'errors': 0, 'truncated': images.truncated, 'model_seconds': 0.0}
+    start = time.perf_counter()
+    try:
+        with open(journal, 'a' if done else 'w', newline='', encoding='utf-8') as f:
+            if not done:
+                csv.writer(f).writerow(report_columns(k))
+                f.flush()
+            if rejected:
+                csv.writer(f).writerows(_error_row(n, f"Skipped: {images.rejected[n]}", k) for n in rejected)
+                f.flush()
+                stats['processed'] += len(rejected)
+                stats['errors'] += len(rejected)
+            for chunk, tensors, errors in iter_batches(images, todo, size, batch_size, workers):
+                ok = [i for i, error in enumerate(errors) if error is None]
+                results = []
+                if ok:
+                    batch = tensors if len(ok) == len(chunk) else tensors[ok]
+                    model_start = time.perf_counter()
+                    probabilities = np.asarray(model.predict_on_batch(batch))
+                    stats['model_seconds'] += time.perf_counter() - model_start
+                    results = from_probabilities(name, probabilities, class_labels, k=k)
+                text = io.StringIO()
+                csv.writer(text).writerows(_rows(kind, chunk, errors, results, k))
+                f.write(text.getvalue())
+                f.flush()
+                stats['processed'] += len(chunk)
+                stats['errors'] += len(chunk) - len(ok)
+                if progress is not None:
+                    progress(stats['skipped'] + stats['processed'], stats['images'])
+    finally:
+        images.close()
+    if journal != output:
+        pd.read_csv(journal, dtype={'image': str}, keep_default_na=False).to_parquet(output, index=False)
+        os.remove(journal)
+    stats['seconds'] = time.perf_counter() - start
+    stats['images_per_second'] = stats['processed'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+    return stats
+
+
+# --- Command Line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diagnose a folder or ZIP of leaf/pest photos in bulk.")
+    parser.add_argument('kind', choices=sorted(KINDS))
+    parser.add_argument('input', help="directory of images or .zip archive")
+    parser.add_argument('-o', '--output', help="CSV or Parquet report (defaults to <input>_<kind>.csv)")
+    parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=BULK_DECODE_WORKERS, help="decode threads")
+    parser.add_argument('-k', '--top-k', type=int)
+    parser.add_argument('--restart', action='store_true', help="ignore an existing report instead of resuming")
+    args = parser.parse_args(argv)
+
+    root = os.path.splitext(os.path.normpath(args.input))[0]
+    output = args.output or f"{root}_{args.kind}.csv"
+
+    def progress(done, total):
+        print(f"\r{done}/{total} images", end='', file=sys.stderr, flush=True)
+
+    try:
+        stats = diagnose(args.input, args.kind, output, batch_size=args.batch_size, workers=args.workers,
+                         k=args.top_k, resume=not args.restart, progress=progress)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; re-run the same command to resume into {output}", file=sys.stderr)
+        return 130
+    print(file=sys.stderr)
+    if stats['truncated']:
+        print(f"Ignored {stats['truncated']} images past the {BULK_MAX_MEMBERS} member limit", file=sys.stderr)
+    print(f"Diagnosed {stats['processed']} images ({stats['skipped']} already done, {stats['errors']} unreadable) "
+          f"in {stats['seconds']:.2f}s ({stats['images_per_second']:.1f} images/s, "
+          f"model {stats['model_seconds']:.2f}s) -> {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,440 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import tracing
+from lazy_imports import lazy_import
+
+mysql_connector = lazy_import('mysql.connector')
+
+# --- Database Configuration ---
+DB_CONFIG = {
+    'host': os.environ.get('AGRIZEN_DB_HOST', 'localhost'),
+    'database': os.environ.get('AGRIZEN_DB_NAME', 'agrizen_db'),
+    'user': os.environ.get('AGRIZEN_DB_USER', 'root'),
+    'password': os.environ.get('AGRIZEN_DB_PASSWORD', 'your_password'),  # Change to your actual MySQL password
+    'port': int(os.environ.get('AGRIZEN_DB_PORT', '3306')),
+    # Pooled connections outlive a request; without autocommit a SELECT would
+    # leave its REPEATABLE READ snapshot open for the next borrower
+    'autocommit': True,
+}
+# "mysql" (default) or "sqlite" for a local stand-in at AGRIZEN_SQLITE_PATH
+DB_BACKEND = os.environ.get('AGRIZEN_DB_BACKEND', 'mysql')
+SQLITE_PATH = os.environ.get('AGRIZEN_SQLITE_PATH', 'agrizen.db')
+
+POOL_SIZE = int(os.environ.get('AGRIZEN_DB_POOL_SIZE', '5'))
+CHECKOUT_TIMEOUT = float(os.environ.get('AGRIZEN_DB_CHECKOUT_TIMEOUT', '5'))
+MAX_LIFETIME = float(os.environ.get('AGRIZEN_DB_MAX_LIFETIME', '1800'))
+HEALTH_CHECK_INTERVAL = float(os.environ.get('AGRIZEN_DB_HEALTH_CHECK_INTERVAL', '30'))
+
+# --- Prepared Statements ---
+# Written in the MySQL paramstyle; backends translate placeholders once.
+QUERIES = {
+    # Salted hashes cannot be matched in SQL; the hash is fetched and verified in auth.py
+    'find_login': "SELECT id, username, password FROM users WHERE email = %s",
+    'update_password': "UPDATE users SET password = %s WHERE id = %s",
+    'insert_user': "INSERT INTO users (username, email, password) VALUES (%s, %s, %s)",
+    'insert_feedback': "INSERT INTO feedback (user_id, page, feedback_text, created_at) VALUES (%s, %s, %s, %s)",
+}
+
+SQLITE_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS users ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT NOT NULL,"
+    " email TEXT NOT NULL, password TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS feedback ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, page TEXT,"
+    " feedback_text TEXT, created_at TIMESTAMP)",
+]
+
+# --- Schema Migrations ---
+# Applied in order by Database.migrate() and recorded in schema_version.
+# The SQLite stand-in migrates itself on first use; MySQL deployments run
+# `python db.py migrate` once after upgrading.
+MIGRATIONS = [
+    {
+        'version': 1,
+        'description': "unique index on users.email, room for salted password hashes",
+        # Any rows returned block the migration until they are resolved by hand
+        'precondition': "SELECT email FROM users GROUP BY email HAVING COUNT(*) > 1",
+        'sqlite': [
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users (email)",
+        ],
+        'mysql': [
+            "ALTER TABLE users MODIFY email VARCHAR(255) NOT NULL, MODIFY password VARCHAR(255) NOT NULL",
+            "ALTER TABLE users ADD UNIQUE INDEX idx_users_email (email)",
+        ],
+    },
+]
+
+
+class DatabaseError(Exception):
+    pass
+
+
+class IntegrityError(DatabaseError):
+    """A write broke a constraint, e.g. registering an email that already exists."""
+
+
+class DataError(DatabaseError):
+    """A value the column can't hold; retrying the same row can never succeed."""
+
+
+class PoolTimeout(DatabaseError):
+    pass
+
+
+# --- Backends ---
+class MySQLBackend:
+    name = 'mysql'
+
+    def __init__(self, config=None):
+        self.config = DB_CONFIG if config is None else config
+
+    @property
+    def error_types(self):
+        return (mysql_connector.Error,)
+
+    @property
+    def integrity_error_types(self):
+        return (mysql_connector.IntegrityError,)
+
+    @property
+    def data_error_types(self):
+        return (mysql_connector.DataError,)
+
+    def connect(self):
+        return mysql_connector.connect(**self.config)
+
+    def prepare(self, sql):
+        return sql
+
+    def cursor(self, conn):
+        # Server-side prepared statement, reused per connection by the driver
+        return conn.cursor(prepared=True)
+
+    def ping(self, conn):
+        conn.ping(reconnect=False)
+
+
+class SQLiteBackend:
+    name = 'sqlite'
+    error_types = (sqlite3.Error,)
+    integrity_error_types = (sqlite3.IntegrityError,)
+    data_error_types = (sqlite3.DataError,)
+
+    def __init__(self, path=SQLITE_PATH):
+        self.path = path
+        conn = self.connect()
+        for statement in SQLITE_SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+        conn.close()
+
+    def connect(self):
+        return sqlite3.connect(self.path, check_same_thread=False, timeout=CHECKOUT_TIMEOUT)
+
+    def prepare(self, sql):
+        return sql.replace('%s', '?')
+
+    def cursor(self, conn):
+        return conn.cursor()
+
+    def ping(self, conn):
+        conn.execute("SELECT 1").fetchone()
+
+
+# --- Connection Pool ---
+class _PooledConnection:
+    __slots__ = ('raw', 'created_at', 'checked_at')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = self.checked_at = time.monotonic()
+
+
+class ConnectionPool:
+    """Fixed-size connection pool with health checks and bounded checkout wait."""
+
+    def __init__(self, backend, size=POOL_SIZE, timeout=CHECKOUT_TIMEOUT,
+                 max_lifetime=MAX_LIFETIME, health_check_interval=HEALTH_CHECK_INTERVAL):
+        self.backend = backend
+        self.size = size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self._idle = []
+        self._open = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._metrics = {
+            'created': 0, 'checkouts': 0, 'waited_checkouts': 0, 'wait_seconds': 0.0,
+            'timeouts': 0, 'recycled': 0, 'failed_health_checks': 0, 'peak_in_use': 0,
+        }
+
+    def _close(self, pooled):
+        try:
+            pooled.raw.close()
+        except Exception:
+            pass
+
+    def _checked_out(self, start, waited):
+        # Called with self._cond held
+        self._metrics['checkouts'] += 1
+        self._metrics['peak_in_use'] = max(self._metrics['peak_in_use'], self._in_use)
+        if waited:
+            self._metrics['waited_checkouts'] += 1
+            self._metrics['wait_seconds'] += time.monotonic() - start
+
+    def _discard(self, pooled):
+        """Give up a checked-out connection and its slot."""
+        self._close(pooled)
+        with self._cond:
+            self._open -= 1
+            self._in_use -= 1
+            self._cond.notify()
+
+    def acquire(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+        while True:
+            expired = None
+            with self._cond:
+                while not self._idle and self._open >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._metrics['timeouts'] += 1
+                        raise PoolTimeout(f"No database connection available within {self.timeout:.1f}s")
+                    waited = True
+                    self._cond.wait(remaining)
+                pooled = self._idle.pop() if self._idle else None
+                now = time.monotonic()
+                if pooled is not None and now - pooled.created_at > self.max_lifetime:
+                    # Its slot goes to a fresh connection
+                    self._metrics['recycled'] += 1
+                    expired, pooled = pooled, None
+                elif pooled is None:
+                    # Reserve the slot, then connect outside the lock
+                    self._open += 1
+                self._in_use += 1
+                check = pooled is not None and now - pooled.checked_at > self.health_check_interval
+                if not check:
+                    self._checked_out(start, waited)
+            if expired is not None:
+                self._close(expired)
+            if pooled is None:
+                break
+            if not check:
+                return pooled
+            # Pinged outside the lock, like connect(), so a slow server stalls only this checkout
+            try:
+                self.backend.ping(pooled.raw)
+            except Exception:
+                with self._cond:
+                    self._metrics['failed_health_checks'] += 1
+                self._discard(pooled)
+                continue
+            pooled.checked_at = time.monotonic()
+            with self._cond:
+                self._checked_out(start, waited)
+            return pooled
+        try:
+            pooled = _PooledConnection(self.backend.connect())
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._metrics['created'] += 1
+        return pooled
+
+    def release(self, pooled, suspect=False):
+        if suspect:
+            # Force a ping before the next checkout
+            pooled.checked_at = float('-inf')
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        pooled = self.acquire()
+        suspect = False
+        try:
+            yield pooled.raw
+        except Exception:
+            suspect = True
+            # Never hand a half-finished transaction to the next borrower
+            try:
+                pooled.raw.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            self.release(pooled, suspect)
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for pooled in idle:
+            self._close(pooled)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._metrics)
+            stats.update({
+                'size': self.size,
+                'open': self._open,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'saturation': self._in_use / self.size if self.size else 0.0,
+            })
+            return stats
+
+
+# --- Database Access Layer ---
+class Database:
+    def __init__(self, backend, **pool_options):
+        self.backend = backend
+        self.pool = ConnectionPool(backend, **pool_options)
+        self._statements = {name: backend.prepare(sql) for name, sql in QUERIES.items()}
+        self._latency = {}
+        self._latency_lock = threading.Lock()
+
+    def _record(self, name, seconds):
+        with self._latency_lock:
+            count, total, worst = self._latency.get(name, (0, 0.0, 0.0))
+            self._latency[name] = (count + 1, total + seconds, max(worst, seconds))
+        tracing.record('db', seconds)
+
+    def execute(self, name, params=(), fetch=None):
+        """Run a named statement. fetch is None (commit), "one" or "all"."""
+        sql = self._statements[name]
+        start = time.perf_counter()
+        try:
+            with self.pool.connection() as conn:
+                cursor = self.backend.cursor(conn)
+                try:
+                    cursor.execute(sql, params)
+                    if fetch is None:
+                        conn.commit()
+                        return cursor.lastrowid
+                    columns = [d[0] for d in cursor.description]
+                    if fetch == 'one':
+                        row = cursor.fetchone()
+                        return dict(zip(columns, row)) if row is not None else None
+                    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                finally:
+                    cursor.close()
+        except PoolTimeout:
+            raise
+        except self.backend.integrity_error_types as e:
+            raise IntegrityError(str(e)) from e
+        except self.backend.data_error_types as e:
+            raise DataError(str(e)) from e
+        except self.backend.error_types as e:
+            raise DatabaseError(str(e)) from e
+        finally:
+            self._record(name, time.perf_counter() - start)
+
+    def executemany(self, name, rows):
+        sql = self._statements[name]
+        start = time.perf_counter()
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.executemany(sql, rows)
+                    conn.commit()
+                    return cursor.rowcount
+                finally:
+                    cursor.close()
+        except PoolTimeout:
+            raise
+        except self.backend.integrity_error_types as e:
+            raise IntegrityError(str(e)) from e
+        except self.backend.data_error_types as e:
+            raise DataError(str(e)) from e
+        except self.backend.error_types as e:
+            raise DatabaseError(str(e)) from e
+        finally:
+            self._record(name, time.perf_counter() - start)
+
+    def migrate(self):
+        """Apply pending schema migrations and return the versions applied."""
+        applied = []
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+                    cursor.execute("SELECT MAX(version) FROM schema_version")
+                    current = cursor.fetchone()[0] or 0
+                    for migration in MIGRATIONS:
+                        if migration['version'] <= current:
+                            continue
+                        cursor.execute(migration['precondition'])
+                        blocking = [row[0] for row in cursor.fetchall()]
+                        if blocking:
+                            raise DatabaseError(
+                                f"Migration {migration['version']} ({migration['description']}) is blocked by "
+                                f"{len(blocking)} conflicting rows, e.g. {blocking[:5]}")
+                        for statement in migration[self.backend.name]:
+                            cursor.execute(statement)
+                        cursor.execute(self.backend.prepare("INSERT INTO schema_version (version) VALUES (%s)"),
+                                       (migration['version'],))
+                        conn.commit()
+                        applied.append(migration['version'])
+                finally:
+                    cursor.close()
+        except (PoolTimeout, DatabaseError):
+            raise
+        except self.backend.error_types as e:
+            raise DatabaseError(str(e)) from e
+        return applied
+
+    def stats(self):
+        with self._latency_lock:
+            queries = {
+                name: {'count': count, 'mean_ms': 1000 * total / count, 'max_ms': 1000 * worst}
+                for name, (count, total, worst) in self._latency.items()
+            }
+        return {'pool': self.pool.stats(), 'queries': queries}
+
+
+_database = None
+_database_lock = threading.Lock()
+
+
+def get_database():
+    """Process-wide database handle shared by every session."""
+    global _database
+    if _database is None:
+        with _database_lock:
+            if _database is None:
+                if DB_BACKEND == 'sqlite':
+                    database = Database(SQLiteBackend())
+                    database.migrate()
+                else:
+                    database = Database(MySQLBackend())
+                _database = database
+    return _database
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AgriZen database maintenance.")
+    parser.add_argument('command', choices=['migrate'])
+    parser.parse_args(argv)
+    applied = get_database().migrate()
+    print(f"Applied migrations {applied}" if applied else "Schema is up to date")
+
+
+if __name__ == '__main__':
+    main()
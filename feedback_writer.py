@@ -0,0 +1,232 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from db import get_database, DataError, IntegrityError
+
+# --- Writer Configuration ---
+FEEDBACK_BATCH_SIZE = int(os.environ.get('AGRIZEN_FEEDBACK_BATCH_SIZE', '50'))
+FEEDBACK_FLUSH_INTERVAL = float(os.environ.get('AGRIZEN_FEEDBACK_FLUSH_INTERVAL', '2'))
+FEEDBACK_RETRY_INTERVAL = float(os.environ.get('AGRIZEN_FEEDBACK_RETRY_INTERVAL', '30'))
+FEEDBACK_SPILL_PATH = os.environ.get('AGRIZEN_FEEDBACK_SPILL_PATH', 'feedback_spill.jsonl')
+# Rows the database will never accept, kept for a human to look at
+FEEDBACK_DEAD_LETTER_PATH = os.environ.get('AGRIZEN_FEEDBACK_DEAD_LETTER_PATH', 'feedback_rejected.jsonl')
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(row):
+    user_id, page, feedback_text, created_at = row
+    return json.dumps({'user_id': user_id, 'page': page, 'feedback_text': feedback_text,
+                       'created_at': created_at.isoformat() if created_at else None})
+
+
+def _decode(line):
+    item = json.loads(line)
+    created_at = datetime.fromisoformat(item['created_at']) if item['created_at'] else None
+    return (item['user_id'], item['page'], item['feedback_text'], created_at)
+
+
+def _rewrite(path, lines):
+    # Whole-file swap, so a crash leaves either the old or the new contents
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.writelines(line + '\n' for line in lines)
+    os.replace(temporary, path)
+
+
+class FeedbackWriter:
+    """Queues feedback rows and writes them in batches from a background thread.
+
+    Rows that cannot reach the database are appended to a local spill file
+    and replayed once the database accepts writes again. Rows the database
+    refuses outright (constraint or data errors), and spill lines that no
+    longer decode, go to a dead-letter file instead of being retried.
+    """
+
+    def __init__(self, db, batch_size=FEEDBACK_BATCH_SIZE, flush_interval=FEEDBACK_FLUSH_INTERVAL,
+                 retry_interval=FEEDBACK_RETRY_INTERVAL, spill_path=FEEDBACK_SPILL_PATH,
+                 dead_letter_path=FEEDBACK_DEAD_LETTER_PATH):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self.spill_path = spill_path
+        self.dead_letter_path = dead_letter_path
+        self._queue = queue.Queue()
+        self._next_replay = 0.0
+        self._stats_lock = threading.Lock()
+        self._stats = {'submitted': 0, 'written': 0, 'batches': 0, 'spilled': 0, 'replayed': 0,
+                       'failed_flushes': 0, 'rejected': 0, 'corrupt': 0, 'errors': 0}
+        self._worker = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+        self._worker.start()
+
+    def submit(self, user_id, page, feedback_text, created_at=None):
+        self._queue.put((user_id, page, feedback_text, created_at or datetime.now()))
+        self._count('submitted')
+
+    def flush(self, timeout=None):
+        """Block until everything submitted so far has been written, spilled or dead-lettered."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _run(self):
+        while True:
+            waiters = []
+            try:
+                rows, waiters = self._collect()
+                if rows:
+                    self._write(rows)
+                if self._has_spill() and time.monotonic() >= self._next_replay:
+                    self._replay()
+            except Exception:
+                # The thread must outlive any one bad iteration, or the queue grows forever
+                logger.exception("Feedback writer iteration failed")
+                self._count('errors')
+                self._next_replay = time.monotonic() + self.retry_interval
+            finally:
+                for done in waiters:
+                    done.set()
+
+    def _collect(self):
+        rows, waiters = [], []
+        deadline = time.monotonic() + self.flush_interval
+        while len(rows) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                break
+            rows.append(item)
+        return rows, waiters
+
+    def _has_spill(self):
+        return os.path.exists(self.spill_path) or os.path.exists(self.spill_path + '.replay')
+
+    def _insert(self, rows):
+        """Insert rows; returns (written, rejected, unwritten).
+
+        A constraint or data error fails the whole statement, so the batch
+        is retried row by row to find the rows no retry could ever insert.
+        Any other failure (driver missing, pool timeout, server down) leaves
+        the rest unwritten for a later retry.
+        """
+        try:
+            self.db.executemany('insert_feedback', rows)
+            self._count('batches')
+            return len(rows), [], []
+        except (IntegrityError, DataError):
+            if len(rows) == 1:
+                return 0, rows, []
+        except Exception:
+            self._count('failed_flushes')
+            return 0, [], rows
+        written, rejected = 0, []
+        for i, row in enumerate(rows):
+            try:
+                self.db.executemany('insert_feedback', [row])
+            except (IntegrityError, DataError):
+                rejected.append(row)
+            except Exception:
+                self._count('failed_flushes')
+                return written, rejected, rows[i:]
+            else:
+                written += 1
+                self._count('batches')
+        return written, rejected, []
+
+    def _write(self, rows):
+        written, rejected, unwritten = self._insert(rows)
+        self._count('written', written)
+        self._dead_letter(_encode(row) for row in rejected)
+        if unwritten:
+            self._spill(unwritten)
+
+    def _spill(self, rows):
+        with open(self.spill_path, 'a', encoding='utf-8') as f:
+            for row in rows:
+                f.write(_encode(row) + '\n')
+        self._count('spilled', len(rows))
+        self._next_replay = time.monotonic() + self.retry_interval
+
+    def _dead_letter(self, lines):
+        lines = list(lines)
+        if not lines:
+            return
+        with open(self.dead_letter_path, 'a', encoding='utf-8') as f:
+            for line in lines:
+                f.write(line + '\n')
+        self._count('rejected', len(lines))
+        logger.warning("Dead-lettered %d feedback rows to %s", len(lines), self.dead_letter_path)
+
+    def _read_spill(self, path):
+        rows, corrupt = [], []
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(_decode(line))
+                except (ValueError, KeyError, TypeError):
+                    # e.g. a line cut short by a crash mid-spill
+                    corrupt.append(line)
+        if corrupt:
+            self._count('corrupt', len(corrupt))
+            self._dead_letter(corrupt)
+        return rows
+
+    def _replay(self):
+        replaying = self.spill_path + '.replay'
+        if not os.path.exists(replaying):
+            os.replace(self.spill_path, replaying)
+        # Rows spilled meanwhile stay in spill_path and are replayed after these
+        rows = self._read_spill(replaying)
+        while rows:
+            batch, rest = rows[:self.batch_size], rows[self.batch_size:]
+            written, rejected, unwritten = self._insert(batch)
+            self._count('replayed', written)
+            self._dead_letter(_encode(row) for row in rejected)
+            rows = unwritten + rest
+            # Progress is recorded per batch, so a crash never re-inserts committed rows
+            _rewrite(replaying, [_encode(row) for row in rows])
+            if unwritten:
+                self._next_replay = time.monotonic() + self.retry_interval
+                return
+        os.remove(replaying)
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['pending'] = self._queue.qsize()
+        stats['spill_file'] = self._has_spill()
+        return stats
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_feedback_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = FeedbackWriter(get_database())
+                atexit.register(_writer.flush, 10)
+    return _writer
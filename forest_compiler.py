@@ -0,0 +1,250 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# --- Packed Node Layout ---
+# Every node of every tree lives in one contiguous record array. Leaves point
+# to themselves with an infinite threshold, so traversal needs no masking.
+ROW_CHUNK = 4096
+
+
+def node_dtype(n_classes):
+    return np.dtype([
+        ('feature', np.int32),
+        ('left', np.int32),
+        ('right', np.int32),
+        ('threshold', np.float64),
+        ('value', np.float64, (n_classes,)),
+    ])
+
+
+def compiled_path(model_path):
+    return os.path.splitext(model_path)[0] + '.forest.npz'
+
+
+def source_fingerprint(model_path):
+    stat = os.stat(model_path)
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+class CompiledForest:
+    """Flat-array random forest evaluator with the same outputs as sklearn."""
+
+    def __init__(self, nodes, roots, classes, feature_names, max_depth, source=None):
+        self.nodes = nodes
+        self.roots = roots
+        self.classes_ = classes
+        self.feature_names_in_ = feature_names
+        self.max_depth = int(max_depth)
+        self.source = source
+        self.n_classes_ = len(classes)
+        self.n_features_in_ = len(feature_names)
+        # Field views share memory with the packed block
+        self._feature = nodes['feature']
+        self._left = nodes['left']
+        self._right = nodes['right']
+        self._threshold = nodes['threshold']
+        self._value = nodes['value']
+        # Small dense copies for the traversal loop; gathers from the wide
+        # records would touch a full cache line per node
+        self._feature_dense = np.ascontiguousarray(self._feature, dtype=np.intp)
+        self._threshold_dense = np.ascontiguousarray(self._threshold)
+        self._children = np.column_stack([self._left, self._right]).astype(np.intp).ravel()
+        self._value_dense = np.ascontiguousarray(self._value)
+
+    @classmethod
+    def from_sklearn(cls, model, source=None):
+        estimators = model.estimators_
+        n_classes = len(model.classes_)
+        total = sum(e.tree_.node_count for e in estimators)
+        nodes = np.empty(total, dtype=node_dtype(n_classes))
+        roots = np.empty(len(estimators), dtype=np.int32)
+        max_depth = 0
+        offset = 0
+        for t, estimator in enumerate(estimators):
+            tree = estimator.tree_
+            count = tree.node_count
+            own = np.arange(offset, offset + count, dtype=np.int32)
+            is_leaf = tree.children_left == -1
+            block = nodes[offset:offset + count]
+            block['feature'] = np.where(is_leaf, 0, tree.feature)
+            block['left'] = np.where(is_leaf, own, tree.children_left + offset)
+            block['right'] = np.where(is_leaf, own, tree.children_right + offset)
+            block['threshold'] = np.where(is_leaf, np.inf, tree.threshold)
+            # Same normalisation as DecisionTreeClassifier.predict_proba
+            value = tree.value[:, 0, :n_classes].astype(np.float64)
+            normalizer = value.sum(axis=1)
+            normalizer[normalizer == 0.0] = 1.0
+            block['value'] = value / normalizer[:, None]
+            roots[t] = offset
+            max_depth = max(max_depth, tree.max_depth)
+            offset += count
+        feature_names = getattr(model, 'feature_names_in_', None)
+        if feature_names is None:
+            feature_names = np.array([str(i) for i in range(model.n_features_in_)])
+        return cls(nodes, roots, np.asarray(model.classes_), np.asarray(feature_names, dtype=str),
+                   max_depth, source)
+
+    def save(self, path):
+        np.savez(path, nodes=self.nodes, roots=self.roots, classes=self.classes_,
+                 feature_names=self.feature_names_in_, max_depth=np.int64(self.max_depth),
+                 source=self.source if self.source is not None else np.zeros(2, dtype=np.int64))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['nodes'], data['roots'], data['classes'], data['feature_names'],
+                       data['max_depth'], data['source'])
+
+    def _as_matrix(self, X):
+        if hasattr(X, 'columns'):
+            X = X[list(self.feature_names_in_)].to_numpy()
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X[None, :]
+        # sklearn trees compare float32 inputs against float64 thresholds
+        return X.astype(np.float32).astype(np.float64)
+
+    def _proba_chunk(self, X):
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        offsets = (np.arange(n_rows, dtype=np.intp) * n_features)[:, None]
+        nodes = np.broadcast_to(self.roots.astype(np.intp), (n_rows, self.roots.size)).copy()
+        # All trees advance one level per step; children[2 * node + go_right]
+        for _ in range(self.max_depth):
+            go_right = flat[offsets + self._feature_dense[nodes]] > self._threshold_dense[nodes]
+            nodes = self._children[2 * nodes + go_right]
+        # Accumulate tree by tree in estimator order, as sklearn does
+        proba = np.zeros((n_rows, self.n_classes_), dtype=np.float64)
+        for t in range(self.roots.size):
+            proba += self._value_dense[nodes[:, t]]
+        proba /= self.roots.size
+        return proba
+
+    def predict_proba(self, X):
+        X = self._as_matrix(X)
+        if X.shape[0] <= ROW_CHUNK:
+            return self._proba_chunk(X)
+        return np.concatenate([self._proba_chunk(X[i:i + ROW_CHUNK])
+                               for i in range(0, X.shape[0], ROW_CHUNK)])
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def predict_one(self, row):
+        return self.predict(row)[0]
+
+
+def compile_model(model_path, save=True):
+    """Compile a pickled forest, caching the packed arrays next to it."""
+    import joblib
+    forest = CompiledForest.from_sklearn(joblib.load(model_path), source_fingerprint(model_path))
+    if save:
+        try:
+            forest.save(compiled_path(model_path))
+        except OSError:
+            # Read-only deploys still get the in-memory evaluator
+            pass
+    return forest
+
+
+def load_compiled(model_path):
+    path = compiled_path(model_path)
+    if os.path.exists(path):
+        forest = CompiledForest.load(path)
+        if np.array_equal(forest.source, source_fingerprint(model_path)):
+            return forest
+    return compile_model(model_path)
+
+
+# --- Parity Check ---
+def synthetic_rows(forest, n_rows, seed=0):
+    """Random rows spanning each feature's split thresholds."""
+    rng = np.random.default_rng(seed)
+    columns = []
+    for f in range(forest.n_features_in_):
+        mask = (forest._feature == f) & np.isfinite(forest._threshold)
+        thresholds = forest._threshold[mask]
+        low, high = (thresholds.min(), thresholds.max()) if thresholds.size else (0.0, 1.0)
+        span = max(high - low, 1.0)
+        columns.append(rng.uniform(low - 0.1 * span, high + 0.1 * span, n_rows))
+    return np.column_stack(columns)
+
+
+def reference_proba(model, X):
+    """RandomForestClassifier.predict_proba as computed by the training release.
+
+    scikit-learn >= 1.4 stores leaf fractions and no longer normalises at
+    predict time, so it misreads older pickles that store leaf counts.
+    """
+    proba = np.zeros((X.shape[0], len(model.classes_)), dtype=np.float64)
+    for estimator in model.estimators_:
+        leaf = estimator.tree_.value[estimator.apply(X), 0, :len(model.classes_)]
+        normalizer = leaf.sum(axis=1)
+        normalizer[normalizer == 0.0] = 1.0
+        proba += leaf / normalizer[:, None]
+    return proba / len(model.estimators_)
+
+
+def verify(model_path, n_rows=20000, seed=0):
+    import joblib
+    import pandas as pd
+    model = joblib.load(model_path)
+    for estimator in getattr(model, 'estimators_', []):
+        # Only the reference sklearn path needs this for old pickles
+        if not hasattr(estimator, 'monotonic_cst'):
+            estimator.monotonic_cst = None
+    forest = CompiledForest.from_sklearn(model)
+    X = pd.DataFrame(synthetic_rows(forest, n_rows, seed), columns=forest.feature_names_in_)
+    reference = reference_proba(model, X.to_numpy(dtype=np.float32))
+    expected = model.classes_[np.argmax(reference, axis=1)]
+    actual = forest.predict(X)
+    mismatches = int(np.count_nonzero(expected != actual))
+    installed_mismatches = int(np.count_nonzero(model.predict(X) != actual))
+    row = X.iloc[:1]
+    start = time.perf_counter()
+    for _ in range(200):
+        model.predict(row)
+    sklearn_single = (time.perf_counter() - start) / 200
+    start = time.perf_counter()
+    for _ in range(200):
+        forest.predict(row)
+    compiled_single = (time.perf_counter() - start) / 200
+    return {
+        'rows': n_rows,
+        'mismatches': mismatches,
+        'installed_sklearn_mismatches': installed_mismatches,
+        'max_proba_diff': float(np.abs(reference - forest.predict_proba(X)).max()),
+        'sklearn_single_ms': 1000 * sklearn_single,
+        'compiled_single_ms': 1000 * compiled_single,
+    }
+
+
+def main(argv=None):
+    from model_registry import registry
+    parser = argparse.ArgumentParser(description="Compile the random-forest pickles into packed arrays.")
+    parser.add_argument('command', choices=['compile', 'verify'])
+    parser.add_argument('models', nargs='*', default=['crop_model', 'fertilizer_model'])
+    parser.add_argument('--rows', type=int, default=20000)
+    args = parser.parse_args(argv)
+    status = 0
+    for name in args.models:
+        path = registry.path(name)
+        if args.command == 'compile':
+            forest = compile_model(path)
+            print(f"{name}: {forest.nodes.size} nodes, {forest.roots.size} trees -> {compiled_path(path)}")
+        else:
+            report = verify(path, args.rows)
+            print(f"{name}: {report['mismatches']} mismatches over {report['rows']} rows, "
+                  f"max |dp| {report['max_proba_diff']:.2e} "
+                  f"({report['installed_sklearn_mismatches']} differ from installed sklearn), single row "
+                  f"{report['sklearn_single_ms']:.2f} ms (sklearn) vs {report['compiled_single_ms']:.3f} ms")
+            status = status or int(report['mismatches'] > 0)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
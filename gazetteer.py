@@ -0,0 +1,453 @@
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+
+import numpy as np
+
+# --- Gazetteer Configuration ---
+# The bundled seed covers major cities and towns; point AGRIZEN_GAZETTEER_SOURCE
+# at a GeoNames country dump (IN.txt) for villages and districts. The source
+# is compiled into a memory-mapped index, rebuilt whenever it changes.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GAZETTEER_SOURCE = os.environ.get('AGRIZEN_GAZETTEER_SOURCE', os.path.join(BASE_DIR, 'gazetteer_seed.csv'))
+GAZETTEER_INDEX_PATH = os.environ.get('AGRIZEN_GAZETTEER_INDEX', os.path.join(BASE_DIR, 'gazetteer.idx'))
+# Keys are fixed-width so prefix ranges are two np.searchsorted calls on the mapped array
+KEY_BYTES = 32
+FUZZY_MAX_DISTANCE = 2
+# Short prefixes span huge key ranges; past this many keys they are answered
+# from the POPULAR_KEYS keys of the most populous places instead of a scan
+PREFIX_SCAN_LIMIT = 4096
+POPULAR_KEYS = 16384
+FORMAT_VERSION = 1
+MAGIC = b'AGRIZEN-GAZ\x00'
+ALIGNMENT = 64
+
+KINDS = ['district', 'city', 'town', 'village']
+
+
+# --- Transliteration-aware Keys ---
+_DEVANAGARI_VOWELS = {
+    'अ': 'a', 'आ': 'aa', 'इ': 'i', 'ई': 'ii', 'उ': 'u', 'ऊ': 'uu', 'ऋ': 'ri', 'ए': 'e', 'ऐ': 'ai',
+    'ओ': 'o', 'औ': 'au',
+}
+_DEVANAGARI_SIGNS = {
+    'ा': 'aa', 'ि': 'i', 'ी': 'ii', 'ु': 'u', 'ू': 'uu', 'ृ': 'ri', 'े': 'e', 'ै': 'ai', 'ो': 'o', 'ौ': 'au',
+}
+_DEVANAGARI_CONSONANTS = {
+    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'n', 'च': 'ch', 'छ': 'chh', 'ज': 'j', 'झ': 'jh', 'ञ': 'n',
+    'ट': 't', 'ठ': 'th', 'ड': 'd', 'ढ': 'dh', 'ण': 'n', 'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
+    'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm', 'य': 'y', 'र': 'r', 'ल': 'l', 'ळ': 'l', 'व': 'v',
+    'श': 'sh', 'ष': 'sh', 'स': 's', 'ह': 'h',
+}
+_DEVANAGARI_FINALS = {'ं': 'n', 'ँ': 'n', 'ः': 'h'}
+_VIRAMA = '्'
+_NUKTA = '़'
+
+# Spelling variants of the same sound in romanised Indian place names
+_PHONETIC_RULES = [
+    (re.compile(r'chh|ch'), 'c'),
+    (re.compile(r'sh'), 's'),
+    (re.compile(r'ph|f'), 'p'),
+    (re.compile(r'([kgjtdb])h'), r'\1'),
+    (re.compile(r'ee|ii'), 'i'),
+    (re.compile(r'oo|uu'), 'u'),
+    (re.compile(r'w'), 'v'),
+    (re.compile(r'z'), 'j'),
+    (re.compile(r'q'), 'k'),
+    (re.compile(r'x'), 'ks'),
+    (re.compile(r'(.)\1+'), r'\1'),
+]
+
+
+def transliterate(text):
+    """Devanagari to a plain Latin romanisation; other characters pass through."""
+    out = []
+    pending_vowel = False
+    for char in unicodedata.normalize('NFKD', text):
+        if char in _DEVANAGARI_CONSONANTS:
+            if pending_vowel:
+                out.append('a')
+            out.append(_DEVANAGARI_CONSONANTS[char])
+            pending_vowel = True
+            continue
+        if char == _NUKTA:
+            # Only modifies the consonant before it (ज़ is still a j key)
+            continue
+        if char in _DEVANAGARI_SIGNS:
+            out.append(_DEVANAGARI_SIGNS[char])
+        elif char == _VIRAMA:
+            pass
+        elif char in _DEVANAGARI_FINALS:
+            if pending_vowel:
+                out.append('a')
+            out.append(_DEVANAGARI_FINALS[char])
+        elif char in _DEVANAGARI_VOWELS:
+            if pending_vowel:
+                out.append('a')
+            out.append(_DEVANAGARI_VOWELS[char])
+        else:
+            # Word-final inherent vowels are silent in Hindi ("नगर" is "nagar")
+            out.append(char)
+        pending_vowel = False
+    return ''.join(out)
+
+
+def fold(text):
+    """Search key for a place name in Latin or Devanagari script.
+
+    Diacritics, case, spaces and punctuation are dropped and common
+    romanisation variants are merged, so 'Poona', 'Pūnā' and 'पूना' share a
+    key, as do 'Vishakhapatnam' and 'Visakhapatnam'.
+    """
+    text = unicodedata.normalize('NFKD', transliterate(str(text)))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.sub(r'[^a-z0-9]', '', text)
+    for pattern, replacement in _PHONETIC_RULES:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+# --- Result Object ---
+class Place:
+    __slots__ = ('name', 'state', 'kind', 'latitude', 'longitude', 'population', 'distance')
+
+    def __init__(self, name, state, kind, latitude, longitude, population, distance=0):
+        self.name = name
+        self.state = state
+        self.kind = kind
+        self.latitude = latitude
+        self.longitude = longitude
+        self.population = population
+        self.distance = distance
+
+    @property
+    def label(self):
+        return f"{self.name}, {self.state}" if self.state else self.name
+
+    def as_dict(self):
+        return {'name': self.name, 'state': self.state, 'kind': self.kind, 'label': self.label,
+                'latitude': self.latitude, 'longitude': self.longitude, 'population': self.population}
+
+    def __repr__(self):
+        return f"<Place {self.label} ({self.kind}, {self.latitude:.3f}, {self.longitude:.3f})>"
+
+
+# --- Sources ---
+def read_seed(path):
+    """Rows of the bundled CSV: name, '|'-separated alternate names, state, kind, coordinates, population."""
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield (row['name'], [n for n in row['alternate_names'].split('|') if n], row['state'], row['kind'],
+                   float(row['latitude']), float(row['longitude']), int(row['population'] or 0))
+
+
+def read_geonames(path, admin1_path=None):
+    """Populated places and districts from a GeoNames country dump (tab-separated, no header)."""
+    states = {}
+    admin1_path = admin1_path or os.path.join(os.path.dirname(path), 'admin1CodesASCII.txt')
+    if os.path.exists(admin1_path):
+        with open(admin1_path, encoding='utf-8') as f:
+            for line in f:
+                parts = line.rstrip('\n').split('\t')
+                if len(parts) >= 2:
+                    states[parts[0]] = parts[1]
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) < 15:
+                continue
+            feature_class, feature_code = parts[6], parts[7]
+            population = int(parts[14] or 0)
+            if feature_class == 'A' and feature_code == 'ADM2':
+                kind = 'district'
+            elif feature_class == 'P':
+                if population >= 100000 or feature_code in ('PPLC', 'PPLA', 'PPLA2'):
+                    kind = 'city'
+                elif population >= 5000:
+                    kind = 'town'
+                else:
+                    kind = 'village'
+            else:
+                continue
+            alternates = [parts[2]] + [n for n in parts[3].split(',') if n]
+            state = states.get(f"{parts[8]}.{parts[10]}", parts[10])
+            yield parts[1], alternates, state, kind, float(parts[4]), float(parts[5]), population
+
+
+def read_source(path):
+    return read_geonames(path) if path.lower().endswith('.txt') else read_seed(path)
+
+
+def source_fingerprint(path):
+    stat = os.stat(path)
+    return [os.path.basename(path), stat.st_size, stat.st_mtime_ns]
+
+
+# --- Index Build ---
+def compile_index(rows):
+    """Arrays of the index: per-place columns plus sorted fixed-width keys pointing at places."""
+    names, states, kinds, latitudes, longitudes, populations = [], [], [], [], [], []
+    state_ids = {}
+    keys, key_place = [], []
+    for name, alternates, state, kind, latitude, longitude, population in rows:
+        place = len(names)
+        names.append(name)
+        states.append(state_ids.setdefault(state, len(state_ids)))
+        kinds.append(KINDS.index(kind))
+        latitudes.append(latitude)
+        longitudes.append(longitude)
+        populations.append(population)
+        seen = set()
+        for variant in [name] + alternates:
+            key = fold(variant).encode('ascii')[:KEY_BYTES]
+            if key and key not in seen:
+                seen.add(key)
+                keys.append(key)
+                key_place.append(place)
+
+    encoded = [name.encode('utf-8') for name in names]
+    keys = np.array(keys, dtype=f'S{KEY_BYTES}')
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    key_place = np.array(key_place, dtype=np.int32)[order]
+    key_population = np.array(populations, dtype=np.int64)[key_place] if len(key_place) else np.zeros(0, np.int64)
+    if len(keys) > POPULAR_KEYS:
+        popular = np.sort(np.argpartition(-key_population, POPULAR_KEYS)[:POPULAR_KEYS])
+    else:
+        popular = np.arange(len(keys))
+    return {
+        'keys': keys,
+        'key_place': key_place,
+        # Still in key order, so prefix ranges work on it the same way
+        'popular': popular.astype(np.int32),
+        'popular_keys': keys[popular],
+        'name_offsets': np.concatenate([[0], np.cumsum([len(e) for e in encoded])]).astype(np.int64),
+        'names': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+        'state': np.array(states, dtype=np.uint16),
+        'kind': np.array(kinds, dtype=np.uint8),
+        'latitude': np.array(latitudes, dtype=np.float32),
+        'longitude': np.array(longitudes, dtype=np.float32),
+        'population': np.array(populations, dtype=np.uint32),
+    }, sorted(state_ids, key=state_ids.get)
+
+
+def save_index(arrays, states, source, path=GAZETTEER_INDEX_PATH):
+    """One file: magic, JSON header length and header, then each array at an aligned offset."""
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        layout[name] = [array.dtype.str, list(array.shape), offset]
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    header = json.dumps({'version': FORMAT_VERSION, 'source': source, 'states': states,
+                         'arrays': layout}).encode('utf-8')
+    start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+    # Per-process name: concurrent rebuilds each write their own file and the last replace wins
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC + np.uint64(len(header)).tobytes() + header)
+        for name, array in arrays.items():
+            f.seek(start + layout[name][2])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(start + offset)
+    os.replace(tmp, path)
+
+
+# --- Lookups ---
+class Gazetteer:
+    """Read-only lookups over a memory-mapped index; only touched pages are read from disk."""
+
+    def __init__(self, path=GAZETTEER_INDEX_PATH):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a gazetteer index")
+            header_length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            header = json.loads(f.read(header_length))
+        self.path = path
+        self.version = header['version']
+        self.source = header['source']
+        self.states = header['states']
+        self._state_keys = [fold(state) for state in self.states]
+        start = -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+        self.arrays = {}
+        for name, (dtype, shape, offset) in header['arrays'].items():
+            if int(np.prod(shape)) == 0:
+                self.arrays[name] = np.zeros(shape, dtype=dtype)
+            else:
+                # A plain ndarray view of the mapping skips memmap's per-index overhead
+                self.arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=start + offset,
+                                              shape=tuple(shape)).view(np.ndarray)
+        self.keys = self.arrays['keys']
+        self.key_place = self.arrays['key_place']
+
+    def __len__(self):
+        return len(self.arrays['kind'])
+
+    def place(self, i, distance=0):
+        a = self.arrays
+        start, end = a['name_offsets'][i], a['name_offsets'][i + 1]
+        return Place(bytes(a['names'][start:end]).decode('utf-8'), self.states[a['state'][i]], KINDS[a['kind'][i]],
+                     float(a['latitude'][i]), float(a['longitude'][i]), int(a['population'][i]), distance)
+
+    def _range(self, key, keys=None):
+        keys = self.keys if keys is None else keys
+        return int(np.searchsorted(keys, key, side='left')), int(np.searchsorted(keys, key + b'\xff', side='left'))
+
+    def _state_filter(self, places, state):
+        if not state:
+            return places
+        wanted = fold(state)
+        allowed = np.array([key.startswith(wanted) for key in self._state_keys], dtype=bool)
+        return places[allowed[self.arrays['state'][places]]] if len(allowed) else places
+
+    def prefix(self, text, limit=10, state=None):
+        """Places with a name or alternate name starting with text; exact names first, then by population."""
+        key = fold(text).encode('ascii')[:KEY_BYTES]
+        if not key:
+            return []
+        lo, hi = self._range(key)
+        if lo == hi:
+            return []
+        exact_lo = int(np.searchsorted(self.keys, key, side='right'))
+        exact = self.key_place[lo:exact_lo]
+        places = None
+        if hi - lo > PREFIX_SCAN_LIMIT:
+            # Every key outside the popular subset belongs to a smaller place than any key in
+            # it, so once the subset holds `limit` matches the top ones are among them
+            popular = self.arrays['popular']
+            popular_lo, popular_hi = self._range(key, self.arrays['popular_keys'])
+            places = self._state_filter(np.unique(np.concatenate(
+                [self.key_place[popular[popular_lo:popular_hi]], exact])), state)
+            if len(places) < limit:
+                places = None
+        if places is None:
+            places = self._state_filter(np.unique(self.key_place[lo:hi]), state)
+        order = np.lexsort((-self.arrays['population'][places].astype(np.int64), ~np.isin(places, exact)))
+        return [self.place(int(i)) for i in places[order[:limit]]]
+
+    def fuzzy(self, text, limit=10, max_distance=FUZZY_MAX_DISTANCE, state=None):
+        """Places whose name starts with something within max_distance edits of text.
+
+        Candidates share text's first two letters, or failing any match its
+        first letter; a vectorised Levenshtein pass scores them all at once.
+        """
+        query = np.frombuffer(fold(text).encode('ascii')[:KEY_BYTES], dtype=np.uint8)
+        # Short queries would match nearly everything: one edit from 4 letters, two from 7
+        max_distance = min(max_distance, (len(query) - 1) // 3)
+        if max_distance < 1:
+            return []
+        for anchor in (2, 1):
+            lo, hi = self._range(query[:anchor].tobytes())
+            results = self._edit_matches(query, lo, hi, max_distance, limit, state) if lo < hi else []
+            if results:
+                return results
+        return []
+
+    def _edit_matches(self, query, lo, hi, max_distance, limit, state):
+        width = min(len(query) + max_distance, KEY_BYTES)
+        candidates = np.asarray(self.keys[lo:hi]).view(np.uint8).reshape(-1, KEY_BYTES)[:, :width]
+        lengths = np.count_nonzero(candidates, axis=1)
+        # A key shorter than the query by more than max_distance cannot match it
+        index = np.flatnonzero(lengths >= len(query) - max_distance)
+        candidates, lengths = candidates[index], lengths[index]
+        columns = np.arange(width + 1, dtype=np.uint8)
+        row = np.broadcast_to(columns, (len(candidates), width + 1)).copy()
+        for i, char in enumerate(query, 1):
+            next_row = np.empty_like(row)
+            next_row[:, 0] = i
+            np.minimum(row[:, 1:] + 1, row[:, :-1] + (candidates != char), out=next_row[:, 1:])
+            # Insertions chain along the row: a running minimum of (value - column) resolves them
+            row = np.minimum.accumulate(next_row + (KEY_BYTES - columns), axis=1) - (KEY_BYTES - columns)
+            # Row minima never decrease, so keys already past max_distance are dropped early
+            alive = row.min(axis=1) <= max_distance
+            if not alive.all():
+                index, candidates, lengths, row = index[alive], candidates[alive], lengths[alive], row[alive]
+                if not len(index):
+                    return []
+        # Past a key's end, only the distance at its full length counts
+        distance = np.where(columns[None, :] <= lengths[:, None], row, KEY_BYTES).min(axis=1)
+        keep = distance <= max_distance
+        if not keep.any():
+            return []
+        places = self.key_place[lo:hi][index[keep]]
+        distance = distance[keep]
+        order = np.lexsort((-self.arrays['population'][places].astype(np.int64), distance))
+        places, first = np.unique(places[order], return_index=True)
+        best = dict(zip(places.tolist(), distance[order][first].tolist()))
+        ranked = self._state_filter(places[np.argsort(first)], state)[:limit]
+        return [self.place(int(i), best[int(i)]) for i in ranked]
+
+    def search(self, text, limit=10):
+        """Autocomplete: prefix matches, or fuzzy ones when nothing starts with text. 'Name, State' narrows by state."""
+        name, _, state = str(text).partition(',')
+        return self.prefix(name, limit, state.strip()) or self.fuzzy(name, limit, state=state.strip())
+
+    def resolve(self, text):
+        """Best single place for free text, or None."""
+        results = self.search(text, 1)
+        return results[0] if results else None
+
+
+def build(source=GAZETTEER_SOURCE, path=GAZETTEER_INDEX_PATH):
+    arrays, states = compile_index(read_source(source))
+    save_index(arrays, states, source_fingerprint(source), path)
+    return Gazetteer(path)
+
+
+def load(source=GAZETTEER_SOURCE, path=GAZETTEER_INDEX_PATH):
+    """The mapped index, rebuilt first if it is missing or older than its source."""
+    try:
+        gazetteer = Gazetteer(path)
+        if gazetteer.version == FORMAT_VERSION and gazetteer.source == source_fingerprint(source):
+            return gazetteer
+    except (OSError, ValueError, KeyError):
+        pass
+    return build(source, path)
+
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer():
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = load()
+    return _gazetteer
+
+
+# --- Command Line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the offline place-name index.")
+    parser.add_argument('command', choices=['build', 'search'])
+    parser.add_argument('query', nargs='?')
+    parser.add_argument('--source', default=GAZETTEER_SOURCE, help="seed CSV or GeoNames IN.txt")
+    parser.add_argument('-o', '--output', default=GAZETTEER_INDEX_PATH)
+    parser.add_argument('-n', '--limit', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        gazetteer = build(args.source, args.output)
+        print(f"Indexed {len(gazetteer)} places under {len(gazetteer.keys)} keys in "
+              f"{time.perf_counter() - start:.2f}s -> {args.output} ({os.path.getsize(args.output)} bytes)")
+        return 0
+    gazetteer = load(args.source, args.output)
+    start = time.perf_counter()
+    results = gazetteer.search(args.query or '', args.limit)
+    elapsed = time.perf_counter() - start
+    for place in results:
+        print(f"{place.label:40} {place.kind:9} {place.latitude:8.4f} {place.longitude:8.4f}"
+              + (f"  ({place.distance} edits)" if place.distance else ''))
+    print(f"{len(results)} results in {1000 * elapsed:.3f} ms", file=sys.stderr)
+    return 0 if results else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
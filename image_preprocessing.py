@@ -0,0 +1,68 @@
+import io
+import threading
+
+import numpy as np
+from PIL import Image
+
+# --- Model Input Sizes ---
+PEST_INPUT_SIZE = (225, 225)
+DISEASE_INPUT_SIZE = (128, 128)
+THUMBNAIL_SIZE = (512, 512)
+PIXEL_SCALE = np.float32(1.0 / 255.0)
+
+_buffers = threading.local()
+
+
+def input_buffer(size):
+    """Per-thread reusable (1, H, W, 3) float32 buffer for a model input size."""
+    cache = getattr(_buffers, 'by_size', None)
+    if cache is None:
+        cache = _buffers.by_size = {}
+    buffer = cache.get(size)
+    if buffer is None:
+        width, height = size
+        buffer = cache[size] = np.empty((1, height, width, 3), dtype=np.float32)
+    return buffer
+
+
+def open_reduced(image_bytes, min_size):
+    """Decode an upload at the smallest JPEG DCT scale still covering min_size."""
+    image = Image.open(io.BytesIO(image_bytes))
+    # draft() only affects JPEG; other formats decode at full size
+    image.draft('RGB', min_size)
+    return image.convert('RGB')
+
+
+def to_tensor(image, size, out=None, scale=PIXEL_SCALE):
+    if image.size != size:
+        image = image.resize(size)
+    if out is None:
+        out = input_buffer(size)
+    # uint8 -> float32 scaling straight into the destination buffer
+    np.multiply(np.asarray(image, dtype=np.uint8), scale, out=out[0])
+    return out
+
+
+def preprocess(image_bytes, size, scale=PIXEL_SCALE, out=None, thumbnail_size=None):
+    """Return the (1, H, W, 3) float32 model input, plus a display thumbnail.
+
+    The returned array is a per-thread buffer reused by the next call on the
+    same thread; copy it if it has to outlive that.
+    """
+    min_size = size
+    if thumbnail_size is not None:
+        min_size = (max(size[0], thumbnail_size[0]), max(size[1], thumbnail_size[1]))
+    image = open_reduced(image_bytes, min_size)
+    tensor = to_tensor(image, size, out=out, scale=scale)
+    thumbnail = None
+    if thumbnail_size is not None:
+        # Display only: bilinear is visually fine and much cheaper than bicubic
+        image.thumbnail(thumbnail_size, resample=Image.BILINEAR)
+        thumbnail = image
+    return tensor, thumbnail
+
+
+def make_thumbnail(image_bytes, size=THUMBNAIL_SIZE):
+    image = open_reduced(image_bytes, size)
+    image.thumbnail(size, resample=Image.BILINEAR)
+    return image
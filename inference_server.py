@@ -0,0 +1,157 @@
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+import numpy as np
+
+from model_registry import registry
+
+# --- Batching Configuration ---
+# Larger batches raise CPU throughput, longer waits raise per-request latency
+MAX_BATCH_SIZE = int(os.environ.get('AGRIZEN_MAX_BATCH', '16'))
+MAX_WAIT_MS = float(os.environ.get('AGRIZEN_MAX_WAIT_MS', '5'))
+
+
+class _Request:
+    __slots__ = ('sample', 'future', 'enqueued_at')
+
+    def __init__(self, sample):
+        self.sample = sample
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class InferenceBatcher:
+    """Gathers single-image requests from concurrent sessions into batches.
+
+    One worker thread owns the model and runs a single predict_on_batch per
+    batch; every caller gets back its own row of the output.
+    """
+
+    def __init__(self, model, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS, name="model"):
+        self.model = model
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._started_at = time.perf_counter()
+        self._requests = 0
+        self._batches = 0
+        self._batch_sizes = Counter()
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._inference_total = 0.0
+        self._worker = threading.Thread(target=self._run, name=f"batcher-{name}", daemon=True)
+        self._worker.start()
+
+    def submit(self, sample):
+        sample = np.asarray(sample)
+        # Accept both a single sample and a batch of one
+        if sample.ndim == 4 and sample.shape[0] == 1:
+            sample = sample[0]
+        request = _Request(sample)
+        self._queue.put(request)
+        return request.future
+
+    def predict(self, sample, timeout=None):
+        return self.submit(sample).result(timeout=timeout)
+
+    def predict_many(self, samples, timeout=None):
+        """Queue every sample before waiting, so they land in the same batch."""
+        futures = [self.submit(sample) for sample in samples]
+        return np.stack([future.result(timeout=timeout) for future in futures])
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _stack(self, samples):
+        # Remote models hand out a shared-memory buffer to stack into, so the
+        # batch reaches the model server without another copy
+        input_buffer = getattr(self.model, 'input_buffer', None)
+        if input_buffer is None:
+            return np.stack(samples)
+        out = input_buffer((len(samples),) + samples[0].shape, samples[0].dtype)
+        return np.stack(samples, out=out)
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            try:
+                inputs = self._stack([request.sample for request in batch])
+                outputs = np.asarray(self.model.predict_on_batch(inputs))
+                # zip() would leave the surplus callers waiting forever
+                if outputs.ndim == 0 or len(outputs) != len(batch):
+                    raise ValueError(f"{self.name} returned output of shape {outputs.shape} "
+                                     f"for a batch of {len(batch)}")
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            finished = time.perf_counter()
+            for row, request in zip(outputs, batch):
+                request.future.set_result(row)
+            self._record(batch, started, finished)
+
+    def _record(self, batch, started, finished):
+        waits = [started - request.enqueued_at for request in batch]
+        with self._stats_lock:
+            self._requests += len(batch)
+            self._batches += 1
+            self._batch_sizes[len(batch)] += 1
+            self._queue_wait_total += sum(waits)
+            self._queue_wait_max = max(self._queue_wait_max, max(waits))
+            self._inference_total += finished - started
+
+    def stats(self):
+        with self._stats_lock:
+            elapsed = time.perf_counter() - self._started_at
+            requests = self._requests
+            batches = self._batches
+            return {
+                'name': self.name,
+                'requests': requests,
+                'batches': batches,
+                'pending': self._queue.qsize(),
+                'throughput_rps': requests / elapsed if elapsed > 0 else 0.0,
+                'mean_batch_size': requests / batches if batches else 0.0,
+                'batch_size_histogram': dict(sorted(self._batch_sizes.items())),
+                'mean_queue_wait_ms': 1000.0 * self._queue_wait_total / requests if requests else 0.0,
+                'max_queue_wait_ms': 1000.0 * self._queue_wait_max,
+                'mean_batch_inference_ms': 1000.0 * self._inference_total / batches if batches else 0.0,
+            }
+
+
+# --- Process-wide Batchers ---
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(name):
+    """Return the shared batcher for a registered model, loading it if needed."""
+    batcher = _batchers.get(name)
+    if batcher is not None:
+        return batcher
+    with _batchers_lock:
+        if name not in _batchers:
+            _batchers[name] = InferenceBatcher(registry.get(name), name=name)
+        return _batchers[name]
+
+
+def batcher_stats():
+    return {name: batcher.stats() for name, batcher in list(_batchers.items())}
@@ -0,0 +1,297 @@
+import datetime
+import os
+
+import numpy as np
+
+# --- Water-balance Engine Configuration ---
+# Soil moisture readings are percent of plant-available water: 0 is the
+# wilting point and 100 is field capacity. Weather inputs are held constant
+# over the horizon unless per-day arrays are passed.
+HORIZON_DAYS = int(os.environ.get('AGRIZEN_IRRIGATION_HORIZON', '14'))
+# Fields whose first irrigation falls within this many days are "Moderate"
+WATCH_DAYS = int(os.environ.get('AGRIZEN_IRRIGATION_WATCH_DAYS', '3'))
+# Hargreaves needs extraterrestrial radiation, so latitude defaults to central India
+DEFAULT_LATITUDE = float(os.environ.get('AGRIZEN_IRRIGATION_LATITUDE', '20.0'))
+
+CROP_TYPES = ["Rice", "Wheat", "Corn", "Cotton", "Sugarcane", "Vegetables"]
+# FAO-56 mid-season crop coefficient, effective root depth (m) and the
+# fraction of available water that can be depleted before stress sets in
+CROP_PARAMETERS = {
+    "Rice": (1.20, 0.5, 0.20),
+    "Wheat": (1.15, 1.2, 0.55),
+    "Corn": (1.20, 1.2, 0.55),
+    "Cotton": (1.15, 1.2, 0.65),
+    "Sugarcane": (1.25, 1.5, 0.65),
+    "Vegetables": (1.05, 0.5, 0.40),
+}
+SOIL_TYPES = ["Sandy", "Loamy", "Clayey", "Red", "Black"]
+# Volumetric water content at field capacity and at the wilting point
+SOIL_PARAMETERS = {
+    "Sandy": (0.12, 0.05),
+    "Loamy": (0.27, 0.12),
+    "Clayey": (0.40, 0.22),
+    "Red": (0.22, 0.10),
+    "Black": (0.38, 0.20),
+}
+DEFAULT_SOIL = "Loamy"
+
+# A wet soil surface adds evaporation on top of crop transpiration; the
+# extra coefficient decays with days since rain and resets on a wetting rain
+SURFACE_EVAPORATION = 0.25
+SURFACE_DRYING_DAYS = 2.0
+WETTING_RAIN_MM = 2.0
+# Hargreaves uses the daily temperature range, which humid air narrows
+MIN_TEMPERATURE_RANGE = 4.0
+MAX_TEMPERATURE_RANGE = 18.0
+
+KC = np.array([CROP_PARAMETERS[c][0] for c in CROP_TYPES])
+ROOT_DEPTH_M = np.array([CROP_PARAMETERS[c][1] for c in CROP_TYPES])
+DEPLETION_FRACTION = np.array([CROP_PARAMETERS[c][2] for c in CROP_TYPES])
+FIELD_CAPACITY = np.array([SOIL_PARAMETERS[s][0] for s in SOIL_TYPES])
+WILTING_POINT = np.array([SOIL_PARAMETERS[s][1] for s in SOIL_TYPES])
+
+FIELD_COLUMNS = ['field_id', 'crop_type', 'soil_type', 'soil_moisture', 'days_since_rain', 'temperature', 'humidity',
+                 'location']
+FIELD_DEFAULTS = {'soil_type': DEFAULT_SOIL, 'days_since_rain': 3, 'temperature': 28.0, 'humidity': 65.0}
+
+
+def codes(values, names, what):
+    """Integer indices into names for an array of names (any case) or of indices."""
+    values = np.atleast_1d(np.asarray(values))
+    if np.issubdtype(values.dtype, np.integer):
+        if values.size and (values.min() < 0 or values.max() >= len(names)):
+            raise ValueError(f"{what} codes must be 0..{len(names) - 1}")
+        return values.astype(np.intp)
+    # Only the distinct names go through Python, however many fields there are
+    uniques, inverse = np.unique(values.astype(str), return_inverse=True)
+    lookup = {name.lower(): i for i, name in enumerate(names)}
+    unknown = [u for u in uniques.tolist() if u.strip().lower() not in lookup]
+    if unknown:
+        raise ValueError(f"Unknown {what} {unknown[:5]}; expected one of {', '.join(names)}")
+    return np.array([lookup[u.strip().lower()] for u in uniques.tolist()], dtype=np.intp)[inverse.ravel()]
+
+
+# --- Reference Evapotranspiration ---
+def extraterrestrial_radiation(latitude, day_of_year):
+    """Daily extraterrestrial radiation Ra in MJ/m²/day (FAO-56 eq. 21)."""
+    phi = np.radians(latitude)
+    angle = 2 * np.pi * np.asarray(day_of_year) / 365
+    inverse_distance = 1 + 0.033 * np.cos(angle)
+    declination = 0.409 * np.sin(angle - 1.39)
+    sunset = np.arccos(np.clip(-np.tan(phi) * np.tan(declination), -1.0, 1.0))
+    return (24 * 60 / np.pi) * 0.0820 * inverse_distance * (
+        sunset * np.sin(phi) * np.sin(declination) + np.cos(phi) * np.cos(declination) * np.sin(sunset))
+
+
+def hargreaves_et0(temperature, humidity, radiation):
+    """Reference ET in mm/day from mean temperature, with the daily range estimated from humidity."""
+    temperature_range = np.clip(20.0 - 0.15 * np.asarray(humidity, dtype=np.float64),
+                                MIN_TEMPERATURE_RANGE, MAX_TEMPERATURE_RANGE)
+    # 0.408 converts MJ/m²/day of radiation into mm/day of evaporated water
+    return np.maximum(0.0023 * 0.408 * radiation * (np.asarray(temperature) + 17.8) * np.sqrt(temperature_range), 0.0)
+
+
+# --- Simulation ---
+def _daily(values, n, days, what):
+    """Broadcast a scalar, per-field (n,) or per-day (n, days) input to (n, days)."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1 and values.shape[0] == n:
+        values = values[:, None]
+    try:
+        return np.broadcast_to(values, (n, days))
+    except ValueError:
+        raise ValueError(f"{what} must be a scalar, one value per field or a (fields, days) array") from None
+
+
+def simulate(crop, soil, moisture, days_since_rain, temperature, humidity, days=HORIZON_DAYS, rain=None,
+             latitude=DEFAULT_LATITUDE, start=None):
+    """Daily root-zone water balance for every field at once.
+
+    Each morning a field whose depletion has passed its readily available
+    water is irrigated back to field capacity; the day's crop ET is then
+    drawn down and any rain refills it. Returns a dict of per-field arrays
+    plus (fields, days) 'irrigation_mm' and 'et_mm' matrices.
+    """
+    crop = codes(crop, CROP_TYPES, "crop type")
+    soil = codes(soil, SOIL_TYPES, "soil type")
+    n = len(crop)
+    if len(soil) == 1 and n > 1:
+        soil = np.broadcast_to(soil, n)
+    moisture = np.broadcast_to(np.clip(np.asarray(moisture, dtype=np.float64), 0, 100), n)
+    if len(soil) != n:
+        raise ValueError("crop and soil arrays must have one entry per field")
+
+    start = start or datetime.date.today()
+    day_of_year = start.timetuple().tm_yday + np.arange(days)
+    latitude = np.asarray(latitude, dtype=np.float64)
+    # One latitude for every field needs one radiation curve, not one per field
+    radiation = extraterrestrial_radiation(latitude if latitude.ndim == 0 else latitude[:, None], day_of_year[None, :])
+    et0 = hargreaves_et0(_daily(temperature, n, days, "temperature"), _daily(humidity, n, days, "humidity"),
+                         radiation)
+    rain = _daily(0.0 if rain is None else rain, n, days, "rain")
+
+    total = (FIELD_CAPACITY[soil] - WILTING_POINT[soil]) * 1000 * ROOT_DEPTH_M[crop]
+    readily = DEPLETION_FRACTION[crop] * total
+    kc = KC[crop]
+    depletion = (1 - moisture / 100) * total
+    initial_depletion = depletion.copy()
+    dry_days = np.broadcast_to(np.asarray(days_since_rain, dtype=np.float64), n).copy()
+
+    irrigation = np.zeros((n, days), dtype=np.float32)
+    et = np.empty((n, days), dtype=np.float32)
+    for day in range(days):
+        due = depletion > readily
+        irrigation[:, day] = np.where(due, depletion, 0.0)
+        depletion[due] = 0.0
+        # Refilled fields never pass the readily available water, so ET runs unstressed
+        crop_et = (kc + SURFACE_EVAPORATION * np.exp(-dry_days / SURFACE_DRYING_DAYS)) * et0[:, day]
+        et[:, day] = crop_et
+        np.clip(depletion + crop_et - rain[:, day], 0.0, total, out=depletion)
+        wetted = rain[:, day] >= WETTING_RAIN_MM
+        dry_days += 1
+        dry_days[wetted] = 0
+
+    irrigated = irrigation > 0
+    any_irrigation = irrigated.any(axis=1)
+    first = np.where(any_irrigation, irrigated.argmax(axis=1), -1)
+    return {
+        'crop': crop,
+        'soil': soil,
+        'total_available_mm': total,
+        'readily_available_mm': readily,
+        'depletion_mm': initial_depletion,
+        'depletion_percent': 100 * initial_depletion / np.maximum(total, 1e-9),
+        'first_irrigation_day': first,
+        'first_irrigation_mm': np.where(any_irrigation, irrigation[np.arange(n), np.maximum(first, 0)], 0.0).astype(np.float64),
+        'total_irrigation_mm': irrigation.sum(axis=1, dtype=np.float64),
+        'events': irrigated.sum(axis=1),
+        'et0_mm': et0,
+        'et_mm': et,
+        'irrigation_mm': irrigation,
+    }
+
+
+def simulate_frame(frame, days=HORIZON_DAYS, latitude=DEFAULT_LATITUDE, start=None):
+    """simulate() over a DataFrame with FIELD_COLUMNS; absent or blank optional values take FIELD_DEFAULTS.
+
+    A latitude column, or else a location column of place names, sets each
+    field's latitude for the radiation term.
+    """
+    missing = [c for c in ('crop_type', 'soil_moisture') if c not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    def column(name):
+        if name not in frame.columns:
+            return np.full(len(frame), FIELD_DEFAULTS[name])
+        if name in FIELD_DEFAULTS:
+            return frame[name].fillna(FIELD_DEFAULTS[name]).to_numpy()
+        return frame[name].to_numpy()
+
+    numeric = {}
+    for name in ('soil_moisture', 'days_since_rain', 'temperature', 'humidity'):
+        try:
+            numeric[name] = column(name).astype(np.float64)
+        except ValueError:
+            raise ValueError(f"Column {name} must be numeric") from None
+        if np.isnan(numeric[name]).any():
+            raise ValueError(f"Column {name} has missing values")
+    if 'latitude' in frame.columns:
+        latitude = frame['latitude'].fillna(latitude).to_numpy(dtype=np.float64)
+    elif 'location' in frame.columns:
+        latitude = location_latitudes(frame['location'], latitude)
+    return simulate(column('crop_type'), column('soil_type'), numeric['soil_moisture'], numeric['days_since_rain'],
+                    numeric['temperature'], numeric['humidity'], days=days, latitude=latitude, start=start)
+
+
+def location_latitudes(locations, default=DEFAULT_LATITUDE):
+    """Latitude per field from place names via the gazetteer, resolving each distinct name once."""
+    from gazetteer import get_gazetteer
+    gazetteer = get_gazetteer()
+    names, inverse = np.unique(locations.fillna('').astype(str).to_numpy(), return_inverse=True)
+    latitudes = np.full(len(names), default, dtype=np.float64)
+    unknown = []
+    for i, name in enumerate(names.tolist()):
+        if not name.strip():
+            continue
+        place = gazetteer.resolve(name)
+        if place is None:
+            unknown.append(name)
+        else:
+            latitudes[i] = place.latitude
+    if unknown:
+        raise ValueError(f"Unknown locations {unknown[:5]}")
+    return latitudes[inverse.ravel()]
+
+
+# --- Schedule ---
+def schedule(result, field_ids=None, limit=None):
+    """Fields ranked by urgency: earliest irrigation first, then the most depleted.
+
+    Fields that need no water within the horizon come last, driest first.
+    """
+    import pandas as pd
+    n = len(result['crop'])
+    days = result['irrigation_mm'].shape[1]
+    first = result['first_irrigation_day']
+    order = np.lexsort((-result['depletion_percent'], np.where(first < 0, days, first)))
+    if limit is not None:
+        order = order[:limit]
+    ids = np.arange(n) if field_ids is None else np.asarray(field_ids)
+    return pd.DataFrame({
+        'rank': np.arange(1, len(order) + 1),
+        'field_id': ids[order],
+        'crop_type': pd.Categorical.from_codes(result['crop'][order], CROP_TYPES),
+        'soil_type': pd.Categorical.from_codes(result['soil'][order], SOIL_TYPES),
+        'first_irrigation_day': first[order],
+        'first_irrigation_mm': result['first_irrigation_mm'][order].round(1),
+        'irrigation_events': result['events'][order],
+        'total_irrigation_mm': result['total_irrigation_mm'][order].round(1),
+        'depletion_percent': result['depletion_percent'][order].round(1),
+        'mean_et_mm_per_day': result['et_mm'][order].mean(axis=1, dtype=np.float64).round(2),
+    })
+
+
+# --- Single-field Advice ---
+def recommend_irrigation(soil_moisture, crop_type, soil_type=DEFAULT_SOIL, temperature=28.0, humidity=65.0,
+                         days_since_rain=3, days=HORIZON_DAYS, latitude=DEFAULT_LATITUDE):
+    """Status, display colour and follow-up actions for one field, read off the engine's simulation."""
+    result = simulate([crop_type], [soil_type], soil_moisture, days_since_rain, temperature, humidity, days=days,
+                      latitude=latitude)
+    first = int(result['first_irrigation_day'][0])
+    amount = float(result['first_irrigation_mm'][0])
+    et = float(result['et_mm'][0].mean(dtype=np.float64))
+    if first == 0:
+        status = "Critical! Immediate irrigation required."
+        color = "red"
+        actions = [
+            f"Apply about {amount:.0f} mm of water today to refill the {crop_type} root zone to field capacity",
+            "Consider applying irrigation during early morning or late evening to minimize evaporation",
+        ]
+    elif first == 1:
+        status = "Low! Schedule irrigation within 24 hours."
+        color = "orange"
+        actions = [
+            f"Schedule about {amount:.0f} mm of irrigation within the next 24 hours for {crop_type}",
+            "Monitor weather forecast for potential rainfall",
+        ]
+    else:
+        if 0 < first <= WATCH_DAYS:
+            status = "Moderate. Monitor conditions."
+            color = "blue"
+        else:
+            status = "Good. No irrigation needed at this time."
+            color = "green"
+        next_step = (f"Next irrigation expected in {first} days (about {amount:.0f} mm)" if first > 0
+                     else f"No irrigation expected in the next {days} days")
+        actions = ["Continue monitoring soil moisture levels", next_step]
+    actions.append(f"Estimated crop water use: {et:.1f} mm/day")
+    return {
+        'status': status,
+        'color': color,
+        'actions': actions,
+        'first_irrigation_day': first,
+        'irrigation_mm': round(amount, 1),
+        'depletion_percent': round(float(result['depletion_percent'][0]), 1),
+        'et_mm_per_day': round(et, 2),
+    }
@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+
+# --- Artifact Configuration ---
+# Compiled from labels.py, remedies.py and the forest label tables by
+# `python knowledge_base.py build`; rebuilt in memory whenever it is stale.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+KNOWLEDGE_BASE_PATH = os.environ.get('AGRIZEN_KNOWLEDGE_BASE', os.path.join(BASE_DIR, 'knowledge_base.json'))
+SOURCE_FILES = ['labels.py', 'remedies.py', 'batch_scoring.py']
+FORMAT_VERSION = 1
+
+IMAGE_MODELS = ['pest_model', 'disease_model']
+MODELS = IMAGE_MODELS + ['crop_model', 'fertilizer_model']
+
+
+# --- Label Normalisation ---
+def normalize_key(label):
+    """Canonical key for a class label, whatever separators or casing it was written with.
+
+    'Potato__Early_blight', 'Potato_Early_blight' and 'potato early-blight'
+    all map to 'potato_early_blight'; a repeated crop prefix
+    ('Tomato_Tomato_mosaic_virus') is dropped.
+    """
+    tokens = re.findall(r'[a-z0-9]+', str(label).lower())
+    if len(tokens) > 1 and tokens[0] == tokens[1]:
+        tokens = tokens[1:]
+    return '_'.join(tokens)
+
+
+def is_healthy(key):
+    return key.endswith('healthy')
+
+
+def affected_crops(remedy):
+    """Crops listed under a pest remedy's 'Crop Recommendations:' heading."""
+    lines = remedy.strip().splitlines()
+    for i, line in enumerate(lines):
+        if line.strip().lower().startswith('crop recommendations') and i + 1 < len(lines):
+            return [crop.strip().rstrip('.') for crop in lines[i + 1].lstrip('- ').split(',') if crop.strip()]
+    return []
+
+
+def source_fingerprint(base_dir=BASE_DIR):
+    fingerprint = []
+    for name in SOURCE_FILES:
+        stat = os.stat(os.path.join(base_dir, name))
+        fingerprint.append([name, stat.st_size, stat.st_mtime_ns])
+    return fingerprint
+
+
+# --- Build ---
+def model_labels():
+    """Display labels per model, indexed by model output / class code."""
+    import labels
+    import batch_scoring
+    tables = {'pest_model': list(labels.pest_class_names), 'disease_model': list(labels.disease_class_labels)}
+    for kind in ('crop', 'fertilizer'):
+        schema = batch_scoring.SCHEMAS[kind]
+        codes = sorted(schema['labels'])
+        if codes != list(range(len(codes))):
+            raise ValueError(f"{kind} class codes are not 0..{len(codes) - 1}")
+        tables[schema['model']] = [schema['labels'][code] for code in codes]
+    return tables
+
+
+def build(languages=(), translation_service=None, translate=False):
+    """Knowledge base dict plus the validation problems found while compiling it."""
+    from remedies import disease_remedies, pest_remedies
+    sources = {'pest_model': pest_remedies, 'disease_model': disease_remedies}
+    problems = {'duplicate_keys': [], 'missing_remedies': [], 'orphan_remedies': [], 'missing_translations': []}
+    models = {}
+    for model, class_labels in model_labels().items():
+        keys = [normalize_key(label) for label in class_labels]
+        seen = {}
+        for index, key in enumerate(keys):
+            if key in seen:
+                problems['duplicate_keys'].append(f"{model}: {class_labels[seen[key]]!r} / {class_labels[index]!r}")
+            seen.setdefault(key, index)
+        entry = {'labels': class_labels, 'keys': keys}
+        if model in sources:
+            by_key = {normalize_key(label): text.strip() for label, text in sources[model].items()}
+            for label in sources[model]:
+                if normalize_key(label) not in seen:
+                    problems['orphan_remedies'].append(f"{model}: {label!r}")
+            remedies = [by_key.get(key) for key in keys]
+            for label, key, text in zip(class_labels, keys, remedies):
+                if text is None and not is_healthy(key):
+                    problems['missing_remedies'].append(f"{model}: {label!r}")
+            entry['healthy'] = [is_healthy(key) for key in keys]
+            entry['remedies'] = {'en': remedies}
+            if model == 'pest_model':
+                entry['crops'] = [affected_crops(text) if text else [] for text in remedies]
+            else:
+                entry['crops'] = [key.split('_', 1)[0] for key in keys]
+            models[model] = entry
+        else:
+            models[model] = entry
+
+    for language in languages:
+        if language == 'en' or translation_service is None:
+            continue
+        for model in IMAGE_MODELS:
+            english = models[model]['remedies']['en']
+            texts = [text for text in english if text]
+            lookup = translation_service.translate_many if translate else translation_service.cached_many
+            translated = dict(zip(texts, lookup(texts, language)))
+            models[model]['remedies'][language] = [translated.get(text) if text else None for text in english]
+            missing = sum(1 for text in texts if translated.get(text) is None)
+            if missing:
+                problems['missing_translations'].append(f"{model}/{language}: {missing} of {len(texts)}")
+    return {'version': FORMAT_VERSION, 'source': source_fingerprint(), 'models': models}, problems
+
+
+def save(knowledge, path=KNOWLEDGE_BASE_PATH):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(knowledge, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+# --- Runtime Lookup ---
+class KnowledgeBase:
+    """Labels and remedies as lists indexed by model output, so lookups never match strings."""
+
+    def __init__(self, knowledge):
+        self.models = knowledge['models']
+        self.source = knowledge['source']
+        self._key_index = {model: {key: i for i, key in enumerate(entry['keys'])}
+                           for model, entry in self.models.items()}
+
+    def labels(self, model):
+        return self.models[model]['labels']
+
+    def label(self, model, index, unknown="Unknown"):
+        labels = self.models[model]['labels']
+        return labels[index] if 0 <= index < len(labels) else unknown
+
+    def languages(self, model='disease_model'):
+        return list(self.models[model].get('remedies', {}))
+
+    def remedy(self, model, index, language='en'):
+        """Remedy text for a model output index, English when no translation is compiled in."""
+        remedies = self.models[model].get('remedies')
+        if remedies is None or not 0 <= index < len(remedies['en']):
+            return None
+        text = remedies.get(language, remedies['en'])[index]
+        return text if text is not None else remedies['en'][index]
+
+    def healthy(self, model, index):
+        return self.models[model]['healthy'][index]
+
+    def crops(self, model, index):
+        return self.models[model]['crops'][index]
+
+    def index_of(self, model, label):
+        """Output index for a label written any way normalize_key accepts; None if unknown."""
+        return self._key_index[model].get(normalize_key(label))
+
+
+def load(path=KNOWLEDGE_BASE_PATH):
+    """The compiled artifact, or a fresh in-memory build if it is missing or stale."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            knowledge = json.load(f)
+        if knowledge.get('version') == FORMAT_VERSION and knowledge.get('source') == source_fingerprint():
+            return KnowledgeBase(knowledge)
+    except (OSError, ValueError):
+        pass
+    return KnowledgeBase(build()[0])
+
+
+_knowledge_base = None
+_knowledge_base_lock = threading.Lock()
+
+
+def get_knowledge_base():
+    global _knowledge_base
+    if _knowledge_base is None:
+        with _knowledge_base_lock:
+            if _knowledge_base is None:
+                _knowledge_base = load()
+    return _knowledge_base
+
+
+# --- Command Line ---
+def main(argv=None):
+    from translation import REMEDY_LANGUAGES, BACKENDS, TranslationService
+    parser = argparse.ArgumentParser(description="Compile and validate the label / remedy knowledge base.")
+    parser.add_argument('command', choices=['build', 'check'])
+    parser.add_argument('-o', '--output', default=KNOWLEDGE_BASE_PATH)
+    parser.add_argument('--languages', nargs='*', default=REMEDY_LANGUAGES)
+    parser.add_argument('--translate-with', choices=sorted(BACKENDS),
+                        help="fetch missing translations; by default only the translation cache is used")
+    parser.add_argument('--cached-from', default='google-cloud',
+                        choices=sorted(name for name, backend in BACKENDS.items() if backend.persistent),
+                        help="backend whose cached translations are used without --translate-with")
+    parser.add_argument('--allow-missing', action='store_true',
+                        help="write the artifact even if some diseased/pest classes have no remedy")
+    args = parser.parse_args(argv)
+
+    # Cache-only lookups never create the backend client
+    service = TranslationService(args.translate_with or args.cached_from)
+    knowledge, problems = build(args.languages, service, translate=args.translate_with is not None)
+    for name, items in problems.items():
+        for item in items:
+            print(f"{name.replace('_', ' ')}: {item}", file=sys.stderr)
+    failed = problems['duplicate_keys'] or problems['orphan_remedies'] or (
+        problems['missing_remedies'] and not args.allow_missing)
+    counts = {model: len(entry['labels']) for model, entry in knowledge['models'].items()}
+    print(f"{'Invalid' if failed else 'Valid'}: {counts}, {len(problems['missing_remedies'])} classes "
+          f"without remedies, {len(problems['orphan_remedies'])} remedies matching no class")
+    if failed:
+        return 1
+    if args.command == 'build':
+        save(knowledge, args.output)
+        print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import importlib
+import sys
+import threading
+import time
+
+# --- Lazy Module Proxies ---
+# Heavy ML, database and translation libraries are imported on first
+# attribute access, so pages that never touch them never pay for the import.
+_proxies = {}
+_proxies_lock = threading.Lock()
+_import_seconds = {}
+
+
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    _import_seconds[self._name] = time.perf_counter() - start
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """Return a shared proxy that imports `name` on first use."""
+    proxy = _proxies.get(name)
+    if proxy is None:
+        with _proxies_lock:
+            proxy = _proxies.setdefault(name, LazyModule(name))
+    return proxy
+
+
+def is_loaded(name):
+    return name in sys.modules
+
+
+def import_times():
+    return dict(_import_seconds)
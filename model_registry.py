@@ -0,0 +1,299 @@
+import json
+import logging
+import os
+import threading
+import time
+
+import tracing
+from lazy_imports import lazy_import
+
+tf = lazy_import('tensorflow')
+
+# --- Model Artifacts ---
+# Paths are resolved next to this file so every app entry point shares the
+# same artifacts regardless of the working directory streamlit was started in.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MODEL_PATHS = {
+    'pest_model': 'pest_model.h5',
+    'disease_model': 'model.h5',
+    'crop_model': 'mdl_crv1.pkl',
+    'fertilizer_model': 'mdl_fr_v5.pkl',
+}
+
+# Comma separated model names to warm up at start, "all" (default) or "none"
+PRELOAD_ENV = 'AGRIZEN_PRELOAD_MODELS'
+# "keras" (default) or "tflite": serve the image models from the variant
+# tflite_export.py deployed, falling back to Keras until one has passed
+IMAGE_BACKEND = os.environ.get('AGRIZEN_IMAGE_BACKEND', 'keras')
+# Unix socket of a running model_server.py; models are then used remotely
+# instead of loaded into every UI process
+MODEL_SERVER = os.environ.get('AGRIZEN_MODEL_SERVER')
+
+logger = logging.getLogger(__name__)
+
+
+# --- Loaders ---
+def load_keras_model(path):
+    return tf.keras.models.load_model(path)
+
+
+def load_forest_model(path):
+    # Packed-array evaluator; independent of the scikit-learn version at runtime
+    from forest_compiler import load_compiled
+    return load_compiled(path)
+
+
+def load_tflite_model(path):
+    from tflite_export import TFLiteModel
+    return TFLiteModel(path)
+
+
+def remote_loader(socket_path, name):
+    def load(path):
+        import model_server
+        return model_server.connect(name, socket_path)
+    return load
+
+
+def default_loader(path):
+    if path.endswith('.h5'):
+        return load_keras_model
+    if path.endswith('.tflite'):
+        return load_tflite_model
+    return load_forest_model
+
+
+def file_identity(path):
+    """Size and mtime of an artifact, enough to tell a replaced file from the one loaded."""
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def exported_from(deployed, source):
+    """True if tflite_export.py's report says deployed was exported from source as it is now."""
+    if not os.path.exists(source):
+        return True  # Shipped without its Keras source; nothing to compare against
+    try:
+        with open(deployed + '.json') as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return report.get('source_fingerprint') == file_identity(source)
+
+
+def resolve_artifact(path, image_backend=IMAGE_BACKEND):
+    if image_backend == 'tflite' and path.endswith('.h5'):
+        deployed = os.path.splitext(path)[0] + '.tflite'
+        if os.path.exists(deployed):
+            if exported_from(deployed, path):
+                return deployed
+            logger.warning("%s was not exported from the current %s; serving Keras until tflite_export.py "
+                           "is re-run", deployed, os.path.basename(path))
+    return path
+
+
+# --- Readiness State Machine ---
+# absent -> loading -> ready, or loading -> failed -> (backoff) -> loading.
+# Only the caller that moves an entry into "loading" runs the loader; every
+# other session waits on, or polls, the same entry.
+ABSENT, LOADING, READY, FAILED = 'absent', 'loading', 'ready', 'failed'
+# First retry delay after a failed load; doubles per consecutive failure
+RETRY_BASE_SECONDS = float(os.environ.get('AGRIZEN_MODEL_RETRY_SECONDS', '5'))
+RETRY_MAX_SECONDS = float(os.environ.get('AGRIZEN_MODEL_RETRY_MAX_SECONDS', '300'))
+
+
+class ModelLoadError(RuntimeError):
+    """The last load failed and the retry backoff has not expired yet."""
+
+    def __init__(self, name, error, retry_in):
+        super().__init__(f"{error} (retrying {name} in {retry_in:.1f}s)")
+        self.retry_in = retry_in
+
+
+class ModelEntry:
+    def __init__(self, name, path, loader):
+        self.name = name
+        self.path = path
+        self.loader = loader
+        self.model = None
+        self.identity = None
+        self.state = ABSENT
+        self.error = None
+        self.load_seconds = None
+        self.failures = 0
+        self.retry_at = 0.0
+        self.loading_since = None
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+
+    @property
+    def loading(self):
+        return self.state == LOADING
+
+    def retry_in(self):
+        return max(0.0, self.retry_at - time.monotonic())
+
+    def claim(self):
+        """Move to loading if nobody is loading and no backoff is pending; True for the one caller that did."""
+        with self.lock:
+            if self.state == ABSENT or (self.state == FAILED and self.retry_in() == 0.0):
+                self.state = LOADING
+                self.loading_since = time.monotonic()
+                return True
+            return False
+
+    def load(self):
+        """Run the loader; only called by the thread whose claim() succeeded."""
+        start = time.perf_counter()
+        try:
+            # Taken first, so a file replaced mid-load is not credited to this model
+            identity = file_identity(self.path)
+            model = self.loader(self.path)
+        except BaseException as e:
+            with self.lock:
+                self.failures += 1
+                self.error = str(e) or type(e).__name__
+                self.retry_at = time.monotonic() + min(RETRY_MAX_SECONDS,
+                                                       RETRY_BASE_SECONDS * 2 ** (self.failures - 1))
+                self.state = FAILED
+                self.changed.notify_all()
+            raise
+        with self.lock:
+            self.load_seconds = time.perf_counter() - start
+            self.model = model
+            self.identity = identity
+            self.error = None
+            self.failures = 0
+            self.state = READY
+            self.changed.notify_all()
+        tracing.record('model_load', self.load_seconds)
+
+    def load_quietly(self):
+        try:
+            self.load()
+        except Exception:
+            # Recorded on the entry; surfaced through status() and the next get()
+            pass
+
+
+# --- Registry ---
+class ModelRegistry:
+    """Loads each model once per process and shares it across sessions."""
+
+    def __init__(self, paths=None, base_dir=BASE_DIR, image_backend=IMAGE_BACKEND, model_server=MODEL_SERVER):
+        paths = MODEL_PATHS if paths is None else paths
+        self._entries = {}
+        for name, filename in paths.items():
+            path = resolve_artifact(os.path.join(base_dir, filename), image_backend)
+            loader = remote_loader(model_server, name) if model_server else default_loader(path)
+            self._entries[name] = ModelEntry(name, path, loader)
+        self._warm_thread = None
+        self._warm_lock = threading.Lock()
+
+    def names(self):
+        return list(self._entries)
+
+    def path(self, name):
+        return self._entries[name].path
+
+    def identity(self, name):
+        """Fingerprint of the artifact behind this process's model.
+
+        Loaded models are never reloaded, so once loaded this is the file as
+        it was read then; before that, the file the next load would read.
+        """
+        entry = self._entries[name]
+        return entry.identity or file_identity(entry.path)
+
+    def available(self, name):
+        return os.path.exists(self._entries[name].path)
+
+    def is_ready(self, name):
+        return self._entries[name].model is not None
+
+    def state(self, name):
+        return self._entries[name].state
+
+    def request(self, name):
+        """Start the shared load in the background if it is due; never blocks. Returns the state."""
+        entry = self._entries[name]
+        if entry.model is None and self.available(name) and entry.claim():
+            threading.Thread(target=entry.load_quietly, name=f"load-{name}", daemon=True).start()
+        return entry.state
+
+    def wait(self, name, timeout=None):
+        """Wait until the entry leaves "loading" (or timeout); returns the state. Never loads itself."""
+        entry = self._entries[name]
+        with entry.changed:
+            entry.changed.wait_for(lambda: entry.state != LOADING, timeout)
+            return entry.state
+
+    def get(self, name, timeout=None):
+        entry = self._entries[name]
+        if entry.model is not None:
+            return entry.model
+        if not os.path.exists(entry.path):
+            raise FileNotFoundError(f"Model file not found: {entry.path}")
+        if entry.claim():
+            # This caller won the transition, so it runs the one loader and
+            # sees its exception; everyone else waits for the outcome
+            entry.load()
+        state = self.wait(name, timeout)
+        if state == READY:
+            return entry.model
+        if state == LOADING:
+            raise TimeoutError(f"{name} is still loading after {timeout}s")
+        raise ModelLoadError(name, entry.error, entry.retry_in())
+
+    def warm_up(self, names=None, background=True):
+        names = self.names() if names is None else list(names)
+        if not background:
+            self._load_quietly(names)
+            return None
+        with self._warm_lock:
+            if self._warm_thread is None:
+                self._warm_thread = threading.Thread(
+                    target=self._load_quietly, args=(names,),
+                    name="model-warm-up", daemon=True)
+                self._warm_thread.start()
+        return self._warm_thread
+
+    def preload_from_env(self):
+        value = os.environ.get(PRELOAD_ENV, 'all').strip().lower()
+        if value in ('', '0', 'none', 'false'):
+            return None
+        if value == 'all':
+            return self.warm_up()
+        return self.warm_up([n.strip() for n in value.split(',') if n.strip() in self._entries])
+
+    def _load_quietly(self, names):
+        for name in names:
+            if not self.available(name):
+                continue
+            try:
+                self.get(name)
+            except Exception:
+                # The error is recorded on the entry and surfaced via status()
+                pass
+
+    def status(self):
+        report = {}
+        for name, entry in self._entries.items():
+            report[name] = {
+                'path': entry.path,
+                'available': os.path.exists(entry.path),
+                'state': entry.state,
+                'ready': entry.model is not None,
+                'loading': entry.loading,
+                'load_seconds': entry.load_seconds,
+                'loading_seconds': time.monotonic() - entry.loading_since if entry.loading else None,
+                'error': entry.error,
+                'failures': entry.failures,
+                'retry_in': entry.retry_in() if entry.state == FAILED else None,
+            }
+        return report
+
+
+# Imported modules survive streamlit reruns, so this instance is process-wide
+registry = ModelRegistry()
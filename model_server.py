@@ -0,0 +1,409 @@
+import argparse
+import atexit
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# --- Server Configuration ---
+# UI processes set AGRIZEN_MODEL_SERVER to this socket to use the shared server.
+# It lives in a directory only this user can enter, so other local users can
+# neither connect nor plant a look-alike socket before the server starts.
+SOCKET_DIR = os.environ.get('XDG_RUNTIME_DIR') or os.path.join(tempfile.gettempdir(), f'agrizen-{os.getuid()}')
+DEFAULT_SOCKET = os.path.join(SOCKET_DIR, 'agrizen-models.sock')
+MODEL_SERVER_TIMEOUT = float(os.environ.get('AGRIZEN_MODEL_SERVER_TIMEOUT', '60'))
+# A model's first request waits for the server to load it; a cold Keras load takes minutes
+MODEL_SERVER_LOAD_TIMEOUT = float(os.environ.get('AGRIZEN_MODEL_SERVER_LOAD_TIMEOUT', '900'))
+# Smallest shared-memory arena a client thread gets; grows in powers of two
+MIN_ARENA_BYTES = 1 << 20
+MAX_ARENA_BYTES = 1 << 30
+
+_FRAME = struct.Struct('!II')
+
+
+class RemoteModelError(RuntimeError):
+    pass
+
+
+# --- Framing ---
+# Each message is a JSON header plus an optional raw payload. Image tensors
+# never travel through the socket: the header names a shared-memory segment.
+def send_message(sock, header, payload=b''):
+    data = json.dumps(header).encode('utf-8')
+    sock.sendall(_FRAME.pack(len(data), len(payload)) + data)
+    if len(payload):
+        sock.sendall(payload)
+
+
+def _recv_exact(sock, size):
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise ConnectionError("model server connection closed")
+        received += n
+    return buffer
+
+
+def recv_message(sock):
+    header_size, payload_size = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+    header = json.loads(_recv_exact(sock, header_size))
+    return header, _recv_exact(sock, payload_size) if payload_size else b''
+
+
+def private_socket_dir(socket_path, create=False):
+    """Check (or create) the socket's directory: owned by this user, closed to everyone else."""
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    if create:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{directory} must be a directory owned by this user with mode 0700")
+    return directory
+
+
+def attach_segment(name):
+    segment = shared_memory.SharedMemory(name=name)
+    # The server owns the segment; without this the client's resource
+    # tracker would unlink it when the client exits
+    resource_tracker.unregister(segment._name, 'shared_memory')
+    return segment
+
+
+def release_segments(segments):
+    for segment in segments.values():
+        try:
+            segment.close()
+        except BufferError:
+            pass
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+    segments.clear()
+
+
+def encode_array(array):
+    # Only small payloads go inline: forest rows and model outputs
+    return {'dtype': array.dtype.str, 'shape': list(array.shape)}, array.tobytes()
+
+
+def decode_array(header, payload):
+    return np.frombuffer(payload, dtype=np.dtype(header['dtype'])).reshape(header['shape'])
+
+
+# --- Server ---
+class _ConnectionHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        # At most one arena per client thread, so one issued segment per connection
+        segments = {}
+        try:
+            while True:
+                try:
+                    header, payload = recv_message(self.request)
+                except (ConnectionError, OSError):
+                    return
+                try:
+                    response, out = self.server.dispatch(header, payload, segments)
+                except Exception as e:
+                    response, out = {'error': f"{type(e).__name__}: {e}"}, b''
+                send_message(self.request, response, out)
+        finally:
+            release_segments(segments)
+
+
+class ModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Loads every model once and serves inference to local UI processes.
+
+    Each client connection gets its own thread. Keras and TFLite release the
+    GIL while they run, so clients are served in parallel across cores.
+    Tensors are only read from shared memory this server created for the
+    connection asking, never from a segment a client names.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, registry):
+        private_socket_dir(socket_path, create=True)
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.registry = registry
+        self.socket_path = socket_path
+        self._started_at = time.perf_counter()
+        self._stats_lock = threading.Lock()
+        self._calls = {}
+        # Owner-only (0600) from the moment bind() creates it
+        umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _ConnectionHandler)
+        finally:
+            os.umask(umask)
+
+    def _record(self, name, op, seconds):
+        with self._stats_lock:
+            count, total = self._calls.get((name, op), (0, 0.0))
+            self._calls[(name, op)] = (count + 1, total + seconds)
+
+    def _issue_arena(self, segments, nbytes):
+        if not 0 < nbytes <= MAX_ARENA_BYTES:
+            raise ValueError(f"Arena size must be between 1 and {MAX_ARENA_BYTES} bytes")
+        # The connection's previous arena goes; the client maps the new one
+        release_segments(segments)
+        segment = shared_memory.SharedMemory(create=True, size=nbytes)
+        segments[segment.name] = segment
+        return segment.name
+
+    def _inputs(self, header, payload, segments):
+        if 'shm' not in header:
+            return decode_array(header, payload)
+        segment = segments.get(header['shm'])
+        if segment is None:
+            raise ValueError(f"Segment {header['shm']!r} was not issued to this connection")
+        # Zero-copy view of the tensor the client wrote into shared memory
+        return np.ndarray(header['shape'], dtype=np.dtype(header['dtype']), buffer=segment.buf)
+
+    def dispatch(self, header, payload, segments):
+        op = header['op']
+        if op == 'status':
+            return {'models': self.registry.status(), 'calls': self.stats()}, b''
+        if op == 'arena':
+            return {'shm': self._issue_arena(segments, int(header['bytes']))}, b''
+        name = header['model']
+        model = self.registry.get(name)
+        if op == 'describe':
+            return describe(model), b''
+        if op not in ('predict_on_batch', 'predict', 'predict_proba'):
+            raise ValueError(f"Unknown operation {op!r}")
+        inputs = self._inputs(header, payload, segments)
+        start = time.perf_counter()
+        outputs = np.asarray(getattr(model, op)(inputs))
+        self._record(name, op, time.perf_counter() - start)
+        return encode_array(outputs)
+
+    def stats(self):
+        with self._stats_lock:
+            return {f"{name}.{op}": {'count': count, 'mean_ms': 1000 * total / count}
+                    for (name, op), (count, total) in self._calls.items()}
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def describe(model):
+    meta = {'batched': hasattr(model, 'predict_on_batch')}
+    if hasattr(model, 'classes_'):
+        meta['classes'] = np.asarray(model.classes_).tolist()
+    if hasattr(model, 'feature_names_in_'):
+        meta['feature_names'] = [str(f) for f in model.feature_names_in_]
+    return meta
+
+
+# --- Client ---
+class ModelClient:
+    """Per-thread socket and shared-memory arena to one model server."""
+
+    def __init__(self, socket_path=DEFAULT_SOCKET, timeout=MODEL_SERVER_TIMEOUT,
+                 load_timeout=MODEL_SERVER_LOAD_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.load_timeout = load_timeout
+        self._local = threading.local()
+        self._arenas = []
+        self._arenas_lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _socket(self):
+        sock = getattr(self._local, 'socket', None)
+        if sock is None:
+            # Refuse a socket someone else could have put there
+            private_socket_dir(self.socket_path)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.socket = sock
+        return sock
+
+    def arena(self, nbytes):
+        segment = getattr(self._local, 'arena', None)
+        if segment is None or segment.size < nbytes:
+            size = MIN_ARENA_BYTES
+            while size < nbytes:
+                size *= 2
+            # The server creates (and unlinks) every segment it will read from
+            response, _ = self.call({'op': 'arena', 'bytes': size})
+            new = attach_segment(response['shm'])
+            with self._arenas_lock:
+                self._arenas.append(new)
+            self._drop_arena()
+            segment = self._local.arena = new
+        return segment
+
+    def _drop_arena(self):
+        segment = getattr(self._local, 'arena', None)
+        self._local.arena = None
+        if segment is None:
+            return
+        with self._arenas_lock:
+            self._arenas.remove(segment)
+        try:
+            segment.close()
+        except BufferError:
+            # A caller still holds a view; the mapping goes with it
+            pass
+
+    def call(self, header, payload=b'', timeout=None):
+        sock = self._socket()
+        try:
+            if timeout is not None:
+                sock.settimeout(timeout)
+            send_message(sock, header, payload)
+            response, out = recv_message(sock)
+            if timeout is not None:
+                sock.settimeout(self.timeout)
+        except OSError:
+            # Drop the broken connection and the arena issued to it; the next call reconnects
+            self._local.socket = None
+            sock.close()
+            self._drop_arena()
+            raise
+        if 'error' in response:
+            raise RemoteModelError(response['error'])
+        return response, out
+
+    def close(self):
+        with self._arenas_lock:
+            arenas, self._arenas = self._arenas, []
+        for segment in arenas:
+            try:
+                segment.close()
+            except BufferError:
+                pass
+
+
+class RemoteModel:
+    """Stand-in for a model that lives in the model server process."""
+
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+        # The server loads the model on its first describe, however long that takes
+        meta, _ = client.call({'op': 'describe', 'model': name}, timeout=client.load_timeout)
+        self.batched = meta['batched']
+        if 'classes' in meta:
+            self.classes_ = np.array(meta['classes'])
+        if 'feature_names' in meta:
+            self.feature_names_in_ = np.array(meta['feature_names'], dtype=object)
+            self.n_features_in_ = len(meta['feature_names'])
+
+    def input_buffer(self, shape, dtype=np.float32):
+        """Array in this thread's shared memory; filling it in place avoids any copy."""
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        return np.ndarray(shape, dtype=dtype, buffer=self.client.arena(nbytes).buf)
+
+    def predict_on_batch(self, x):
+        x = np.asarray(x)
+        segment = self.client.arena(x.nbytes)
+        buffer = np.ndarray(x.shape, dtype=x.dtype, buffer=segment.buf)
+        if not np.shares_memory(buffer, x):
+            buffer[...] = x
+        response, out = self.client.call({'op': 'predict_on_batch', 'model': self.name, 'shm': segment.name,
+                                          'shape': list(x.shape), 'dtype': x.dtype.str})
+        return decode_array(response, out)
+
+    def _rows(self, X):
+        if hasattr(X, 'columns'):
+            X = X[list(self.feature_names_in_)].to_numpy()
+        X = np.asarray(X, dtype=np.float64)
+        return X[None, :] if X.ndim == 1 else X
+
+    def _call_rows(self, op, X):
+        header, payload = encode_array(self._rows(X))
+        header.update({'op': op, 'model': self.name})
+        response, out = self.client.call(header, payload)
+        return decode_array(response, out)
+
+    def predict(self, X, **kwargs):
+        if self.batched:
+            return self.predict_on_batch(X)
+        return self._call_rows('predict', X)
+
+    def predict_proba(self, X):
+        return self._call_rows('predict_proba', X)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(socket_path=DEFAULT_SOCKET):
+    client = _clients.get(socket_path)
+    if client is None:
+        with _clients_lock:
+            client = _clients.setdefault(socket_path, ModelClient(socket_path))
+    return client
+
+
+def connect(name, socket_path=DEFAULT_SOCKET):
+    return RemoteModel(get_client(socket_path), name)
+
+
+def wait_until_ready(socket_path=DEFAULT_SOCKET, timeout=MODEL_SERVER_TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            private_socket_dir(socket_path)
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout)
+                sock.connect(socket_path)
+                send_message(sock, {'op': 'status'})
+                return recv_message(sock)[0]
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def main(argv=None):
+    from model_registry import ModelRegistry
+    parser = argparse.ArgumentParser(description="Serve the shared models to local UI processes over a Unix socket.")
+    parser.add_argument('--socket', default=os.environ.get('AGRIZEN_MODEL_SERVER') or DEFAULT_SOCKET)
+    parser.add_argument('--preload', default='all', help='"all", "none" or comma separated model names')
+    args = parser.parse_args(argv)
+
+    # The server always loads locally, whatever AGRIZEN_MODEL_SERVER says
+    registry = ModelRegistry(model_server=None)
+    if args.preload == 'all':
+        registry.warm_up(background=False)
+    elif args.preload != 'none':
+        registry.warm_up(args.preload.split(','), background=False)
+    server = ModelServer(args.socket, registry)
+    # Let supervisors stop the server with SIGTERM and still remove the socket
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    ready = [name for name, info in registry.status().items() if info['ready']]
+    print(f"Model server on {args.socket} ({', '.join(ready) or 'no models preloaded'})", flush=True)
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from model_registry import registry
+from predictions import apply_temperature, calibration, top_k, TOP_K
+
+# --- Cache Configuration ---
+CACHE_TOP_K = int(os.environ.get('AGRIZEN_CACHE_TOP_K', str(TOP_K)))
+CACHE_MAX_ENTRIES = int(os.environ.get('AGRIZEN_CACHE_MAX_ENTRIES', '1024'))
+CACHE_TTL_SECONDS = float(os.environ.get('AGRIZEN_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+# Setting a path enables the on-disk SQLite tier
+CACHE_DB_PATH = os.environ.get('AGRIZEN_CACHE_DB')
+CACHE_DB_MAX_ENTRIES = int(os.environ.get('AGRIZEN_CACHE_DB_MAX_ENTRIES', '100000'))
+
+
+def model_identity(name):
+    """Fingerprint of the served model and its calibration; changes when either does.
+
+    The artifact part comes from the registry, which records what it actually
+    loaded: a file replaced on disk changes nothing until a process loads it.
+    """
+    return f"{name}:{registry.identity(name)}:T{calibration.temperature(name):.6g}"
+
+
+# --- Tiers ---
+class MemoryTier:
+    def __init__(self, max_entries, ttl_seconds):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, now):
+        item = self._items.get(key)
+        if item is None or now - item[2] > self.ttl_seconds:
+            if item is not None:
+                del self._items[key]
+                self.evictions += 1
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[3]
+
+    def put(self, key, model, identity, value, now):
+        self._items[key] = (model, identity, now, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def purge_model(self, model, keep_identity):
+        stale = [k for k, item in self._items.items() if item[0] == model and item[1] != keep_identity]
+        for key in stale:
+            del self._items[key]
+        self.evictions += len(stale)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class SQLiteTier:
+    def __init__(self, path, max_entries, ttl_seconds):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            " key TEXT PRIMARY KEY, model TEXT NOT NULL, identity TEXT NOT NULL,"
+            " created_at REAL NOT NULL, accessed_at REAL NOT NULL, value TEXT NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS predictions_accessed ON predictions (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key, now):
+        row = self._conn.execute("SELECT created_at, value FROM predictions WHERE key = ?", (key,)).fetchone()
+        if row is None or now - row[0] > self.ttl_seconds:
+            if row is not None:
+                self._conn.execute("DELETE FROM predictions WHERE key = ?", (key,))
+                self._conn.commit()
+                self.evictions += 1
+            self.misses += 1
+            return None
+        self._conn.execute("UPDATE predictions SET accessed_at = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        self.hits += 1
+        return [tuple(pair) for pair in json.loads(row[1])]
+
+    def put(self, key, model, identity, value, now):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO predictions (key, model, identity, created_at, accessed_at, value)"
+            " VALUES (?, ?, ?, ?, ?, ?)", (key, model, identity, now, now, json.dumps(value)))
+        cursor = self._conn.execute(
+            "DELETE FROM predictions WHERE created_at < ? OR key IN ("
+            " SELECT key FROM predictions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (now - self.ttl_seconds, self.max_entries))
+        self.evictions += max(cursor.rowcount, 0)
+        self._conn.commit()
+
+    def purge_model(self, model, keep_identity):
+        cursor = self._conn.execute(
+            "DELETE FROM predictions WHERE model = ? AND identity != ?", (model, keep_identity))
+        self.evictions += max(cursor.rowcount, 0)
+        self._conn.commit()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+
+# --- Prediction Cache ---
+class PredictionCache:
+    """Top-k predictions keyed by upload content hash plus model identity."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl_seconds=CACHE_TTL_SECONDS,
+                 disk_path=CACHE_DB_PATH, disk_max_entries=CACHE_DB_MAX_ENTRIES, k=CACHE_TOP_K):
+        self.k = k
+        self.memory = MemoryTier(max_entries, ttl_seconds)
+        self.disk = SQLiteTier(disk_path, disk_max_entries, ttl_seconds) if disk_path else None
+        self._identities = {}
+        self._lock = threading.Lock()
+
+    def _key(self, image_bytes, model, variant=None):
+        identity = model_identity(model)
+        if self._identities.get(model) != identity:
+            # The model file changed: drop everything computed by the old one
+            self._identities[model] = identity
+            self.memory.purge_model(model, identity)
+            if self.disk is not None:
+                self.disk.purge_model(model, identity)
+        key = f"{identity}:{hashlib.sha256(image_bytes).hexdigest()}"
+        # Variants (e.g. a TTA budget) of the same upload are cached separately
+        return identity, f"{key}:{variant}" if variant else key
+
+    def get(self, image_bytes, model, variant=None):
+        now = time.time()
+        with self._lock:
+            identity, key = self._key(image_bytes, model, variant)
+            value = self.memory.get(key, now)
+            if value is None and self.disk is not None:
+                value = self.disk.get(key, now)
+                if value is not None:
+                    self.memory.put(key, model, identity, value, now)
+            return value
+
+    def put(self, image_bytes, model, probabilities, variant=None):
+        # Calibrated over the full vector, then trimmed to the top k
+        indices, values = top_k(apply_temperature(probabilities, calibration.temperature(model)), self.k)
+        value = list(zip(indices[0].tolist(), values[0].tolist()))
+        now = time.time()
+        with self._lock:
+            identity, key = self._key(image_bytes, model, variant)
+            self.memory.put(key, model, identity, value, now)
+            if self.disk is not None:
+                self.disk.put(key, model, identity, value, now)
+        return value
+
+    def get_or_compute(self, image_bytes, model, compute, variant=None):
+        value = self.get(image_bytes, model, variant)
+        if value is None:
+            value = self.put(image_bytes, model, compute(), variant)
+        return value
+
+    def stats(self):
+        with self._lock:
+            tiers = {'memory': self.memory}
+            if self.disk is not None:
+                tiers['disk'] = self.disk
+            return {
+                name: {'entries': len(tier), 'hits': tier.hits, 'misses': tier.misses,
+                       'evictions': tier.evictions}
+                for name, tier in tiers.items()
+            }
+
+
+prediction_cache = PredictionCache()
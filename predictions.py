@@ -0,0 +1,246 @@
+import argparse
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+
+# --- Result Configuration ---
+TOP_K = int(os.environ.get('AGRIZEN_TOP_K', '5'))
+# Temperatures fitted offline with `python predictions.py fit ...`
+CALIBRATION_PATH = os.environ.get(
+    'AGRIZEN_CALIBRATION_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'calibration.json'))
+# Top-1 and top-2 closer than this are flagged for a human to look at
+NEAR_TIE_MARGIN = float(os.environ.get('AGRIZEN_NEAR_TIE_MARGIN', '0.1'))
+_EPSILON = 1e-12
+
+
+# --- Vectorized Top-k ---
+def top_k(probabilities, k=TOP_K):
+    """Row-wise (indices, probabilities) of the k best classes, best first.
+
+    argpartition keeps this O(classes) per row; ties go to the lower class
+    index, as np.argmax and the forests' predict() break them.
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    if probabilities.ndim == 1:
+        probabilities = probabilities[None, :]
+    k = min(k, probabilities.shape[1])
+    indices = np.argpartition(-probabilities, k - 1, axis=1)[:, :k]
+    values = np.take_along_axis(probabilities, indices, axis=1)
+    order = np.lexsort((indices, -values), axis=1)
+    return np.take_along_axis(indices, order, axis=1), np.take_along_axis(values, order, axis=1)
+
+
+# --- Temperature Scaling ---
+def apply_temperature(probabilities, temperature):
+    """Rescale softmax / vote probabilities as if the logits were divided by T."""
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    if temperature == 1.0:
+        return probabilities
+    logits = np.log(np.clip(probabilities, _EPSILON, 1.0)) / temperature
+    logits -= logits.max(axis=-1, keepdims=True)
+    scaled = np.exp(logits)
+    return scaled / scaled.sum(axis=-1, keepdims=True)
+
+
+def negative_log_likelihood(probabilities, labels, temperature=1.0):
+    scaled = apply_temperature(probabilities, temperature)
+    picked = scaled[np.arange(len(labels)), labels]
+    return float(-np.mean(np.log(np.clip(picked, _EPSILON, 1.0))))
+
+
+def fit_temperature(probabilities, labels, low=0.05, high=20.0, iterations=60):
+    """Temperature minimising NLL on a labelled hold-out set (golden-section on log T)."""
+    labels = np.asarray(labels)
+    ratio = (np.sqrt(5) - 1) / 2
+    a, b = np.log(low), np.log(high)
+    c, d = b - ratio * (b - a), a + ratio * (b - a)
+    fc = negative_log_likelihood(probabilities, labels, np.exp(c))
+    fd = negative_log_likelihood(probabilities, labels, np.exp(d))
+    for _ in range(iterations):
+        if fc < fd:
+            b, d, fd = d, c, fc
+            c = b - ratio * (b - a)
+            fc = negative_log_likelihood(probabilities, labels, np.exp(c))
+        else:
+            a, c, fc = c, d, fd
+            d = a + ratio * (b - a)
+            fd = negative_log_likelihood(probabilities, labels, np.exp(d))
+    return float(np.exp((a + b) / 2))
+
+
+class Calibration:
+    """Per-model temperatures from a JSON file, re-read whenever it changes."""
+
+    def __init__(self, path=CALIBRATION_PATH):
+        self.path = path
+        self._mtime = None
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            with self._lock:
+                models = {}
+                if mtime is not None:
+                    with open(self.path, encoding='utf-8') as f:
+                        models = json.load(f)
+                self._models, self._mtime = models, mtime
+
+    def temperature(self, model):
+        self._refresh()
+        return float(self._models.get(model, {}).get('temperature', 1.0))
+
+    def save(self, model, temperature, **details):
+        self._refresh()
+        with self._lock:
+            models = dict(self._models)
+            models[model] = dict(details, temperature=temperature)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(models, f, indent=2)
+        self._refresh()
+
+
+calibration = Calibration()
+
+
+# --- Result Object ---
+class Prediction:
+    """Top-k classes for one input, best first, shared by all four models."""
+
+    __slots__ = ('model', 'indices', 'labels', 'probabilities', 'temperature')
+
+    def __init__(self, model, indices, labels, probabilities, temperature=1.0):
+        self.model = model
+        self.indices = indices
+        self.labels = labels
+        self.probabilities = probabilities
+        self.temperature = temperature
+
+    @property
+    def label(self):
+        return self.labels[0]
+
+    @property
+    def index(self):
+        return self.indices[0]
+
+    @property
+    def confidence(self):
+        return self.probabilities[0]
+
+    @property
+    def margin(self):
+        return self.probabilities[0] - (self.probabilities[1] if len(self.probabilities) > 1 else 0.0)
+
+    @property
+    def near_tie(self):
+        return len(self.probabilities) > 1 and self.margin < NEAR_TIE_MARGIN
+
+    def top(self):
+        return list(zip(self.labels, self.probabilities))
+
+    def as_dict(self):
+        return {
+            'model': self.model,
+            'label': self.label,
+            'index': self.index,
+            'confidence': self.confidence,
+            'near_tie': self.near_tie,
+            'temperature': self.temperature,
+            'top_predictions': [{'index': i, 'label': l, 'probability': p}
+                                for i, l, p in zip(self.indices, self.labels, self.probabilities)],
+        }
+
+
+def _labeler(class_labels, unknown):
+    if hasattr(class_labels, 'get'):
+        return lambda index: class_labels.get(index, unknown)
+    return lambda index: class_labels[index] if 0 <= index < len(class_labels) else unknown
+
+
+def from_probabilities(model, probabilities, class_labels, k=TOP_K, classes=None, unknown="Unknown",
+                       temperature=None):
+    """One Prediction per row of a single forward pass's probability matrix.
+
+    classes maps probability columns to class values (a forest's classes_);
+    class_labels maps those values, or column indices, to display labels.
+    """
+    if temperature is None:
+        temperature = calibration.temperature(model)
+    indices, values = top_k(apply_temperature(probabilities, temperature), k)
+    if classes is not None:
+        indices = np.asarray(classes)[indices]
+    label = _labeler(class_labels, unknown)
+    results = []
+    for row_indices, row_values in zip(indices.tolist(), values.tolist()):
+        results.append(Prediction(model, row_indices, [label(i) for i in row_indices], row_values, temperature))
+    return results
+
+
+def from_top_k(model, top_predictions, class_labels, unknown="Unknown"):
+    """Prediction from the cached (index, probability) pairs of prediction_cache."""
+    label = _labeler(class_labels, unknown)
+    indices = [int(i) for i, _ in top_predictions]
+    return Prediction(model, indices, [label(i) for i in indices], [float(p) for _, p in top_predictions],
+                      calibration.temperature(model))
+
+
+# --- Offline Fitting ---
+def holdout_probabilities(name, args):
+    """Uncalibrated probabilities and true class columns for a labelled hold-out set."""
+    from model_registry import registry
+    model = registry.get(name)
+    if name in ('crop_model', 'fertilizer_model'):
+        import pandas as pd
+        import batch_scoring
+        kind = 'crop' if name == 'crop_model' else 'fertilizer'
+        frame = pd.read_csv(args.data)
+        probabilities = model.predict_proba(batch_scoring.encode_features(frame, kind))
+        # The label column may hold class codes or display labels
+        by_label = {label: code for code, label in batch_scoring.SCHEMAS[kind]['labels'].items()}
+        codes = frame[args.label_column].map(lambda v: by_label.get(v, v)).astype(int)
+        column = {value: i for i, value in enumerate(np.asarray(model.classes_).tolist())}
+        return probabilities, np.array([column[c] for c in codes])
+    from tflite_export import MODEL_INPUTS, image_files, load_tensors, folder_labels, predict_in_batches
+    size, class_names = MODEL_INPUTS[name]
+    paths = image_files(args.data)
+    truth = folder_labels(paths, class_names)
+    if truth is None:
+        raise ValueError(f"{args.data} must be laid out as <class name>/<image> to fit a temperature")
+    return predict_in_batches(model, load_tensors(paths, size)), truth
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit per-model temperature scaling on a labelled hold-out set.")
+    parser.add_argument('command', choices=['fit', 'show'])
+    parser.add_argument('model', nargs='?')
+    parser.add_argument('data', nargs='?', help="labelled CSV for forests, <class>/<image> folder for image models")
+    parser.add_argument('--label-column', default='label')
+    parser.add_argument('--dry-run', action='store_true', help="report the fit without saving it")
+    args = parser.parse_args(argv)
+
+    if args.command == 'show':
+        calibration._refresh()
+        print(json.dumps(calibration._models, indent=2))
+        return 0
+    if not args.model or not args.data:
+        parser.error("fit needs a model name and a hold-out data path")
+    probabilities, labels = holdout_probabilities(args.model, args)
+    temperature = fit_temperature(probabilities, labels)
+    before = negative_log_likelihood(probabilities, labels)
+    after = negative_log_likelihood(probabilities, labels, temperature)
+    print(f"{args.model}: T={temperature:.3f}, NLL {before:.4f} -> {after:.4f} on {len(labels)} samples")
+    if not args.dry_run:
+        calibration.save(args.model, temperature, samples=int(len(labels)), nll_before=before, nll_after=after)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# --- Remedy Mappings for Diseases ---
+disease_remedies = {
+    "Apple_Apple_scab": """
+Apple Scab Remedies:
+
+Crop Management:
+- Remove infected leaves and fruits.
+- Prune trees to improve air circulation.
+- Apply fungicides during spring.
+- Use resistant cultivars.
+
+Organic Remedies:
+- Neem Oil spray.
+- Baking Soda spray.
+- Garlic and Onion extract.
+
+Inorganic Remedies:
+- Copper-based fungicides.
+- Chlorothalonil.
+""",
+    # ... other disease remedy mappings ...
+    "Tomato_Tomato_mosaic_virus": """
+Tomato Mosaic Virus Remedies:
+
+Crop Management:
+- Remove infected plants.
+- Use resistant varieties.
+- Sanitize tools.
+
+Organic Remedies:
+- Control aphids with neem oil or insecticidal soap.
+- Practice crop rotation.
+
+Inorganic Remedies:
+- Insecticides to control vectors.
+"""
+}
+
+# --- Remedy Mappings for Pests ---
+pest_remedies = {
+    "aphids": """
+Aphids Remedies:
+
+Crop Recommendations:
+- Cabbage, Tomato, Chili, Cucumber, Beans, Peas, Peppers.
+
+Organic Remedies:
+- Neem Oil: Repels and disrupts aphid feeding.
+- Garlic and Pepper Spray: Homemade mix to deter aphids.
+- Introduce Natural Predators: Ladybugs, lacewing larvae, parasitic wasps.
+
+Inorganic Remedies:
+- Insecticidal Soap.
+- Imidacloprid.
+""",
+    # ... other pest remedy mappings ...
+    "stem_borer": """
+Stem Borer Remedies:
+
+Crop Recommendations:
+- Rice, Sugarcane, Corn, Maize.
+
+Organic Remedies:
+- Neem Oil: Inhibits larvae development.
+- Trichogramma Wasps.
+- Bt-based Sprays.
+
+Inorganic Remedies:
+- Chlorpyrifos.
+- Endosulfan.
+"""
+}
@@ -0,0 +1,7 @@
+import views
+
+# --- Unified Multipage App ---
+# One entry point for every feature; run with `streamlit run streamlit_app.py`.
+# Each page lives in views/ and is imported on its first visit, so a rerun
+# executes views.run() plus the visible page's render() only.
+views.run()
@@ -0,0 +1,133 @@
+import hashlib
+import time
+
+import pytest
+
+from auth import Authenticator, SessionStore, EmailTaken, hash_password, verify_password
+from db import Database, SQLiteBackend
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = Database(SQLiteBackend(str(tmp_path / 'agrizen.db')), size=2, timeout=1)
+    database.migrate()
+    yield database
+    database.pool.close()
+
+
+@pytest.fixture
+def authenticator(database):
+    authenticator = Authenticator(database, SessionStore(secret='test-secret', ttl=60), workers=1)
+    yield authenticator
+    authenticator._executor.shutdown(wait=True)
+
+
+def stored_password(database, email):
+    return database.execute('find_login', (email,), fetch='one')['password']
+
+
+# --- Session Tokens ---
+def test_issued_token_validates():
+    sessions = SessionStore(secret='test-secret')
+    token = sessions.issue(7, 'asha')
+    session = sessions.validate(token)
+    assert (session.user_id, session.username) == (7, 'asha')
+    # The same token checks out under the same secret only
+    assert SessionStore(secret='other-secret').validate(token) is None
+
+
+def _swap_last(text):
+    return text[:-1] + ('A' if text[-1] != 'A' else 'B')
+
+
+@pytest.mark.parametrize('tamper', [
+    _swap_last,  # signature
+    lambda token: 'x' + token[1:],  # session id
+    lambda token: token.replace('.', '.1', 1),  # expiry
+    lambda token: token.rsplit('.', 1)[0] + '.',  # signature dropped
+    lambda token: '',
+    lambda token: 'not-a-token',
+])
+def test_tampered_tokens_are_rejected(tamper):
+    sessions = SessionStore(secret='test-secret')
+    token = sessions.issue(7, 'asha')
+    assert sessions.validate(tamper(token)) is None
+    assert sessions.stats()['rejected'] == 1
+    assert sessions.validate(token) is not None
+
+
+def test_expired_token_is_dropped():
+    sessions = SessionStore(secret='test-secret', ttl=-1)
+    token = sessions.issue(7, 'asha')
+    assert sessions.validate(token) is None
+    stats = sessions.stats()
+    assert stats['expired'] == 1 and stats['entries'] == 0
+
+
+def test_least_recently_used_session_is_evicted():
+    sessions = SessionStore(secret='test-secret', max_entries=2)
+    first = sessions.issue(1, 'a')
+    second = sessions.issue(2, 'b')
+    assert sessions.validate(first) is not None  # first is now the most recent
+    third = sessions.issue(3, 'c')
+    assert sessions.validate(second) is None
+    assert sessions.validate(first) is not None and sessions.validate(third) is not None
+    assert sessions.stats()['evicted'] == 1
+
+
+def test_revoked_token_no_longer_validates():
+    sessions = SessionStore(secret='test-secret')
+    token = sessions.issue(7, 'asha')
+    sessions.revoke(token)
+    sessions.revoke(token)
+    assert sessions.validate(token) is None
+    assert sessions.stats()['revoked'] == 1
+
+
+# --- Password Hashing ---
+def test_hash_round_trip():
+    stored = hash_password('hunter22')
+    assert stored.startswith('scrypt$') and stored != hash_password('hunter22')
+    assert verify_password('hunter22', stored) == (True, False)
+    assert verify_password('hunter23', stored) == (False, False)
+    assert verify_password('hunter22', 'scrypt$broken') == (False, False)
+
+
+def test_weaker_parameters_need_rehash():
+    stored = hash_password('hunter22', n=1024)
+    assert verify_password('hunter22', stored) == (True, True)
+
+
+# --- Authenticator ---
+def test_register_login_logout(authenticator):
+    authenticator.register('asha', 'asha@example.com', 'hunter22')
+    assert authenticator.login('asha@example.com', 'wrong') is None
+    assert authenticator.login('nobody@example.com', 'hunter22') is None
+    token, session = authenticator.login(' asha@example.com ', 'hunter22')
+    assert session.username == 'asha'
+    authenticator.logout(token)
+    assert authenticator.sessions.validate(token) is None
+
+
+def test_duplicate_email_raises_email_taken(authenticator):
+    authenticator.register('asha', 'asha@example.com', 'hunter22')
+    with pytest.raises(EmailTaken):
+        authenticator.register('asha2', 'asha@example.com', 'other-password')
+
+
+def test_legacy_sha256_hash_verifies_and_is_rehashed(authenticator, database):
+    legacy = hashlib.sha256(b'hunter22').hexdigest()
+    assert verify_password('hunter22', legacy) == (True, True)
+    database.execute('insert_user', ('asha', 'asha@example.com', legacy))
+    assert authenticator.login('asha@example.com', 'wrong') is None
+    assert stored_password(database, 'asha@example.com') == legacy
+    token, session = authenticator.login('asha@example.com', 'hunter22')
+    assert session.username == 'asha'
+    # The upgrade runs on the hash pool after login returns
+    deadline = time.monotonic() + 10
+    while stored_password(database, 'asha@example.com') == legacy and time.monotonic() < deadline:
+        time.sleep(0.01)
+    upgraded = stored_password(database, 'asha@example.com')
+    assert upgraded.startswith('scrypt$')
+    assert verify_password('hunter22', upgraded) == (True, False)
+    assert authenticator.login('asha@example.com', 'hunter22') is not None
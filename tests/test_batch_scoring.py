@@ -0,0 +1,86 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import batch_scoring
+from batch_scoring import SchemaError
+
+CROP_RECORD = {'N': 90, 'P': 42, 'K': 43, 'temperature': 20.8, 'humidity': 82.0, 'ph': 6.5, 'rainfall': 202.9}
+FERTILIZER_RECORD = {'Temparature': 26, 'Humidity': 52, 'Moisture': 38, 'Soil_Type': 'Sandy',
+                     'Crop_Type': 'Maize', 'Nitrogen': 37, 'Potassium': 0, 'Phosphorous': 0}
+
+
+# --- encode_records ---
+def test_records_encode_labels_and_numbers():
+    matrix = batch_scoring.encode_records([CROP_RECORD], 'crop')
+    assert matrix.tolist() == [[90, 42, 43, 20.8, 82.0, 6.5, 202.9]]
+    matrix = batch_scoring.encode_records([FERTILIZER_RECORD, dict(FERTILIZER_RECORD, Soil_Type='2')], 'fertilizer')
+    assert matrix[:, 3].tolist() == [4, 2]
+    assert matrix[:, 4].tolist() == [9, 9]
+
+
+@pytest.mark.parametrize('value', [None, 'NaN', 'nan', 'inf', '-Infinity', float('nan'), 1e400])
+def test_records_reject_missing_and_non_finite(value):
+    with pytest.raises(SchemaError, match="record 1: ph="):
+        batch_scoring.encode_records([CROP_RECORD, dict(CROP_RECORD, ph=value)], 'crop')
+
+
+def test_records_reject_unknown_label_and_missing_column():
+    with pytest.raises(SchemaError, match="Unknown Soil_Type"):
+        batch_scoring.encode_records([dict(FERTILIZER_RECORD, Soil_Type='Peat')], 'fertilizer')
+    with pytest.raises(SchemaError, match="Missing columns"):
+        batch_scoring.encode_records([{k: v for k, v in CROP_RECORD.items() if k != 'N'}], 'crop')
+
+
+# --- encode_features ---
+def test_frame_encoding_matches_records():
+    frame = pd.DataFrame([FERTILIZER_RECORD, dict(FERTILIZER_RECORD, Crop_Type='Paddy')])
+    expected = batch_scoring.encode_records(frame.to_dict('records'), 'fertilizer')
+    assert np.array_equal(batch_scoring.encode_features(frame, 'fertilizer').to_numpy(), expected)
+
+
+def test_blank_csv_cells_are_rejected_with_their_rows():
+    csv = ("N,P,K,temperature,humidity,ph,rainfall\n"
+           "90,42,43,20.8,82.0,6.5,202.9\n"
+           "85,58,41,21.7,80.3,,226.6\n"
+           "60,55,44,,82.3,7.8,263.9\n")
+    with pytest.raises(SchemaError, match=r"\(temperature, ph\) in 2 rows: 1, 2$"):
+        batch_scoring.encode_features(pd.read_csv(io.StringIO(csv)), 'crop')
+
+
+def test_blank_categorical_cell_is_missing_not_unknown():
+    frame = pd.DataFrame([FERTILIZER_RECORD, dict(FERTILIZER_RECORD, Soil_Type=None)])
+    with pytest.raises(SchemaError, match=r"\(Soil_Type\) in 1 rows: 1$"):
+        batch_scoring.encode_features(frame, 'fertilizer')
+
+
+def test_unknown_numeric_category_codes_are_rejected():
+    frame = pd.DataFrame([FERTILIZER_RECORD, dict(FERTILIZER_RECORD, Soil_Type=99)])
+    with pytest.raises(SchemaError, match="Unknown Soil_Type values: 99"):
+        batch_scoring.encode_features(frame, 'fertilizer')
+    frame = pd.DataFrame([dict(FERTILIZER_RECORD, Soil_Type='2.5')])
+    with pytest.raises(SchemaError, match="Unknown Soil_Type values: 2.5"):
+        batch_scoring.encode_features(frame, 'fertilizer')
+    for value in (99, '99', 2.5):
+        with pytest.raises(SchemaError, match="Unknown Soil_Type"):
+            batch_scoring.encode_records([dict(FERTILIZER_RECORD, Soil_Type=value)], 'fertilizer')
+    assert batch_scoring.encode_records([dict(FERTILIZER_RECORD, Soil_Type=3)], 'fertilizer')[0, 3] == 3
+
+
+class NeverCalled:
+    def predict(self, features):
+        raise AssertionError("unreadable input reached the model")
+
+
+@pytest.mark.parametrize('data, parquet, message', [
+    (b'N,P,K\n1,2,3\n4,5,6,7,8\n"unclosed', False, "as CSV"),
+    ('N,P,K\né,2,3\n'.encode('latin-1'), False, "as CSV"),
+    (b'PAR1 definitely not parquet', True, "as Parquet"),
+])
+def test_unreadable_uploads_raise_schema_error(data, parquet, message):
+    source = io.BytesIO(data)
+    source.name = 'upload.parquet' if parquet else 'upload.csv'
+    with pytest.raises(SchemaError, match=message):
+        batch_scoring.score_to_bytes(NeverCalled(), source, 'crop')
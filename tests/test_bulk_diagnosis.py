@@ -0,0 +1,80 @@
+import csv
+import io
+import zipfile
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import bulk_diagnosis
+from bulk_diagnosis import ImageSource
+from tflite_export import MODEL_INPUTS
+
+
+class UniformModel:
+    def __init__(self, classes):
+        self.classes = classes
+
+    def predict_on_batch(self, batch):
+        return np.full((len(batch), self.classes), 1.0 / self.classes, dtype=np.float32)
+
+
+def png_bytes(color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = tmp_path / 'photos.zip'
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr('a.png', png_bytes('green'))
+        z.writestr('b.png', png_bytes('brown'))
+        # 20 MB of zeros deflate to ~20 KB: a 1000:1 bomb
+        z.writestr('bomb.jpg', bytes(20 * 1024 * 1024))
+    return str(path)
+
+
+def read_report(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return {row['image']: row for row in csv.DictReader(f)}
+
+
+def test_compression_bomb_is_rejected_unread(archive):
+    source = ImageSource(archive)
+    assert source.names == ['a.png', 'b.png']
+    assert 'compression ratio' in source.rejected['bomb.jpg']
+    source.close()
+
+
+def test_oversized_member_and_total_limits(archive, monkeypatch):
+    size = len(png_bytes('green'))
+    monkeypatch.setattr(bulk_diagnosis, 'BULK_MAX_COMPRESSION_RATIO', float('inf'))
+    monkeypatch.setattr(bulk_diagnosis, 'BULK_MAX_IMAGE_BYTES', 1024 * 1024)
+    monkeypatch.setattr(bulk_diagnosis, 'BULK_MAX_TOTAL_BYTES', size + 1)
+    source = ImageSource(archive)
+    assert source.names == ['a.png']
+    assert 'archive over' in source.rejected['b.png']
+    assert 'byte limit' in source.rejected['bomb.jpg']
+
+
+def test_member_count_limit(archive, monkeypatch):
+    monkeypatch.setattr(bulk_diagnosis, 'BULK_MAX_MEMBERS', 1)
+    source = ImageSource(archive)
+    assert source.names == ['a.png'] and source.truncated == 2 and not source.rejected
+
+
+def test_rejected_members_are_reported_once(archive, tmp_path):
+    output = str(tmp_path / 'report.csv')
+    model = UniformModel(len(MODEL_INPUTS['pest_model'][1]))
+    stats = bulk_diagnosis.diagnose(archive, 'pest', output, model=model, batch_size=4, workers=2)
+    assert (stats['images'], stats['processed'], stats['errors']) == (3, 3, 1)
+    report = read_report(output)
+    assert report['a.png']['status'] == 'ok'
+    assert report['bomb.jpg']['status'] == 'error'
+    assert report['bomb.jpg']['error'].startswith('Skipped: compression ratio')
+    # A resumed run finds everything, including the rejection, already reported
+    stats = bulk_diagnosis.diagnose(archive, 'pest', output, model=model)
+    assert (stats['skipped'], stats['processed']) == (3, 0)
+    assert len(read_report(output)) == 3
@@ -0,0 +1,159 @@
+import threading
+
+import pytest
+
+import db
+from db import Database, SQLiteBackend, ConnectionPool, DatabaseError, IntegrityError, PoolTimeout
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return SQLiteBackend(str(tmp_path / 'agrizen.db'))
+
+
+@pytest.fixture
+def database(backend):
+    database = Database(backend, size=2, timeout=0.2)
+    database.migrate()
+    yield database
+    database.pool.close()
+
+
+# --- Pool ---
+def test_checkout_reuses_idle_connection(backend):
+    pool = ConnectionPool(backend, size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert second is first
+    stats = pool.stats()
+    assert stats['created'] == 1
+    assert stats['checkouts'] == 2
+    assert stats['in_use'] == 0 and stats['idle'] == 1
+
+
+def test_exhausted_pool_times_out(backend):
+    pool = ConnectionPool(backend, size=1, timeout=0.1)
+    held = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    assert pool.stats()['timeouts'] == 1
+    pool.release(held)
+    pool.release(pool.acquire())
+
+
+def test_waiting_checkout_gets_released_connection(backend):
+    pool = ConnectionPool(backend, size=1, timeout=2)
+    held = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    pool.release(held)
+    waiter.join(2)
+    assert got and got[0] is held
+    assert pool.stats()['waited_checkouts'] == 1
+
+
+def test_broken_connection_is_replaced(backend):
+    pool = ConnectionPool(backend, size=1, health_check_interval=0)
+    pooled = pool.acquire()
+    broken = pooled.raw
+    pool.release(pooled)
+    broken.close()
+    with pool.connection() as conn:
+        assert conn is not broken
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+    stats = pool.stats()
+    assert stats['failed_health_checks'] == 1
+    assert stats['created'] == 2 and stats['open'] == 1
+
+
+def test_health_check_runs_outside_the_pool_lock(tmp_path):
+    pinging, unblock = threading.Event(), threading.Event()
+
+    class SlowPingBackend(SQLiteBackend):
+        def ping(self, conn):
+            pinging.set()
+            unblock.wait(5)
+            super().ping(conn)
+
+    pool = ConnectionPool(SlowPingBackend(str(tmp_path / 'agrizen.db')), size=2, timeout=1,
+                          health_check_interval=0)
+    pool.release(pool.acquire())
+    checked = []
+    worker = threading.Thread(target=lambda: checked.append(pool.acquire()))
+    worker.start()
+    assert pinging.wait(5)
+    # While the idle connection is being pinged, the other slot is still handed out
+    other = pool.acquire()
+    assert worker.is_alive()
+    assert pool.stats()['in_use'] == 2
+    unblock.set()
+    worker.join(5)
+    assert checked and checked[0] is not other
+    assert pool.stats()['checkouts'] == 3
+
+
+def test_expired_connection_is_recycled(backend):
+    pool = ConnectionPool(backend, size=1, max_lifetime=0)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is not first
+    assert pool.stats()['recycled'] == 1
+
+
+def test_failed_statement_is_rolled_back(database):
+    database.execute('insert_user', ('asha', 'asha@example.in', 'x'))
+    with pytest.raises(IntegrityError):
+        database.execute('insert_user', ('asha2', 'asha@example.in', 'y'))
+    with database.pool.connection() as conn:
+        assert not conn.in_transaction
+
+
+# --- Statements ---
+def test_insert_then_find_login(database):
+    user_id = database.execute('insert_user', ('asha', 'asha@example.in', 'hash'))
+    row = database.execute('find_login', ('asha@example.in',), fetch='one')
+    assert row == {'id': user_id, 'username': 'asha', 'password': 'hash'}
+    assert database.execute('find_login', ('nobody@example.in',), fetch='one') is None
+    assert database.stats()['queries']['find_login']['count'] == 2
+
+
+def test_read_sees_write_from_other_connection(database):
+    with database.pool.connection():
+        # Holding one connection forces the insert onto the other
+        database.execute('insert_user', ('ravi', 'ravi@example.in', 'hash'))
+    assert database.execute('find_login', ('ravi@example.in',), fetch='one')['username'] == 'ravi'
+
+
+# --- Migrations ---
+def test_migrations_apply_once(backend):
+    database = Database(backend)
+    assert database.migrate() == [m['version'] for m in db.MIGRATIONS]
+    assert database.migrate() == []
+    with database.pool.connection() as conn:
+        indexes = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+    assert 'idx_users_email' in indexes
+
+
+def test_duplicate_emails_block_migration(backend):
+    database = Database(backend)
+    database.execute('insert_user', ('a', 'same@example.in', 'x'))
+    database.execute('insert_user', ('b', 'same@example.in', 'y'))
+    with pytest.raises(DatabaseError, match="blocked by 1 conflicting rows"):
+        database.migrate()
+    with database.pool.connection() as conn:
+        assert conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] is None
+
+
+def test_get_database_uses_sqlite_stand_in(tmp_path, monkeypatch):
+    monkeypatch.setenv('AGRIZEN_DB_BACKEND', 'sqlite')
+    monkeypatch.setattr(db, 'DB_BACKEND', 'sqlite')
+    monkeypatch.setattr(db, '_database', None)
+    monkeypatch.chdir(tmp_path)
+    database = db.get_database()
+    assert isinstance(database.backend, SQLiteBackend)
+    assert database.migrate() == []
+    database.pool.close()
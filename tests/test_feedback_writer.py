@@ -0,0 +1,130 @@
+import json
+import threading
+
+import pytest
+
+from db import DatabaseError, IntegrityError, PoolTimeout
+from feedback_writer import FeedbackWriter, _encode
+
+
+class FakeDatabase:
+    """executemany() stand-in: rows with page "bad" break a constraint; down fails every call."""
+
+    def __init__(self):
+        self.rows = []
+        self.down = False
+        self.fail_after = None
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def executemany(self, name, rows):
+        assert name == 'insert_feedback'
+        with self.lock:
+            self.calls += 1
+            if self.down or (self.fail_after is not None and self.calls > self.fail_after):
+                raise PoolTimeout("database unavailable")
+            if any(row[1] == 'bad' for row in rows):
+                raise IntegrityError("foreign key constraint fails")
+            self.rows.extend(rows)
+
+
+@pytest.fixture
+def db():
+    return FakeDatabase()
+
+
+@pytest.fixture
+def make_writer(db, tmp_path):
+    def make(**options):
+        options.setdefault('flush_interval', 0.01)
+        options.setdefault('retry_interval', 0)
+        return FeedbackWriter(db, spill_path=str(tmp_path / 'spill.jsonl'),
+                              dead_letter_path=str(tmp_path / 'rejected.jsonl'), **options)
+    return make
+
+
+def pages(rows):
+    return [row[1] for row in rows]
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in f]
+
+
+def test_rows_are_written_in_batches(db, make_writer):
+    writer = make_writer(batch_size=3)
+    for i in range(7):
+        writer.submit(1, f"p{i}", "ok")
+    assert writer.flush(5)
+    assert pages(db.rows) == [f"p{i}" for i in range(7)]
+    assert writer.stats()['written'] == 7
+
+
+def test_outage_spills_then_replays_in_order(db, make_writer, tmp_path):
+    writer = make_writer(batch_size=2)
+    db.down = True
+    for i in range(3):
+        writer.submit(1, f"p{i}", "ok")
+    assert writer.flush(5)
+    assert writer.stats()['spilled'] == 3 and db.rows == []
+    db.down = False
+    writer.submit(1, "p3", "ok")
+    assert writer.flush(5) and writer.flush(5)
+    assert sorted(pages(db.rows)) == ["p0", "p1", "p2", "p3"]
+    assert not writer.stats()['spill_file']
+
+
+def test_bad_row_is_dead_lettered_without_its_batch(db, make_writer, tmp_path):
+    writer = make_writer(batch_size=5)
+    for page in ["a", "b", "bad", "c", "d"]:
+        writer.submit(1, page, "text")
+    assert writer.flush(5)
+    assert pages(db.rows) == ["a", "b", "c", "d"]
+    assert [json.loads(line)['page'] for line in read_lines(tmp_path / 'rejected.jsonl')] == ["bad"]
+    stats = writer.stats()
+    assert stats['rejected'] == 1 and stats['spilled'] == 0 and not stats['spill_file']
+
+
+def test_truncated_spill_line_is_quarantined(db, make_writer, tmp_path):
+    from datetime import datetime
+    good = _encode((1, "kept", "text", datetime(2024, 5, 1)))
+    (tmp_path / 'spill.jsonl').write_text(good + '\n' + good[:20] + '\n', encoding='utf-8')
+    writer = make_writer()
+    assert writer.flush(5)
+    writer.submit(1, "after", "text")
+    assert writer.flush(5)
+    assert pages(db.rows) == ["kept", "after"]
+    assert read_lines(tmp_path / 'rejected.jsonl') == [good[:20]]
+    assert writer.stats()['corrupt'] == 1
+
+
+def test_worker_survives_a_failing_iteration(db, make_writer, tmp_path):
+    writer = make_writer()
+    writer.spill_path = str(tmp_path / 'missing-dir' / 'spill.jsonl')
+    db.down = True
+    writer.submit(1, "lost", "text")
+    assert writer.flush(5)
+    assert writer.stats()['errors'] == 1
+    db.down = False
+    writer.submit(1, "next", "text")
+    assert writer.flush(5)
+    assert pages(db.rows) == ["next"]
+
+
+def test_replay_records_progress_per_batch(db, make_writer, tmp_path):
+    from datetime import datetime
+    rows = [(1, f"s{i}", "text", datetime(2024, 5, 1)) for i in range(5)]
+    (tmp_path / 'spill.jsonl').write_text(''.join(_encode(row) + '\n' for row in rows), encoding='utf-8')
+    # The first batch commits, then the database goes away mid-replay
+    db.fail_after = 1
+    writer = make_writer(batch_size=2, retry_interval=3600)
+    assert writer.flush(5)
+    assert pages(db.rows) == ["s0", "s1"]
+    remaining = [json.loads(line)['page'] for line in read_lines(tmp_path / 'spill.jsonl.replay')]
+    assert remaining == ["s2", "s3", "s4"]
+    # A restarted writer picks up where the last one stopped, without re-inserting
+    db.fail_after = None
+    restarted = make_writer(batch_size=2)
+    assert restarted.flush(5)
+    assert pages(db.rows) == ["s0", "s1", "s2", "s3", "s4"]
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from inference_server import InferenceBatcher
+
+
+class FakeModel:
+    """Row sums of each input, recording the size of every batch it is given."""
+
+    def __init__(self, transform=None):
+        self.batch_sizes = []
+        self.transform = transform
+
+    def predict_on_batch(self, inputs):
+        self.batch_sizes.append(len(inputs))
+        outputs = inputs.reshape(len(inputs), -1).sum(axis=1, keepdims=True)
+        return self.transform(outputs) if self.transform else outputs
+
+
+def samples(count):
+    return [np.full((2, 2, 3), i, dtype=np.float32) for i in range(count)]
+
+
+def test_concurrent_requests_share_a_batch():
+    model = FakeModel()
+    # A long wait so every queued sample is gathered; the size cap closes the batch early
+    batcher = InferenceBatcher(model, max_batch_size=3, max_wait_ms=200, name='fake')
+    outputs = batcher.predict_many(samples(5), timeout=5)
+    np.testing.assert_array_equal(outputs[:, 0], [12 * i for i in range(5)])
+    assert model.batch_sizes == [3, 2]
+    stats = batcher.stats()
+    assert stats['batch_size_histogram'] == {2: 1, 3: 1}
+    assert stats['requests'] == 5
+
+
+def test_single_batch_of_one_is_unwrapped():
+    batcher = InferenceBatcher(FakeModel(), max_wait_ms=0, name='fake')
+    assert batcher.predict(samples(2)[1][np.newaxis], timeout=5)[0] == 12
+
+
+@pytest.mark.parametrize('transform, error', [
+    (lambda outputs: 1 / 0, ZeroDivisionError),
+    (lambda outputs: outputs[:-1], ValueError),
+    (lambda outputs: outputs.sum(), ValueError),
+])
+def test_failed_batch_fails_every_caller(transform, error):
+    model = FakeModel(transform)
+    batcher = InferenceBatcher(model, max_batch_size=4, max_wait_ms=200, name='fake')
+    futures = [batcher.submit(sample) for sample in samples(4)]
+    for future in futures:
+        with pytest.raises(error):
+            future.result(timeout=5)
+    # The worker survives and serves the next batch
+    model.transform = None
+    assert batcher.predict(samples(2)[1], timeout=5)[0] == 12
@@ -0,0 +1,50 @@
+import json
+import os
+
+import pytest
+
+from model_registry import file_identity, resolve_artifact
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    source = tmp_path / 'pest_model.h5'
+    source.write_bytes(b'keras weights')
+    deployed = tmp_path / 'pest_model.tflite'
+    deployed.write_bytes(b'tflite flatbuffer')
+    return str(source), str(deployed)
+
+
+def write_report(deployed, fingerprint):
+    with open(deployed + '.json', 'w') as f:
+        json.dump({'deployed': 'dynamic', 'source_fingerprint': fingerprint}, f)
+
+
+def test_export_of_current_source_is_served(artifacts):
+    source, deployed = artifacts
+    write_report(deployed, file_identity(source))
+    assert resolve_artifact(source, 'tflite') == deployed
+    assert resolve_artifact(source, 'keras') == source
+
+
+def test_retrained_source_falls_back_to_keras(artifacts):
+    source, deployed = artifacts
+    write_report(deployed, file_identity(source))
+    with open(source, 'wb') as f:
+        f.write(b'retrained keras weights')
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert resolve_artifact(source, 'tflite') == source
+
+
+def test_export_without_fingerprint_falls_back_to_keras(artifacts):
+    source, deployed = artifacts
+    assert resolve_artifact(source, 'tflite') == source
+    write_report(deployed, None)
+    assert resolve_artifact(source, 'tflite') == source
+
+
+def test_export_shipped_without_source_is_served(artifacts):
+    source, deployed = artifacts
+    os.remove(source)
+    assert resolve_artifact(source, 'tflite') == deployed
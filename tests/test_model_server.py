@@ -0,0 +1,95 @@
+import os
+import stat
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import model_server
+from model_server import ModelClient, ModelServer, RemoteModel, RemoteModelError
+
+
+class DoublingModel:
+    def predict_on_batch(self, x):
+        return np.asarray(x) * 2
+
+
+class FakeRegistry:
+    def __init__(self, load_seconds=0.0):
+        self.load_seconds = load_seconds
+        self.loaded = threading.Event()
+
+    def get(self, name):
+        if not self.loaded.is_set():
+            time.sleep(self.load_seconds)
+            self.loaded.set()
+        return DoublingModel()
+
+    def status(self):
+        return {}
+
+
+@pytest.fixture
+def serve(tmp_path):
+    servers = []
+
+    def start(registry=None, directory=tmp_path / 'run'):
+        server = ModelServer(str(directory / 'models.sock'), registry or FakeRegistry())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_socket_is_private(serve):
+    server = serve()
+    assert stat.S_IMODE(os.stat(os.path.dirname(server.socket_path)).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(server.socket_path).st_mode) == 0o600
+
+
+def test_shared_directory_is_refused(serve, tmp_path):
+    shared = tmp_path / 'shared'
+    shared.mkdir()
+    shared.chmod(0o1777)
+    with pytest.raises(PermissionError):
+        serve(directory=shared)
+    with pytest.raises(PermissionError):
+        ModelClient(str(shared / 'models.sock')).call({'op': 'status'})
+
+
+def test_predict_through_server_issued_arena(serve):
+    server = serve()
+    client = ModelClient(server.socket_path)
+    model = RemoteModel(client, 'pest_model')
+    batch = model.input_buffer((2, 3))
+    batch[...] = [[1, 2, 3], [4, 5, 6]]
+    assert model.predict_on_batch(batch).tolist() == [[2, 4, 6], [8, 10, 12]]
+    # Growing the arena swaps in a new server-issued segment
+    assert model.predict_on_batch(np.ones((1, 1 << 19), dtype=np.float32)).shape == (1, 1 << 19)
+    client.close()
+
+
+def test_segments_not_issued_to_the_connection_are_refused(serve):
+    server = serve()
+    client = ModelClient(server.socket_path)
+    from multiprocessing import shared_memory
+    foreign = shared_memory.SharedMemory(create=True, size=64)
+    try:
+        with pytest.raises(RemoteModelError, match="was not issued"):
+            client.call({'op': 'predict_on_batch', 'model': 'pest_model', 'shm': foreign.name,
+                         'shape': [4], 'dtype': '<f4'})
+    finally:
+        foreign.close()
+        foreign.unlink()
+
+
+def test_first_load_uses_the_load_timeout(serve):
+    server = serve(FakeRegistry(load_seconds=0.5))
+    client = ModelClient(server.socket_path, timeout=0.1, load_timeout=5)
+    model = RemoteModel(client, 'pest_model')
+    assert model.predict_on_batch(np.ones((1, 2), dtype=np.float32)).tolist() == [[2, 2]]
@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+import pytest
+
+import prediction_cache
+from model_registry import ModelRegistry
+from prediction_cache import MemoryTier, PredictionCache
+
+PROBABILITIES = np.array([[0.1, 0.7, 0.2]])
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    (tmp_path / 'leaf.bin').write_bytes(b'v1')
+    registry = ModelRegistry(paths={'leaf_model': 'leaf.bin'}, base_dir=str(tmp_path))
+    registry._entries['leaf_model'].loader = lambda path: open(path, 'rb').read()
+    monkeypatch.setattr(prediction_cache, 'registry', registry)
+    return registry
+
+
+def replace_artifact(registry, content):
+    path = registry.path('leaf_model')
+    with open(path, 'wb') as f:
+        f.write(content)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_identity_follows_the_loaded_model(registry):
+    registry.get('leaf_model')
+    loaded = prediction_cache.model_identity('leaf_model')
+    replace_artifact(registry, b'v2-bigger')
+    # The process still serves the old model, so predictions keep its identity
+    assert prediction_cache.model_identity('leaf_model') == loaded
+    assert registry.get('leaf_model') == b'v1'
+
+
+def test_identity_before_load_is_the_file_to_be_loaded(registry):
+    before = prediction_cache.model_identity('leaf_model')
+    registry.get('leaf_model')
+    assert prediction_cache.model_identity('leaf_model') == before
+
+
+def test_replaced_file_does_not_purge_loaded_model_predictions(registry, tmp_path):
+    cache = PredictionCache(disk_path=str(tmp_path / 'cache.db'))
+    registry.get('leaf_model')
+    cache.put(b'photo', 'leaf_model', PROBABILITIES)
+    replace_artifact(registry, b'v2-bigger')
+    assert cache.get(b'photo', 'leaf_model') == [(1, 0.7), (2, 0.2), (0, 0.1)]
+    assert len(cache.disk) == 1
+
+
+def test_new_process_identity_purges_old_predictions(registry, tmp_path, monkeypatch):
+    cache = PredictionCache(disk_path=str(tmp_path / 'cache.db'))
+    registry.get('leaf_model')
+    cache.put(b'photo', 'leaf_model', PROBABILITIES)
+    replace_artifact(registry, b'v2-bigger')
+    # What a restarted process sees: the new file, loaded fresh
+    restarted = ModelRegistry(paths={'leaf_model': 'leaf.bin'}, base_dir=str(tmp_path))
+    monkeypatch.setattr(prediction_cache, 'registry', restarted)
+    assert cache.get(b'photo', 'leaf_model') is None
+    assert len(cache.memory) == 0 and len(cache.disk) == 0
+
+
+def test_memory_purge_compares_identities_exactly():
+    tier = MemoryTier(max_entries=10, ttl_seconds=60)
+    tier.put('m:1:2:T1:a', 'm', 'm:1:2:T1', 'old', now=0)
+    tier.put('m:1:2:T1.5:a', 'm', 'm:1:2:T1.5', 'new', now=0)
+    tier.put('other:1:2:T1:a', 'other', 'other:1:2:T1', 'kept', now=0)
+    tier.purge_model('m', 'm:1:2:T1')
+    assert tier.get('m:1:2:T1:a', now=1) == 'old'
+    assert tier.get('m:1:2:T1.5:a', now=1) is None
+    assert tier.get('other:1:2:T1:a', now=1) == 'kept'
@@ -0,0 +1,102 @@
+import pytest
+
+import translation
+from translation import TranslationService, FakeBackend
+
+
+class FlakyBackend(FakeBackend):
+    """FakeBackend that fails on chosen calls (1-based)."""
+
+    fail_on = ()
+
+    def translate_batch(self, texts, target_language):
+        if self.calls + 1 in self.fail_on:
+            self.calls += 1
+            raise ConnectionError("backend unavailable")
+        return super().translate_batch(texts, target_language)
+
+
+@pytest.fixture
+def service(tmp_path):
+    return TranslationService('fake', cache_path=str(tmp_path / 'translations.db'), batch_size=2)
+
+
+def test_miss_then_memory_hit(service):
+    assert service.translate("Spray neem oil", 'hi') == "[hi] Spray neem oil"
+    assert service.translate("Spray neem oil", 'hi') == "[hi] Spray neem oil"
+    stats = service.stats()
+    assert (stats['misses'], stats['hits'], stats['backend_calls']) == (1, 1, 1)
+    assert service.backend.calls == 1
+
+
+def test_english_skips_backend(service):
+    assert service.translate_many(["a", "b"], 'en') == ["a", "b"]
+    assert service.stats()['misses'] == 0 and service._backend is None
+
+
+def test_disk_hit_survives_restart(tmp_path):
+    path = str(tmp_path / 'translations.db')
+    TranslationService('fake', cache_path=path).translate("Remove infected leaves", 'ta')
+    restarted = TranslationService('fake', cache_path=path)
+    assert restarted.translate("Remove infected leaves", 'ta') == "[ta] Remove infected leaves"
+    assert restarted.stats()['disk_hits'] == 1
+    assert restarted._backend is None
+
+
+def test_memory_tier_is_bounded(tmp_path):
+    service = TranslationService('fake', cache_path=None, memory_entries=2)
+    service.translate_many(["a", "b", "c"], 'hi')
+    assert service.stats()['memory_entries'] == 2
+    service.translate("a", 'hi')
+    assert service.stats()['misses'] == 4
+
+
+def test_misses_are_deduplicated_and_batched(service):
+    texts = ["a", "b", "a", "c", "d", "e", "b"]
+    assert service.translate_many(texts, 'bn') == [f"[bn] {t}" for t in texts]
+    # Five distinct texts in batches of two
+    assert service.backend.calls == 3
+    assert service.stats()['misses'] == len(texts)
+    service.translate_many(texts + ["f"], 'bn')
+    assert service.backend.calls == 4
+
+
+def test_cached_many_never_calls_backend(service):
+    service.translate("a", 'mr')
+    assert service.cached_many(["a", "b"], 'mr') == ["[mr] a", None]
+    assert service.backend.calls == 1
+
+
+def test_backend_failure_propagates_and_keeps_earlier_batches(service, monkeypatch):
+    monkeypatch.setitem(translation.BACKENDS, 'fake', FlakyBackend)
+    monkeypatch.setattr(FlakyBackend, 'fail_on', (2,))
+    with pytest.raises(ConnectionError):
+        service.translate_many(["a", "b", "c", "d"], 'te')
+    # The first batch was cached; the failed one is retried on the next call
+    assert service.cached_many(["a", "b", "c", "d"], 'te') == ["[te] a", "[te] b", None, None]
+    assert service.translate_many(["a", "b", "c", "d"], 'te') == ["[te] a", "[te] b", "[te] c", "[te] d"]
+    assert service.backend.calls == 3
+
+
+def test_get_translation_service_honours_override(monkeypatch, tmp_path):
+    monkeypatch.setattr(translation, 'TRANSLATE_BACKEND', 'fake')
+    monkeypatch.setattr(translation, '_services', {})
+    monkeypatch.chdir(tmp_path)
+    service = translation.get_translation_service('google-cloud')
+    assert service.backend_name == 'fake'
+    assert translation.get_translation_service() is service
+
+
+def test_fake_backend_keeps_no_disk_cache_by_default(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(translation, 'TRANSLATION_CACHE_PATH', str(tmp_path / 'shared.db'))
+    TranslationService('fake').translate("Spray neem oil", 'hi')
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_backends_never_share_entries(tmp_path, monkeypatch):
+    path = str(tmp_path / 'shared.db')
+    TranslationService('fake', cache_path=path).translate("Spray neem oil", 'hi')
+    monkeypatch.setitem(translation.BACKENDS, 'real', FakeBackend)
+    real = TranslationService('real', cache_path=path)
+    assert real.cached_many(["Spray neem oil"], 'hi') == [None]
@@ -0,0 +1,307 @@
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
+import numpy as np
+
+import labels
+from image_preprocessing import preprocess, PEST_INPUT_SIZE, DISEASE_INPUT_SIZE
+from lazy_imports import lazy_import
+
+tf = lazy_import('tensorflow')
+
+# --- Export Configuration ---
+# Ordered from largest to smallest artifact; the gate deploys the smallest passing one
+VARIANTS = ['float32', 'float16', 'dynamic', 'int8']
+TFLITE_THREADS = int(os.environ.get('AGRIZEN_TFLITE_THREADS', str(os.cpu_count() or 1)))
+CALIBRATION_IMAGES = 200
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+MODEL_INPUTS = {
+    'pest_model': (PEST_INPUT_SIZE, labels.pest_class_names),
+    'disease_model': (DISEASE_INPUT_SIZE, labels.disease_class_labels),
+}
+
+# Parity gate against the Keras model on the evaluation set
+MIN_TOP1_AGREEMENT = 0.99
+MIN_CLASS_AGREEMENT = 0.95
+MAX_ACCURACY_DROP = 0.01
+
+
+def variant_path(model_path, variant):
+    return f"{os.path.splitext(model_path)[0]}.{variant}.tflite"
+
+
+def deployed_path(model_path):
+    return os.path.splitext(model_path)[0] + '.tflite'
+
+
+def report_path(model_path):
+    return deployed_path(model_path) + '.json'
+
+
+# --- Runtime Backend ---
+def make_interpreter(path, num_threads=TFLITE_THREADS):
+    # The standalone runtime is a few MB; full TensorFlow is the fallback
+    if importlib.util.find_spec('tflite_runtime') is not None:
+        from tflite_runtime.interpreter import Interpreter
+    else:
+        Interpreter = tf.lite.Interpreter
+    return Interpreter(model_path=path, num_threads=num_threads)
+
+
+class TFLiteModel:
+    """TFLite interpreter behind the predict/predict_on_batch calls the apps make.
+
+    Quantized int8 inputs and outputs are converted at the boundary, so
+    callers keep passing normalized float32 tensors and get probabilities.
+    """
+
+    def __init__(self, path, num_threads=TFLITE_THREADS):
+        self.path = path
+        self._interpreter = make_interpreter(path, num_threads)
+        self._input = self._interpreter.get_input_details()[0]
+        self._output = self._interpreter.get_output_details()[0]
+        self.input_shape = tuple(self._input['shape'][1:])
+        self._batch = None
+        # One interpreter owns one set of tensors; calls must not interleave
+        self._lock = threading.Lock()
+
+    def _resize(self, batch):
+        if batch != self._batch:
+            self._interpreter.resize_tensor_input(self._input['index'], [batch, *self.input_shape])
+            self._interpreter.allocate_tensors()
+            self._batch = batch
+
+    def _quantize(self, x):
+        dtype = self._input['dtype']
+        if dtype == np.float32:
+            return x
+        scale, zero_point = self._input['quantization']
+        info = np.iinfo(dtype)
+        return np.clip(np.round(x / scale + zero_point), info.min, info.max).astype(dtype)
+
+    def _dequantize(self, y):
+        if self._output['dtype'] == np.float32:
+            return y
+        scale, zero_point = self._output['quantization']
+        return (y.astype(np.float32) - zero_point) * scale
+
+    def predict_on_batch(self, x):
+        x = np.asarray(x, dtype=np.float32)
+        with self._lock:
+            self._resize(x.shape[0])
+            self._interpreter.set_tensor(self._input['index'], self._quantize(x))
+            self._interpreter.invoke()
+            output = self._interpreter.get_tensor(self._output['index']).copy()
+        return self._dequantize(output)
+
+    def predict(self, x, **kwargs):
+        return self.predict_on_batch(x)
+
+
+# --- Calibration and Evaluation Images ---
+def image_files(directory, limit=None):
+    paths = []
+    for root, _, files in sorted(os.walk(directory)):
+        for filename in sorted(files):
+            if filename.lower().endswith(IMAGE_EXTENSIONS):
+                paths.append(os.path.join(root, filename))
+    if limit is not None and len(paths) > limit:
+        # Evenly spaced, so every class folder is represented
+        paths = [paths[i] for i in np.linspace(0, len(paths) - 1, limit).astype(int)]
+    return paths
+
+
+def load_tensors(paths, size):
+    batch = np.empty((len(paths), size[1], size[0], 3), dtype=np.float32)
+    for i, path in enumerate(paths):
+        with open(path, 'rb') as f:
+            preprocess(f.read(), size, out=batch[i:i + 1])
+    return batch
+
+
+def folder_labels(paths, class_names):
+    """Ground truth from <eval-dir>/<class name>/<image>, or None if not laid out that way."""
+    index = {name: i for i, name in enumerate(class_names)}
+    truth = [index.get(os.path.basename(os.path.dirname(p))) for p in paths]
+    return None if any(t is None for t in truth) else np.array(truth)
+
+
+# --- Conversion ---
+def convert(keras_model, variant, calibration=None):
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    if variant == 'float16':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif variant == 'dynamic':
+        # int8 weights, float activations; no calibration data needed
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif variant == 'int8':
+        if calibration is None or not len(calibration):
+            raise ValueError("Full-int8 export needs calibration images")
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([calibration[i:i + 1]] for i in range(len(calibration)))
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+    elif variant != 'float32':
+        raise ValueError(f"Unknown variant {variant!r}; choose from {', '.join(VARIANTS)}")
+    return converter.convert()
+
+
+# --- Parity Report ---
+def predict_in_batches(model, images, batch_size=32):
+    return np.concatenate([np.asarray(model.predict_on_batch(images[i:i + batch_size]))
+                           for i in range(0, len(images), batch_size)])
+
+
+def single_image_ms(model, images, repeats=20):
+    timings = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        model.predict_on_batch(images[i % len(images)][None])
+        timings.append(time.perf_counter() - start)
+    return 1000 * float(np.median(timings))
+
+
+def parity(reference, candidate, class_names, truth=None, k=5):
+    expected = reference.argmax(axis=1)
+    actual = candidate.argmax(axis=1)
+    agree = expected == actual
+    per_class = {}
+    for index in np.unique(expected):
+        mask = expected == index
+        per_class[class_names[index]] = {'images': int(mask.sum()), 'agreement': float(agree[mask].mean())}
+    k = min(k, reference.shape[1])
+    top_reference = np.argpartition(-reference, k - 1, axis=1)[:, :k]
+    top_candidate = np.argpartition(-candidate, k - 1, axis=1)[:, :k]
+    overlap = [len(set(a) & set(b)) / k for a, b in zip(top_reference, top_candidate)]
+    report = {
+        'images': int(len(expected)),
+        'top1_agreement': float(agree.mean()),
+        'worst_class_agreement': min(c['agreement'] for c in per_class.values()),
+        f'top{k}_overlap': float(np.mean(overlap)),
+        'max_abs_prob_diff': float(np.abs(reference - candidate).max()),
+        'per_class': per_class,
+    }
+    if truth is not None:
+        report['reference_accuracy'] = float((expected == truth).mean())
+        report['accuracy'] = float((actual == truth).mean())
+    return report
+
+
+def gate(report, min_agreement=MIN_TOP1_AGREEMENT, min_class_agreement=MIN_CLASS_AGREEMENT,
+         max_accuracy_drop=MAX_ACCURACY_DROP):
+    failures = []
+    if report['top1_agreement'] < min_agreement:
+        failures.append(f"top-1 agreement {report['top1_agreement']:.4f} < {min_agreement}")
+    if report['worst_class_agreement'] < min_class_agreement:
+        failures.append(f"worst class agreement {report['worst_class_agreement']:.4f} < {min_class_agreement}")
+    if 'accuracy' in report and report['reference_accuracy'] - report['accuracy'] > max_accuracy_drop:
+        failures.append(f"accuracy drop {report['reference_accuracy'] - report['accuracy']:.4f} > {max_accuracy_drop}")
+    return failures
+
+
+def export(name, model_path, eval_dir, calibration_dir=None, variants=VARIANTS, deploy=True, **thresholds):
+    """Convert every variant, score it against Keras and deploy the smallest that passes.
+
+    The report records the fingerprint of the .h5 it was exported from; the
+    registry only serves the deployed file while that still matches.
+    """
+    from model_registry import load_keras_model, file_identity
+    size, class_names = MODEL_INPUTS[name]
+    # Taken before loading, so a file replaced meanwhile is not credited to this export
+    fingerprint = file_identity(model_path)
+    keras_model = load_keras_model(model_path)
+    eval_paths = image_files(eval_dir)
+    if not eval_paths:
+        raise ValueError(f"No evaluation images under {eval_dir}")
+    images = load_tensors(eval_paths, size)
+    truth = folder_labels(eval_paths, class_names)
+    calibration = None
+    if calibration_dir:
+        calibration = load_tensors(image_files(calibration_dir, CALIBRATION_IMAGES), size)
+    reference = predict_in_batches(keras_model, images)
+
+    reports = {}
+    for variant in variants:
+        path = variant_path(model_path, variant)
+        with open(path, 'wb') as f:
+            f.write(convert(keras_model, variant, calibration))
+        candidate = TFLiteModel(path)
+        report = parity(reference, predict_in_batches(candidate, images), class_names, truth)
+        report.update({
+            'variant': variant,
+            'path': path,
+            'size_mb': os.path.getsize(path) / 2 ** 20,
+            'single_image_ms': single_image_ms(candidate, images),
+            'failures': gate(report, **thresholds),
+        })
+        reports[variant] = report
+
+    passing = [r for r in reports.values() if not r['failures']]
+    chosen = min(passing, key=lambda r: r['size_mb']) if passing else None
+    summary = {
+        'model': name,
+        'source': model_path,
+        'source_fingerprint': fingerprint,
+        'source_size_mb': os.path.getsize(model_path) / 2 ** 20,
+        'keras_single_image_ms': single_image_ms(keras_model, images),
+        'deployed': chosen['variant'] if chosen else None,
+        'variants': reports,
+    }
+    if deploy:
+        if chosen is not None:
+            shutil.copyfile(chosen['path'], deployed_path(model_path))
+        elif os.path.exists(deployed_path(model_path)):
+            # Whatever is deployed came from an earlier model; don't leave it to be served
+            os.remove(deployed_path(model_path))
+        with open(report_path(model_path), 'w') as f:
+            json.dump(summary, f, indent=2)
+    return summary
+
+
+def main(argv=None):
+    from model_registry import MODEL_PATHS, BASE_DIR
+    parser = argparse.ArgumentParser(description="Export the Keras image models to quantized TFLite behind a parity gate.")
+    parser.add_argument('models', nargs='*', default=sorted(MODEL_INPUTS))
+    parser.add_argument('--eval-dir', required=True, help="held-out images, ideally <dir>/<class name>/*.jpg")
+    parser.add_argument('--calibration-dir', help="representative images for full-int8 (defaults to --eval-dir)")
+    parser.add_argument('--variants', nargs='*', default=VARIANTS, choices=VARIANTS)
+    parser.add_argument('--min-agreement', type=float, default=MIN_TOP1_AGREEMENT)
+    parser.add_argument('--min-class-agreement', type=float, default=MIN_CLASS_AGREEMENT)
+    parser.add_argument('--max-accuracy-drop', type=float, default=MAX_ACCURACY_DROP)
+    parser.add_argument('--no-deploy', action='store_true', help="report only; leave the deployed model alone")
+    args = parser.parse_args(argv)
+
+    status = 0
+    for name in args.models:
+        # Always export from the Keras source, whatever backend the registry selected
+        model_path = os.path.join(BASE_DIR, MODEL_PATHS[name])
+        summary = export(name, model_path, args.eval_dir, args.calibration_dir or args.eval_dir,
+                         args.variants, deploy=not args.no_deploy, min_agreement=args.min_agreement,
+                         min_class_agreement=args.min_class_agreement,
+                         max_accuracy_drop=args.max_accuracy_drop)
+        print(f"{name}: Keras {summary['source_size_mb']:.0f} MB, {summary['keras_single_image_ms']:.1f} ms/image")
+        for variant, report in summary['variants'].items():
+            verdict = "ok" if not report['failures'] else "; ".join(report['failures'])
+            accuracy = f", accuracy {report['accuracy']:.4f}" if 'accuracy' in report else ""
+            print(f"  {variant:8} {report['size_mb']:7.1f} MB {report['single_image_ms']:7.1f} ms/image  "
+                  f"top-1 agreement {report['top1_agreement']:.4f}{accuracy}  [{verdict}]")
+        if summary['deployed']:
+            print(f"  deployed {summary['deployed']} -> {deployed_path(model_path)}")
+        else:
+            print("  no variant passed the parity gate; nothing deployed (any earlier export was removed)"
+                  if not args.no_deploy else "  no variant passed the parity gate")
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
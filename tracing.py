@@ -0,0 +1,267 @@
+import atexit
+import contextvars
+import http.server
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+# --- Tracing Configuration ---
+# AGRIZEN_TRACING=0 turns every span into a shared no-op object and makes
+# traced() return the undecorated function, so disabled tracing costs one
+# flag check per stage.
+TRACING_ENABLED = os.environ.get('AGRIZEN_TRACING', '1').strip().lower() not in ('', '0', 'false', 'no')
+# Quantiles are computed over the most recent spans held in the ring buffer
+TRACE_BUFFER_SIZE = int(os.environ.get('AGRIZEN_TRACE_BUFFER', '20000'))
+# JSON-lines span log, appended by a background thread; unset disables it
+TRACE_LOG_PATH = os.environ.get('AGRIZEN_TRACE_LOG')
+TRACE_FLUSH_INTERVAL = float(os.environ.get('AGRIZEN_TRACE_FLUSH_INTERVAL', '5'))
+# Standalone /metrics endpoint for the Streamlit processes; unset disables it
+METRICS_PORT = os.environ.get('AGRIZEN_METRICS_PORT')
+
+STAGES = ['model_load', 'preprocess', 'inference', 'postprocess', 'db', 'password_hash', 'translation', 'render', 'request']
+QUANTILES = (0.5, 0.95, 0.99)
+
+_page = contextvars.ContextVar('agrizen_trace_page', default='-')
+
+
+# --- Ring Buffer ---
+class SpanBuffer:
+    """Fixed-size ring of (series, wall time, duration) records plus running totals.
+
+    A series is one (stage, page) pair, interned to a small integer so a
+    record is three array stores under a lock.
+    """
+
+    def __init__(self, size=TRACE_BUFFER_SIZE):
+        self.size = size
+        self._series = []
+        self._series_ids = {}
+        self._series_id = np.zeros(size, dtype=np.int32)
+        self._wall = np.zeros(size, dtype=np.float64)
+        self._seconds = np.zeros(size, dtype=np.float64)
+        self._written = 0
+        self._count = []
+        self._sum = []
+        self._lock = threading.Lock()
+
+    def record(self, stage, page, seconds, wall=None):
+        with self._lock:
+            key = (stage, page)
+            series = self._series_ids.get(key)
+            if series is None:
+                series = self._series_ids[key] = len(self._series)
+                self._series.append(key)
+                self._count.append(0)
+                self._sum.append(0.0)
+            i = self._written % self.size
+            self._series_id[i] = series
+            self._wall[i] = time.time() if wall is None else wall
+            self._seconds[i] = seconds
+            self._written += 1
+            self._count[series] += 1
+            self._sum[series] += seconds
+
+    def since(self, position):
+        """Records written after position, the new position and how many were overwritten unread."""
+        with self._lock:
+            written = self._written
+            start = max(position, written - self.size)
+            slots = np.arange(start, written) % self.size
+            records = [(self._series[s], w, d) for s, w, d in
+                       zip(self._series_id[slots].tolist(), self._wall[slots].tolist(),
+                           self._seconds[slots].tolist())]
+        return records, written, start - position
+
+    def summary(self, quantiles=QUANTILES):
+        """Per (stage, page): lifetime count/sum and quantiles over the buffered window."""
+        with self._lock:
+            filled = min(self._written, self.size)
+            series_id = self._series_id[:filled].copy()
+            seconds = self._seconds[:filled].copy()
+            series, counts, sums = list(self._series), list(self._count), list(self._sum)
+        order = np.argsort(series_id, kind='stable')
+        series_id, seconds = series_id[order], seconds[order]
+        bounds = np.searchsorted(series_id, np.arange(len(series) + 1))
+        report = {}
+        for i, key in enumerate(series):
+            window = seconds[bounds[i]:bounds[i + 1]]
+            report[key] = {
+                'count': counts[i],
+                'sum': sums[i],
+                'window': len(window),
+                'quantiles': dict(zip(quantiles, np.quantile(window, quantiles).tolist()))
+                if len(window) else {q: 0.0 for q in quantiles},
+            }
+        return report
+
+
+spans = SpanBuffer()
+
+
+# --- Spans ---
+class Span:
+    __slots__ = ('stage', 'page', '_start')
+
+    def __init__(self, stage, page=None):
+        self.stage = stage
+        self.page = page
+        self._start = time.perf_counter()
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.end()
+        return False
+
+    def end(self):
+        spans.record(self.stage, self.page or _page.get(), time.perf_counter() - self._start)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def end(self):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(stage, page=None):
+    """Context manager timing one stage; the page defaults to set_page()'s."""
+    return Span(stage, page) if TRACING_ENABLED else _NULL_SPAN
+
+
+def begin(stage, page=None):
+    """Started span for stages that do not fit a with block; call .end() when done."""
+    return Span(stage, page) if TRACING_ENABLED else _NULL_SPAN
+
+
+def record(stage, seconds, page=None):
+    """Record a duration the caller already measured."""
+    if TRACING_ENABLED:
+        spans.record(stage, page or _page.get(), seconds)
+
+
+def traced(stage):
+    def decorate(fn):
+        if not TRACING_ENABLED:
+            return fn
+
+        def wrapper(*args, **kwargs):
+            with Span(stage):
+                return fn(*args, **kwargs)
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        wrapper.__wrapped__ = fn
+        return wrapper
+    return decorate
+
+
+def set_page(page):
+    """Attribute spans on this thread (a Streamlit script run or a request) to page."""
+    _page.set(page)
+
+
+# --- Exporters ---
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text(buffer=spans):
+    lines = ['# HELP agrizen_stage_seconds Time spent per request stage and page.',
+             '# TYPE agrizen_stage_seconds summary']
+    for (stage, page), stats in sorted(buffer.summary().items()):
+        labels = f'stage="{_label(stage)}",page="{_label(page)}"'
+        for q, value in stats['quantiles'].items():
+            lines.append(f'agrizen_stage_seconds{{{labels},quantile="{q}"}} {value:.9g}')
+        lines.append(f'agrizen_stage_seconds_sum{{{labels}}} {stats["sum"]:.9g}')
+        lines.append(f'agrizen_stage_seconds_count{{{labels}}} {stats["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+class TraceLogWriter:
+    """Appends new spans to a JSON-lines file from a background thread."""
+
+    def __init__(self, path, buffer=spans, interval=TRACE_FLUSH_INTERVAL):
+        self.path = path
+        self.buffer = buffer
+        self.interval = interval
+        self._position = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="trace-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            records, self._position, dropped = self.buffer.since(self._position)
+            if not records and not dropped:
+                return
+            with open(self.path, 'a', encoding='utf-8') as f:
+                if dropped:
+                    f.write(json.dumps({'ts': time.time(), 'dropped': dropped}) + '\n')
+                for (stage, page), wall, seconds in records:
+                    f.write(json.dumps({'ts': round(wall, 6), 'stage': stage, 'page': page,
+                                        'ms': round(1000 * seconds, 3)}) + '\n')
+
+    def close(self):
+        self._stop.set()
+        self.flush()
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = prometheus_text().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_exporters = {}
+_exporters_lock = threading.Lock()
+
+
+def start_exporters(log_path=TRACE_LOG_PATH, metrics_port=METRICS_PORT):
+    """Start the configured span log and /metrics endpoint once per process."""
+    if not TRACING_ENABLED or _exporters.get('started'):
+        return
+    with _exporters_lock:
+        if _exporters.get('started'):
+            return
+        if log_path:
+            _exporters['log'] = TraceLogWriter(log_path)
+        if metrics_port:
+            try:
+                server = http.server.ThreadingHTTPServer(('127.0.0.1', int(metrics_port)), _MetricsHandler)
+            except OSError:
+                # Another app process on this host already serves the port
+                server = None
+            if server is not None:
+                threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+                _exporters['metrics'] = server
+        _exporters['started'] = True
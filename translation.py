@@ -0,0 +1,216 @@
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+
+import tracing
+from lazy_imports import lazy_import
+
+google_translate = lazy_import('google.cloud.translate_v2')
+googletrans = lazy_import('googletrans')
+
+# --- Service Configuration ---
+# Overrides the backend each app asks for: google-cloud, googletrans or fake
+TRANSLATE_BACKEND = os.environ.get('AGRIZEN_TRANSLATE_BACKEND')
+TRANSLATION_CACHE_PATH = os.environ.get('AGRIZEN_TRANSLATION_CACHE', 'translation_cache.db')
+TRANSLATION_MEMORY_ENTRIES = int(os.environ.get('AGRIZEN_TRANSLATION_MEMORY_ENTRIES', '10000'))
+# Strings per backend request; both Google APIs cap request size
+TRANSLATION_BATCH_SIZE = 100
+
+REMEDY_LANGUAGES = ["hi", "ta", "te", "bn", "mr", "ml"]
+
+
+# --- Backends ---
+class GoogleCloudBackend:
+    persistent = True
+
+    def __init__(self):
+        self.client = google_translate.Client()
+
+    def translate_batch(self, texts, target_language):
+        results = self.client.translate(list(texts), target_language=target_language)
+        return [r['translatedText'] for r in results]
+
+
+class GoogletransBackend:
+    persistent = True
+
+    def __init__(self):
+        self.translator = googletrans.Translator()
+
+    def translate_batch(self, texts, target_language):
+        results = self.translator.translate(list(texts), dest=target_language)
+        return [r.text for r in results]
+
+
+class FakeBackend:
+    """Offline stand-in that tags text with the target language."""
+
+    # Placeholders must never land in the shared on-disk cache
+    persistent = False
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate_batch(self, texts, target_language):
+        self.calls += 1
+        return [f"[{target_language}] {text}" for text in texts]
+
+
+BACKENDS = {
+    'google-cloud': GoogleCloudBackend,
+    'googletrans': GoogletransBackend,
+    'fake': FakeBackend,
+}
+
+
+# --- Translation Service ---
+def cache_key(backend_name, text, target_language):
+    # Per backend, so one backend's output is never served as another's
+    return f"{backend_name}:{target_language}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+
+class TranslationService:
+    """Reuses one backend client, batches misses and caches every result.
+
+    cache_path defaults to TRANSLATION_CACHE_PATH for real backends and to
+    no disk tier for the fake one; pass '' to keep results in memory only.
+    """
+
+    def __init__(self, backend_name, cache_path=None,
+                 memory_entries=TRANSLATION_MEMORY_ENTRIES, batch_size=TRANSLATION_BATCH_SIZE):
+        if cache_path is None:
+            cache_path = TRANSLATION_CACHE_PATH if BACKENDS[backend_name].persistent else ''
+        self.backend_name = backend_name
+        self.batch_size = batch_size
+        self.memory_entries = memory_entries
+        self._backend = None
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = None
+        if cache_path:
+            self._disk = sqlite3.connect(cache_path, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, text TEXT NOT NULL)")
+            self._disk.commit()
+        self._stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'backend_calls': 0}
+
+    @property
+    def backend(self):
+        # The client is created on first miss and reused afterwards
+        if self._backend is None:
+            self._backend = BACKENDS[self.backend_name]()
+        return self._backend
+
+    def _lookup(self, key):
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+        if self._disk is not None:
+            row = self._disk.execute("SELECT text FROM translations WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._remember(key, row[0])
+                self._stats['disk_hits'] += 1
+                return row[0]
+        self._stats['misses'] += 1
+        return None
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    @tracing.traced('translation')
+    def translate_many(self, texts, target_language):
+        if target_language == 'en':
+            return list(texts)
+        keys = [cache_key(self.backend_name, text, target_language) for text in texts]
+        results = [None] * len(texts)
+        missing = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                results[i] = self._lookup(key)
+                if results[i] is None:
+                    missing.setdefault(texts[i], []).append(i)
+        pending = list(missing)
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            translated = self.backend.translate_batch(batch, target_language)
+            with self._lock:
+                self._stats['backend_calls'] += 1
+                for text, value in zip(batch, translated):
+                    key = cache_key(self.backend_name, text, target_language)
+                    self._remember(key, value)
+                    if self._disk is not None:
+                        self._disk.execute("INSERT OR REPLACE INTO translations (key, text) VALUES (?, ?)",
+                                           (key, value))
+                    for i in missing[text]:
+                        results[i] = value
+                if self._disk is not None:
+                    self._disk.commit()
+        return results
+
+    def cached_many(self, texts, target_language):
+        """Cached translations only, None where the backend was never asked."""
+        if target_language == 'en':
+            return list(texts)
+        with self._lock:
+            return [self._lookup(cache_key(self.backend_name, text, target_language)) for text in texts]
+
+    def translate(self, text, target_language):
+        return self.translate_many([text], target_language)[0]
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+            return stats
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_translation_service(default_backend='google-cloud'):
+    """Process-wide service; AGRIZEN_TRANSLATE_BACKEND overrides the default."""
+    name = TRANSLATE_BACKEND or default_backend
+    service = _services.get(name)
+    if service is None:
+        with _services_lock:
+            service = _services.get(name)
+            if service is None:
+                service = _services[name] = TranslationService(name)
+    return service
+
+
+# --- Offline Pre-translation ---
+def pretranslate(service, languages=REMEDY_LANGUAGES):
+    from remedies import disease_remedies, pest_remedies
+    texts = list(disease_remedies.values()) + list(pest_remedies.values())
+    for language in languages:
+        service.translate_many(texts, language)
+    return len(texts) * len(languages)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill the translation cache for every remedy text.")
+    parser.add_argument('command', choices=['pretranslate'])
+    parser.add_argument('--backend', default=TRANSLATE_BACKEND or 'google-cloud', choices=sorted(BACKENDS))
+    parser.add_argument('--languages', nargs='*', default=REMEDY_LANGUAGES)
+    args = parser.parse_args(argv)
+    service = TranslationService(args.backend)
+    count = pretranslate(service, args.languages)
+    stats = service.stats()
+    print(f"Cached {count} remedy translations ({stats['misses']} fetched in "
+          f"{stats['backend_calls']} requests, {stats['hits'] + stats['disk_hits']} already cached)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import os
+import threading
+
+import numpy as np
+
+# --- Test-time Augmentation ---
+# Views in priority order; a budget of N runs the first N in one batch.
+# Crops keep this fraction of each side and are resized back to the input size.
+TTA_BUDGET = int(os.environ.get('AGRIZEN_TTA_BUDGET', '4'))
+MAX_TTA_BUDGET = 10
+CROP_FRACTION = 0.875
+
+VIEWS = [
+    ('identity', None, False, False),
+    ('hflip', None, True, False),
+    ('vflip', None, False, True),
+    ('center_crop', 'center', False, False),
+    ('center_crop_hflip', 'center', True, False),
+    ('top_left_crop', 'top_left', False, False),
+    ('top_right_crop', 'top_right', False, False),
+    ('bottom_left_crop', 'bottom_left', False, False),
+    ('bottom_right_crop', 'bottom_right', False, False),
+    ('hvflip', None, True, True),
+]
+
+_buffers = threading.local()
+
+
+def view_names(budget=TTA_BUDGET):
+    return [view[0] for view in VIEWS[:clamp_budget(budget)]]
+
+
+def clamp_budget(budget):
+    return max(1, min(int(budget), MAX_TTA_BUDGET, len(VIEWS)))
+
+
+def _batch_buffer(count, height, width):
+    cache = getattr(_buffers, 'by_shape', None)
+    if cache is None:
+        cache = _buffers.by_shape = {}
+    key = (count, height, width)
+    buffer = cache.get(key)
+    if buffer is None:
+        buffer = cache[key] = np.empty((count, height, width, 3), dtype=np.float32)
+    return buffer
+
+
+def _crop_box(anchor, height, width):
+    crop_h, crop_w = int(round(height * CROP_FRACTION)), int(round(width * CROP_FRACTION))
+    top = {'center': (height - crop_h) // 2, 'top_left': 0, 'top_right': 0,
+           'bottom_left': height - crop_h, 'bottom_right': height - crop_h}[anchor]
+    left = {'center': (width - crop_w) // 2, 'top_left': 0, 'bottom_left': 0,
+            'top_right': width - crop_w, 'bottom_right': width - crop_w}[anchor]
+    return top, left, crop_h, crop_w
+
+
+def _axis_weights(src, dst):
+    coords = np.clip((np.arange(dst) + 0.5) * (src / dst) - 0.5, 0, src - 1)
+    low = np.floor(coords).astype(np.intp)
+    high = np.minimum(low + 1, src - 1)
+    return low, high, (coords - low).astype(np.float32)
+
+
+def _resize_bilinear(image, height, width, out):
+    """Separable bilinear resize of an (h, w, 3) float array into out."""
+    y0, y1, wy = _axis_weights(image.shape[0], height)
+    x0, x1, wx = _axis_weights(image.shape[1], width)
+    rows = image[y0]
+    rows += (image[y1] - rows) * wy[:, None, None]
+    # np.take is several times faster than fancy indexing on a middle axis
+    left = np.take(rows, x0, axis=1)
+    np.subtract(np.take(rows, x1, axis=1), left, out=out)
+    np.multiply(out, wx[None, :, None], out=out)
+    np.add(out, left, out=out)
+    return out
+
+
+def augment(tensor, budget=TTA_BUDGET):
+    """(N, H, W, 3) views of one preprocessed (1, H, W, 3) or (H, W, 3) tensor.
+
+    Written into a per-thread buffer that the next call on the thread
+    reuses, so callers must consume the batch before augmenting again.
+    """
+    image = np.asarray(tensor, dtype=np.float32)
+    if image.ndim == 4:
+        image = image[0]
+    height, width = image.shape[:2]
+    views = VIEWS[:clamp_budget(budget)]
+    batch = _batch_buffer(len(views), height, width)
+    crops = {}
+    for i, (_, anchor, hflip, vflip) in enumerate(views):
+        if anchor is None:
+            source = image
+        elif anchor in crops:
+            # Flipped variants reuse the crop that was already resized
+            source = batch[crops[anchor]]
+        else:
+            top, left, crop_h, crop_w = _crop_box(anchor, height, width)
+            source = _resize_bilinear(image[top:top + crop_h, left:left + crop_w], height, width, batch[i])
+            crops[anchor] = i
+            if hflip or vflip:
+                # Flipping in place would read pixels it already overwrote
+                source = source.copy()
+        if hflip:
+            source = source[:, ::-1]
+        if vflip:
+            source = source[::-1]
+        if source is not batch[i]:
+            batch[i] = source
+    return batch
+
+
+def average_probabilities(outputs):
+    """Mean class probabilities over the augmented views."""
+    return np.asarray(outputs, dtype=np.float64).mean(axis=0)
+
+
+def predict_with_tta(batcher, tensor, budget=TTA_BUDGET):
+    """Average probabilities over `budget` views, sent through the batcher together."""
+    if clamp_budget(budget) == 1:
+        return batcher.predict(tensor)
+    return average_probabilities(batcher.predict_many(augment(tensor, budget)))
+
+
+def cache_variant(budget):
+    budget = clamp_budget(budget)
+    return f"tta{budget}" if budget > 1 else None
@@ -0,0 +1,147 @@
+import importlib
+import os
+import threading
+
+import streamlit as st
+
+import tracing
+
+# --- Page Table ---
+# (module, title, icon, url path) per navigation section. A page's module is
+# imported the first time any session opens it; after that a rerun only calls
+# its render(), so module-level tables and imports are paid once per process.
+SECTIONS = {
+    "": [
+        ('home', "Home", "🏠", 'home'),
+    ],
+    "Diagnose": [
+        ('pest', "Pest Detection", "🐛", 'pest'),
+        ('disease', "Disease Detection", "🍂", 'disease'),
+    ],
+    "Recommend": [
+        ('crop', "Crop Recommendation", "🌱", 'crop'),
+        ('fertilizer', "Fertilizer Recommendation", "🧪", 'fertilizer'),
+        ('irrigation', "Irrigation Management", "💧", 'irrigation'),
+    ],
+    "Tools": [
+        ('weather', "Weather App", "⛅", 'weather'),
+        ('translate', "Translate", "🌐", 'translate'),
+    ],
+    "Account": [
+        ('auth', "Account", "👤", 'account'),
+        ('feedback', "Feedback", "💬", 'feedback'),
+        ('admin', "Admin", "⏱", 'admin'),
+    ],
+}
+DEFAULT_PAGE = 'home'
+# ?page= names used by app.py that match no title or url path
+LEGACY_ALIASES = {'Login': 'auth', 'Register': 'auth', 'Dashboard': 'home', 'DiseaseDetection': 'disease'}
+
+_started = False
+_started_lock = threading.Lock()
+
+
+def start():
+    """One-time process set-up shared by every session: model warm-up and trace exporters."""
+    global _started
+    if _started:
+        return
+    with _started_lock:
+        if _started:
+            return
+        # Imported here so the entry script never pays for the registry on later reruns
+        from model_registry import registry
+        registry.preload_from_env()
+        tracing.start_exporters()
+        _started = True
+
+
+def _page_runner(module):
+    def render():
+        importlib.import_module(f"{__name__}.{module}").render()
+    render.__name__ = module
+    return render
+
+
+def _make_page(module, title, icon, url_path):
+    return st.Page(_page_runner(module), title=title, icon=icon, url_path=url_path, default=module == DEFAULT_PAGE)
+
+
+def session_pages():
+    """This session's st.Page objects by section, built on its first run.
+
+    st.Page validates and profiles every call, which made rebuilding the
+    table the largest cost of a rerun; objects are per session because
+    st.navigation marks the chosen page runnable on the object itself.
+    """
+    pages = st.session_state.get('_views_pages')
+    if pages is None:
+        pages = st.session_state._views_pages = {
+            section: [_make_page(*entry) for entry in entries] for section, entries in SECTIONS.items()
+        }
+    return pages
+
+
+def page(module):
+    """The session's st.Page for a module, e.g. as an st.page_link target."""
+    for section, entries in SECTIONS.items():
+        for i, entry in enumerate(entries):
+            if entry[0] == module:
+                return session_pages()[section][i]
+    raise KeyError(module)
+
+
+def legacy_page(name):
+    """Match an old ?page=<title> link (app*.py style) to a page, by title or url path."""
+    for entries in SECTIONS.values():
+        for module, title, _, url_path in entries:
+            if name in (title, url_path):
+                return page(module)
+    if name in LEGACY_ALIASES:
+        return page(LEGACY_ALIASES[name])
+    return None
+
+
+# --- Sessions ---
+def sync_session():
+    """Re-validate this tab's login on every run; the token lives in a cookie, never the URL.
+
+    The check hits the in-memory session cache in auth.py, not the database,
+    so logout elsewhere and expiry end the session on the next interaction.
+    """
+    # Imported here so pages that never sign in don't pay for auth at startup
+    import browser_session
+    session = browser_session.restore()
+    st.session_state.user_id = session.user_id if session else None
+    st.session_state.username = session.username if session else None
+
+
+# --- Entry Script ---
+def run():
+    """One script run of the dashboard; the body of streamlit_app.py and the app*.py entry points.
+
+    A function rather than a module so that every entry script executes it on
+    every rerun (an import would only run the first time).
+    """
+    os.environ['STREAMLIT_LOGGER_LEVEL'] = 'ERROR'
+    st.set_page_config(page_title="AgriZen Dashboard", page_icon="🌾", layout="wide")
+
+    start()
+    sync_session()
+
+    current_page = st.navigation(session_pages())
+
+    # Old ?page=<title> links from app*.py land on the matching page
+    legacy = st.query_params.get('page')
+    if legacy is not None:
+        del st.query_params['page']
+        target = legacy_page(legacy)
+        if target is not None and target.title != current_page.title:
+            st.switch_page(target)
+
+    # --- Stage Tracing ---
+    # Spans on this script run are attributed to the page; see tracing.py
+    tracing.set_page(current_page.title)
+    page_render = tracing.begin('render')
+    current_page.run()
+    page_render.end()
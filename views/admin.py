@@ -0,0 +1,48 @@
+import hmac
+import os
+
+import pandas as pd
+import streamlit as st
+
+import tracing
+
+
+def render_stage_timings():
+    if not tracing.TRACING_ENABLED:
+        st.info("Tracing is disabled (AGRIZEN_TRACING=0).")
+    st.button("Refresh")
+    summary = tracing.spans.summary()
+    rows = []
+    order = {stage: i for i, stage in enumerate(tracing.STAGES)}
+    for (stage, page), stats in sorted(summary.items(),
+                                       key=lambda item: (order.get(item[0][0], len(order)), item[0][1])):
+        quantiles = stats['quantiles']
+        rows.append({
+            "Stage": stage, "Page": page, "Count": stats['count'],
+            "Mean (ms)": 1000 * stats['sum'] / stats['count'],
+            "p50 (ms)": 1000 * quantiles[0.5], "p95 (ms)": 1000 * quantiles[0.95],
+            "p99 (ms)": 1000 * quantiles[0.99],
+        })
+    if rows:
+        st.dataframe(pd.DataFrame(rows).round(2), hide_index=True, use_container_width=True)
+    else:
+        st.write("No spans recorded yet in this process.")
+    st.caption(f"Quantiles over the last {tracing.TRACE_BUFFER_SIZE} spans; counts are since process start.")
+    st.download_button("Prometheus metrics", tracing.prometheus_text(), file_name="metrics.txt")
+
+
+def render():
+    st.title("Stage Timings")
+    admin_token = os.environ.get("AGRIZEN_ADMIN_TOKEN")
+    if not admin_token:
+        st.warning("The admin page is disabled. Set AGRIZEN_ADMIN_TOKEN to enable it.")
+        return
+    if not st.session_state.get("is_admin"):
+        token = st.text_input("Admin token", type="password")
+        if token and hmac.compare_digest(token.encode(), admin_token.encode()):
+            st.session_state.is_admin = True
+            st.rerun()
+        elif token:
+            st.error("Invalid admin token.")
+    if st.session_state.get("is_admin"):
+        render_stage_timings()
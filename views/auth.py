@@ -0,0 +1,75 @@
+import streamlit as st
+
+import browser_session
+
+from auth import get_authenticator, is_valid_email, EmailTaken
+from db import DatabaseError
+
+
+def sign_in(token, session):
+    browser_session.remember(token)
+    st.session_state.user_id = session.user_id
+    st.session_state.username = session.username
+
+
+def sign_out():
+    browser_session.forget()
+    st.session_state.user_id = None
+    st.session_state.username = None
+
+
+def render_login():
+    email = st.text_input("Email", key="login_email")
+    password = st.text_input("Password", type="password", key="login_password")
+    if st.button("Login"):
+        if not email or not password:
+            st.error("Please fill in all fields")
+            return
+        try:
+            login = get_authenticator().login(email, password)
+        except DatabaseError as e:
+            st.error(f"Error: {e}")
+            return
+        if login is None:
+            st.error("Invalid email or password.")
+            return
+        sign_in(*login)
+        st.rerun()
+
+
+def render_register():
+    username = st.text_input("Username", key="register_username")
+    email = st.text_input("Email", key="register_email")
+    password = st.text_input("Password", type="password", key="register_password")
+    confirm_password = st.text_input("Confirm Password", type="password", key="register_confirm_password")
+    if st.button("Register"):
+        if not username or not email or not password or not confirm_password:
+            st.error("Please fill in all fields")
+        elif password != confirm_password:
+            st.error("Passwords do not match")
+        elif not is_valid_email(email):
+            st.error("Invalid email format")
+        else:
+            try:
+                get_authenticator().register(username, email, password)
+            except EmailTaken:
+                st.error("An account with this email already exists. Please login.")
+            except DatabaseError as e:
+                st.error(f"Database Error: {e}")
+            else:
+                st.success("Registration successful! Please login.")
+
+
+def render():
+    st.title("Account")
+    if st.session_state.get('session_token'):
+        st.write(f"Signed in as **{st.session_state.username}**.")
+        if st.button("Logout"):
+            sign_out()
+            st.rerun()
+        return
+    login_tab, register_tab = st.tabs(["Login", "Register"])
+    with login_tab:
+        render_login()
+    with register_tab:
+        render_register()
@@ -0,0 +1,48 @@
+import random
+
+import pandas as pd
+import streamlit as st
+
+import batch_scoring
+import tracing
+from views.models import load_registered_model, render_model_status, render_top_predictions, render_batch_scoring
+
+
+def render():
+    st.title("Crop Prediction System")
+    render_model_status()
+    st.write("Enter the required parameters to predict the best crop.")
+
+    model_crop = load_registered_model('crop_model', "Loading crop recommendation model...")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        N = st.number_input("Nitrogen (N)", min_value=0.0, step=0.1)
+        P = st.number_input("Phosphorus (P)", min_value=0.0, step=0.1)
+        K = st.number_input("Potassium (K)", min_value=0.0, step=0.1)
+        temperature = st.number_input("Temperature (°C)", step=0.1)
+    with col2:
+        humidity = st.number_input("Humidity (%)", min_value=0.0, max_value=100.0, step=0.1)
+        ph = st.number_input("pH Level", min_value=0.0, max_value=14.0, step=0.1)
+        rainfall = st.number_input("Rainfall (mm)", min_value=0.0, step=0.1)
+
+    if st.button("Predict Crop"):
+        input_data = pd.DataFrame([[N, P, K, temperature, humidity, ph, rainfall]],
+                                  columns=batch_scoring.CROP_FEATURES)
+
+        if model_crop is not None:
+            try:
+                with st.spinner("Analyzing soil and climate data..."):
+                    # predict_proba once; top-1 is what predict() would return
+                    with tracing.span('inference'):
+                        result = batch_scoring.predict_top_k(model_crop, input_data, 'crop')[0]
+
+                st.success(f"The recommended crop is: {result.label}")
+                render_top_predictions(result)
+            except Exception as e:
+                st.error(f"Error during prediction: {str(e)}")
+        else:
+            st.info("🔍 DEMO MODE: Model not available, showing sample result")
+            st.success(f"The recommended crop is: {random.choice(list(batch_scoring.crop_dict.values()))}")
+
+    render_batch_scoring('crop', model_crop)
@@ -0,0 +1,110 @@
+import os
+import random
+import tempfile
+import zipfile
+
+import streamlit as st
+
+import bulk_diagnosis
+import tracing
+from image_preprocessing import preprocess, make_thumbnail, THUMBNAIL_SIZE
+from inference_server import get_batcher
+from prediction_cache import prediction_cache
+from predictions import from_top_k
+from tta import predict_with_tta, cache_variant, TTA_BUDGET
+from views.models import load_registered_model, render_model_status, render_top_predictions, render_remedy
+
+# --- Image Diagnosis ---
+# The pest and disease pages differ only in model, input size and wording.
+
+
+def tta_budget(key):
+    use_tta = st.checkbox(f"Test-time augmentation: average {TTA_BUDGET} flipped/cropped views (slower, "
+                          "more robust to photo orientation)", key=key)
+    return TTA_BUDGET if use_tta else 1
+
+
+def render_bulk_diagnosis(kind, model):
+    with st.expander("Bulk diagnosis (ZIP of images)"):
+        archive = st.file_uploader("Upload a ZIP of photos", type=["zip"], key=f"bulk_{kind}")
+        parquet_out = st.checkbox("Parquet report", key=f"bulk_parquet_{kind}")
+        if archive is not None and st.button("Diagnose All", key=f"diagnose_{kind}"):
+            if model is None:
+                st.error("Model not available for bulk diagnosis.")
+                return
+            extension = "parquet" if parquet_out else "csv"
+            progress_bar = st.progress(0.0)
+            with tempfile.TemporaryDirectory() as directory:
+                output = os.path.join(directory, f"{kind}_diagnosis.{extension}")
+                try:
+                    stats = bulk_diagnosis.diagnose(archive, kind, output, model=model, resume=False,
+                                                    progress=lambda done, total: progress_bar.progress(done / total))
+                except zipfile.BadZipFile:
+                    st.error("The upload is not a valid ZIP archive.")
+                    return
+                with open(output, "rb") as f:
+                    data = f.read()
+            st.success(f"Diagnosed {stats['processed']} images in {stats['seconds']:.2f}s "
+                       f"({stats['images_per_second']:.1f} images/s, {stats['errors']} unreadable or over the size limits)")
+            if stats['truncated']:
+                st.warning(f"The archive holds more than {bulk_diagnosis.BULK_MAX_MEMBERS} images; "
+                           f"the last {stats['truncated']} were not diagnosed.")
+            st.download_button("Download report", data, file_name=f"{kind}_diagnosis.{extension}",
+                               key=f"download_bulk_{kind}")
+
+
+def show_uploaded_image(slot, image_bytes, decoded=()):
+    # A cache miss made the thumbnail in its single decode; otherwise decode at thumbnail scale only.
+    # The browser never receives the full-resolution photo.
+    thumbnail = decoded[0] if decoded else make_thumbnail(image_bytes)
+    slot.image(thumbnail, caption="Uploaded Image", use_column_width=True)
+
+
+def render_image_page(kind, model_name, input_size, class_names, prompt, spinner_text):
+    render_model_status()
+    model = load_registered_model(model_name, f"Loading {kind} detection model...")
+
+    st.write(prompt)
+    uploaded_file = st.file_uploader("Choose an image...", type=["jpg", "jpeg", "png"], key=kind)
+    budget = tta_budget(f"{kind}_tta")
+
+    if uploaded_file is not None:
+        image_bytes = uploaded_file.getvalue()
+        # Filled in once the prediction has (or hasn't) decoded the photo
+        image_slot = st.empty()
+
+        if model is not None:
+            try:
+                decoded = []
+
+                def predict():
+                    with tracing.span('preprocess'):
+                        image_array, thumbnail = preprocess(image_bytes, input_size, thumbnail_size=THUMBNAIL_SIZE)
+                    decoded.append(thumbnail)
+                    # Shared worker batches this request (and its TTA views) with other sessions
+                    with tracing.span('inference'):
+                        return predict_with_tta(get_batcher(model_name), image_array, budget)
+
+                with st.spinner(spinner_text):
+                    # Re-uploads and reruns of the same photo are served from the cache
+                    top_predictions = prediction_cache.get_or_compute(image_bytes, model_name, predict,
+                                                                      variant=cache_variant(budget))
+                show_uploaded_image(image_slot, image_bytes, decoded)
+
+                with tracing.span('postprocess'):
+                    result = from_top_k(model_name, top_predictions, class_names)
+
+                st.success("Analysis complete!")
+                st.write(f"Prediction: {result.label}")
+                st.write(f"Confidence: {result.confidence:.2f}")
+                render_top_predictions(result)
+                render_remedy(result)
+            except Exception as e:
+                st.error(f"Error during prediction: {str(e)}")
+        else:
+            show_uploaded_image(image_slot, image_bytes)
+            st.info("🔍 DEMO MODE: Model not available, showing sample result")
+            st.write(f"Prediction: {random.choice(class_names)}")
+            st.write(f"Confidence: {random.uniform(0.7, 0.95):.2f}")
+
+    render_bulk_diagnosis(kind, model)
@@ -0,0 +1,11 @@
+import streamlit as st
+
+import labels
+from image_preprocessing import DISEASE_INPUT_SIZE
+from views.diagnosis import render_image_page
+
+
+def render():
+    st.title("Plant Disease Detection")
+    render_image_page('disease', 'disease_model', DISEASE_INPUT_SIZE, labels.disease_class_labels,
+                      "Upload an image of a plant leaf to detect the disease:", "Analyzing leaf image...")
@@ -0,0 +1,19 @@
+import streamlit as st
+
+from feedback_writer import get_feedback_writer
+from views import SECTIONS
+
+PAGES = [title for entries in SECTIONS.values() for _, title, _, _ in entries]
+
+
+def render():
+    st.title("Feedback")
+    page = st.selectbox("Which page is this about?", PAGES)
+    feedback_text = st.text_area("Enter your feedback", key="feedback_text")
+    if st.button("Submit Feedback"):
+        if not feedback_text.strip():
+            st.error("Please enter feedback before submitting.")
+            return
+        # Queued and written in batches by the background writer; see feedback_writer.py
+        get_feedback_writer().submit(st.session_state.get('user_id'), page, feedback_text)
+        st.success("Thank you for your feedback!")
@@ -0,0 +1,51 @@
+import random
+
+import pandas as pd
+import streamlit as st
+
+import batch_scoring
+import tracing
+from views.models import load_registered_model, render_model_status, render_top_predictions, render_batch_scoring
+
+SOIL_TYPES = list(batch_scoring.soil_dict)
+CROP_TYPES = list(batch_scoring.fertilizer_crop_dict)
+
+
+def render():
+    st.title("Fertilizer Recommendation")
+    render_model_status()
+    st.write("Enter the following details to get a fertilizer recommendation:")
+
+    model_fert = load_registered_model('fertilizer_model', "Loading fertilizer recommendation model...")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        temperature = st.number_input("Temperature", min_value=0.0, value=26.0)
+        humidity = st.number_input("Humidity", min_value=0.0, max_value=100.0, value=82.0)
+        moisture = st.number_input("Moisture", min_value=0.0, value=25.0)
+        nitrogen = st.number_input("Nitrogen", min_value=0.0, value=86.0)
+    with col2:
+        potassium = st.number_input("Potassium", min_value=0.0, value=41.0)
+        phosphorous = st.number_input("Phosphorous", min_value=0.0, value=36.0)
+        soil_type = st.selectbox("Soil Type", options=SOIL_TYPES)
+        crop_type = st.selectbox("Crop Type", options=CROP_TYPES)
+
+    if st.button("Predict Fertilizer"):
+        input_data = pd.DataFrame([[temperature, humidity, moisture, batch_scoring.soil_dict[soil_type],
+                                    batch_scoring.fertilizer_crop_dict[crop_type], nitrogen, potassium,
+                                    phosphorous]], columns=batch_scoring.FERTILIZER_FEATURES)
+        if model_fert is not None:
+            try:
+                with st.spinner("Analyzing soil and crop data..."):
+                    with tracing.span('inference'):
+                        result = batch_scoring.predict_top_k(model_fert, input_data, 'fertilizer')[0]
+
+                st.success(f"Recommended Fertilizer: {result.label}")
+                render_top_predictions(result)
+            except Exception as e:
+                st.error(f"Error during prediction: {str(e)}")
+        else:
+            st.info("🔍 DEMO MODE: Model not available, showing sample result")
+            st.success(f"Recommended Fertilizer: {random.choice(list(batch_scoring.fertilizer_dict))}")
+
+    render_batch_scoring('fertilizer', model_fert)
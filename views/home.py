@@ -0,0 +1,48 @@
+import html
+
+import streamlit as st
+
+import views
+
+# (page module, image) for each card
+CARDS = [
+    ('pest', "https://images.unsplash.com/photo-1530836369250-ef72a3f5cda8?ixlib=rb-1.2.1&auto=format&fit=crop&w=800&q=80"),
+    ('disease', "https://images.unsplash.com/photo-1530836369250-ef72a3f5cda8?ixlib=rb-1.2.1&auto=format&fit=crop&w=800&q=80"),
+    ('crop', "https://images.unsplash.com/photo-1500651230702-0e2d8a49d4ad?ixlib=rb-1.2.1&auto=format&fit=crop&w=800&q=80"),
+    ('fertilizer', "https://images.unsplash.com/photo-1592982537447-7440770cbfc9?ixlib=rb-1.2.1&auto=format&fit=crop&w=800&q=80"),
+    ('irrigation', "https://images.unsplash.com/photo-1586771107445-d3ca888129ce?ixlib=rb-1.2.1&auto=format&fit=crop&w=800&q=80"),
+    ('weather', "https://images.unsplash.com/photo-1516912481808-3406841bd33c?ixlib=rb-1.2.1&auto=format&fit=crop&w=800&q=80"),
+]
+
+
+def _card_grid():
+    titles = {module: (title, url_path) for entries in views.SECTIONS.values()
+              for module, title, _, url_path in entries}
+    cards = []
+    for module, image in CARDS:
+        title, url_path = titles[module]
+        cards.append(f'<a class="agz-card" href="{url_path}" target="_self">'
+                     f'<img src="{html.escape(image)}" alt="{html.escape(title)}">'
+                     f'<div>{html.escape(title)}</div></a>')
+    return ("<style>"
+            ".agz-cards{display:grid;grid-template-columns:repeat(auto-fill,minmax(250px,1fr));gap:20px}"
+            ".agz-card{text-decoration:none;color:inherit;border-radius:10px;overflow:hidden;"
+            "box-shadow:0 4px 8px rgba(0,0,0,.1);text-align:center;font-weight:bold}"
+            ".agz-card img{width:100%;height:150px;object-fit:cover}"
+            ".agz-card div{padding:10px}"
+            "</style>"
+            f'<div class="agz-cards">{"".join(cards)}</div>')
+
+
+# Built once: the whole grid is a single markdown element, where an image and a
+# page_link per card made Home the one page slower to rerun than app4.py. A card
+# click is a page load, which the session cookie survives (see browser_session.py)
+CARD_GRID = _card_grid()
+
+
+def render():
+    st.title("Agricultural ML Dashboard")
+    if st.session_state.get('username'):
+        st.write(f"Welcome, {st.session_state.username}!")
+    st.write("Select a functionality:")
+    st.markdown(CARD_GRID, unsafe_allow_html=True)
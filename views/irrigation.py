@@ -0,0 +1,77 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+import irrigation
+from gazetteer import get_gazetteer
+
+
+def render_schedule_upload():
+    with st.expander("Multi-field schedule (CSV / Parquet upload)"):
+        st.write(f"Columns: {', '.join(irrigation.FIELD_COLUMNS)}; only crop_type and soil_moisture are required.")
+        fields_file = st.file_uploader("Upload field readings", type=["csv", "parquet"], key="irrigation_fields")
+        horizon = st.slider("Horizon (days)", 1, 30, irrigation.HORIZON_DAYS)
+        if fields_file is not None and st.button("Build Schedule"):
+            try:
+                if fields_file.name.lower().endswith(".parquet"):
+                    fields = pd.read_parquet(fields_file)
+                else:
+                    fields = pd.read_csv(fields_file)
+                start = time.perf_counter()
+                result = irrigation.simulate_frame(fields, days=horizon)
+                plan = irrigation.schedule(result, fields['field_id'] if 'field_id' in fields.columns else None)
+                seconds = time.perf_counter() - start
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                due = int((plan['first_irrigation_day'] == 0).sum())
+                st.success(f"Simulated {len(plan)} fields over {horizon} days in {seconds:.2f}s; "
+                           f"{due} need water today")
+                st.dataframe(plan.head(100))
+                st.download_button("Download schedule", plan.to_csv(index=False).encode("utf-8"),
+                                   file_name="irrigation_schedule.csv")
+
+
+def render():
+    st.title("Irrigation Management")
+    st.write("This module provides irrigation management recommendations from a daily soil water-balance "
+             "simulation driven by current weather conditions.")
+
+    st.subheader("Current Field Data")
+    col1, col2 = st.columns(2)
+    with col1:
+        soil_moisture = st.slider("Current Soil Moisture (% of available water)", 0, 100, 25)
+        temperature = st.slider("Temperature (°C)", 0, 50, 28)
+    with col2:
+        humidity = st.slider("Humidity (%)", 0, 100, 65)
+        last_rain = st.number_input("Days Since Last Rain", min_value=0, value=3)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        crop_type = st.selectbox("Crop Type", irrigation.CROP_TYPES)
+    with col2:
+        soil_type = st.selectbox("Soil Type", irrigation.SOIL_TYPES,
+                                 index=irrigation.SOIL_TYPES.index(irrigation.DEFAULT_SOIL))
+
+    field_location = st.text_input("Field Location (village, town or district)", "")
+    field_place = get_gazetteer().resolve(field_location) if field_location.strip() else None
+    if field_place is not None:
+        st.caption(f"Using {field_place.label} ({field_place.latitude:.2f}°N) for solar radiation")
+    elif field_location.strip():
+        st.warning(f"No place called {field_location} in the gazetteer; assuming "
+                   f"{irrigation.DEFAULT_LATITUDE:.0f}°N.")
+
+    if st.button("Get Irrigation Recommendation"):
+        with st.spinner("Analyzing irrigation needs..."):
+            # One-field run of the same engine that schedules uploaded fields and the REST API
+            latitude = field_place.latitude if field_place is not None else irrigation.DEFAULT_LATITUDE
+            advice = irrigation.recommend_irrigation(soil_moisture, crop_type, soil_type, temperature, humidity,
+                                                     last_rain, latitude=latitude)
+
+        st.markdown(f"<h3 style='color:{advice['color']};'>Status: {advice['status']}</h3>", unsafe_allow_html=True)
+        st.subheader("Recommended Actions:")
+        for action in advice['actions']:
+            st.write(f"- {action}")
+
+    render_schedule_upload()
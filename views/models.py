@@ -0,0 +1,109 @@
+import pandas as pd
+import streamlit as st
+
+import batch_scoring
+from inference_server import batcher_stats
+from knowledge_base import get_knowledge_base
+from model_registry import registry, LOADING, READY
+from prediction_cache import prediction_cache
+
+# --- Shared Model Helpers ---
+# Used by the pest, disease, crop and fertilizer pages. Models, the batcher
+# and the prediction cache are process-wide, so every session shares them.
+
+# Each waiting session re-checks the shared load this often; every check
+# touches the page, so navigating away interrupts the wait straight away
+MODEL_POLL_SECONDS = 0.5
+
+
+def load_registered_model(name, spinner_text):
+    if not registry.available(name):
+        st.warning("⚠ Model file not found. Using demo mode instead.")
+        return None
+    if registry.is_ready(name):
+        return registry.get(name)
+    # Starts the one shared load if it is due; concurrent sessions only watch it
+    state = registry.request(name)
+    if state == LOADING:
+        progress = st.empty()
+        while state == LOADING:
+            elapsed = registry.status()[name]['loading_seconds'] or 0.0
+            progress.info(f"⏳ {spinner_text} ({elapsed:.0f}s)")
+            state = registry.wait(name, MODEL_POLL_SECONDS)
+        progress.empty()
+        if state == READY:
+            st.success("✅ Model loaded successfully!")
+    if state == READY:
+        return registry.get(name)
+    info = registry.status()[name]
+    st.error(f"Error loading model: {info['error']} (retrying in {info['retry_in'] or 0:.0f}s)")
+    return None
+
+
+def render_model_status():
+    st.sidebar.header("Model Status")
+    for name, info in registry.status().items():
+        if info['ready']:
+            st.sidebar.write(f"✅ {name} ({info['load_seconds']:.1f}s)")
+        elif info['loading']:
+            st.sidebar.write(f"⏳ {name} loading ({info['loading_seconds']:.0f}s)...")
+        elif info['error']:
+            st.sidebar.write(f"❌ {name}: {info['error']} (retry in {info['retry_in']:.0f}s)")
+        elif not info['available']:
+            st.sidebar.write(f"⚠ {name}: file not found")
+        else:
+            st.sidebar.write(f"• {name}: not loaded")
+    for tier, stats in prediction_cache.stats().items():
+        st.sidebar.caption(
+            f"Prediction cache ({tier}): {stats['entries']} entries, "
+            f"{stats['hits']} hits, {stats['misses']} misses")
+    for name, stats in batcher_stats().items():
+        st.sidebar.caption(
+            f"{name}: {stats['requests']} req, mean batch {stats['mean_batch_size']:.1f}, "
+            f"queue wait {stats['mean_queue_wait_ms']:.1f} ms, {stats['throughput_rps']:.1f} req/s")
+
+
+def render_top_predictions(result):
+    if result.near_tie:
+        st.warning(f"Close call: {result.labels[0]} ({result.probabilities[0]:.2f}) vs "
+                   f"{result.labels[1]} ({result.probabilities[1]:.2f}). Consider a second opinion.")
+    with st.expander(f"Top {len(result.labels)} candidates"):
+        st.table(pd.DataFrame(result.top(), columns=["Class", "Probability"]))
+
+
+def render_remedy(result):
+    # Indexed by model output, so no label string has to match remedies.py
+    model = result.model
+    knowledge_base = get_knowledge_base()
+    remedy = knowledge_base.remedy(model, result.index)
+    if remedy is None:
+        if model == 'disease_model' and knowledge_base.healthy(model, result.index):
+            st.info("The leaf looks healthy; no treatment needed.")
+        return
+    with st.expander("Remedies"):
+        languages = knowledge_base.languages(model)
+        language = st.selectbox("Language", languages, key=f"remedy_lang_{model}") if len(languages) > 1 else 'en'
+        st.markdown(knowledge_base.remedy(model, result.index, language))
+
+
+def render_batch_scoring(kind, model):
+    with st.expander("Batch scoring (CSV / Parquet upload)"):
+        columns = batch_scoring.SCHEMAS[kind]['features']
+        st.write(f"Required columns: {', '.join(columns)}")
+        batch_file = st.file_uploader("Upload soil-test file", type=["csv", "parquet"], key=f"batch_{kind}")
+        if batch_file is not None and st.button("Score File", key=f"score_{kind}"):
+            if model is None:
+                st.error("Model not available for batch scoring.")
+                return
+            parquet_out = batch_file.name.lower().endswith(".parquet")
+            try:
+                with st.spinner("Scoring rows..."):
+                    data, stats = batch_scoring.score_to_bytes(model, batch_file, kind, parquet_out=parquet_out)
+            except batch_scoring.SchemaError as e:
+                st.error(str(e))
+                return
+            st.success(f"Scored {stats['rows']} rows in {stats['seconds']:.2f}s "
+                       f"({stats['rows_per_second']:.0f} rows/s)")
+            extension = "parquet" if parquet_out else "csv"
+            st.download_button("Download results", data, file_name=f"{kind}_recommendations.{extension}",
+                               key=f"download_{kind}")
@@ -0,0 +1,11 @@
+import streamlit as st
+
+import labels
+from image_preprocessing import PEST_INPUT_SIZE
+from views.diagnosis import render_image_page
+
+
+def render():
+    st.title("Pest Detection Interface")
+    render_image_page('pest', 'pest_model', PEST_INPUT_SIZE, labels.pest_class_names,
+                      "Upload an image of a pest to detect:", "Analyzing image...")
@@ -0,0 +1,32 @@
+import streamlit as st
+
+from translation import get_translation_service
+
+LANGUAGES = {
+    'English': 'en',
+    'Hindi': 'hi',
+    'Tamil': 'ta',
+    'Telugu': 'te',
+    'Malayalam': 'ml',
+    'Bengali': 'bn',
+    'Marathi': 'mr',
+}
+
+
+def render():
+    st.title("Translate")
+    st.write("Enter text to translate and select a target language:")
+    input_text = st.text_area("Text to Translate", height=150)
+    target_language = st.selectbox("Target Language", options=list(LANGUAGES))
+    if st.button("Translate"):
+        if not input_text.strip():
+            st.error("Please enter text to translate.")
+            return
+        # Shared client with a memory + disk cache (see translation.py)
+        try:
+            translation = get_translation_service('googletrans').translate(input_text, LANGUAGES[target_language])
+        except Exception as e:
+            st.error("Translation error: " + str(e))
+            return
+        st.markdown("**Translated Text:**")
+        st.write(translation)
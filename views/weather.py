@@ -0,0 +1,80 @@
+import time
+
+import streamlit as st
+
+import weather
+from gazetteer import get_gazetteer
+from weather import get_weather_service
+
+
+def render_forecast(place, forecast, km):
+    current = forecast.current()
+
+    st.subheader(f"Current Weather in {place.name}")
+    if km > 1:
+        st.caption(f"Nearest forecast point: {forecast.name}, {km:.0f} km away")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Temperature", f"{current['temperature']:.0f}°C")
+    with col2:
+        st.metric("Humidity", f"{current['humidity']:.0f}%")
+    with col3:
+        st.metric("Wind", f"{current['wind']:.0f} km/h")
+
+    st.info(f"Condition: {current['condition']}")
+    st.caption(f"Forecast for {current['time']:%a %d %b, %H:%M} UTC")
+
+    st.subheader("Agricultural Impact")
+    if current['temperature'] > 30:
+        st.warning("⚠ High temperature may increase water requirements for crops")
+    elif current['temperature'] < 15:
+        st.warning("⚠ Low temperature may affect crop growth. Consider protective measures")
+
+    if current['condition'] in weather.RAINY_CONDITIONS:
+        st.info("☔ Current rainfall may reduce irrigation needs")
+    elif current['condition'] == "Sunny" and current['temperature'] > 25:
+        st.warning("⚠ High evaporation rate. Consider irrigation")
+
+    st.subheader("7-Day Forecast")
+    forecast_df = weather.daily_table(forecast, 7)
+    if len(forecast_df):
+        st.table(forecast_df)
+    else:
+        st.write("The stored forecast for this location has expired.")
+
+
+def render():
+    st.title("Weather App")
+
+    weather_service = get_weather_service()
+    st.subheader("Enter Location")
+    location = st.text_input("City/Region", "")
+    # Resolved through the offline gazetteer: prefix, fuzzy and Devanagari input all work
+    matches = get_gazetteer().search(location, 8) if location.strip() else []
+    place = matches[0] if matches else None
+    if len(matches) > 1:
+        place_labels = [match.label for match in matches]
+        place = matches[place_labels.index(st.selectbox("Matching places", place_labels))]
+    place_key = place.label if place is not None else ""
+
+    # Reruns reuse the session's forecast; a new place (or an expired copy) triggers a lookup
+    fetched_at = st.session_state.get("weather_fetched_at", 0.0)
+    if place_key and (st.session_state.get("weather_key") != place_key
+                      or time.time() - fetched_at > weather.WEATHER_TTL_SECONDS):
+        with st.spinner("Fetching weather data..."):
+            st.session_state.weather_forecast, st.session_state.weather_km = weather_service.forecast_near(place)
+        st.session_state.weather_key = place_key
+        st.session_state.weather_fetched_at = time.time()
+    forecast = st.session_state.get("weather_forecast") if place_key else None
+
+    if location.strip() and place is None:
+        st.warning(f"No place called {location} in the gazetteer.")
+    elif place is not None and forecast is None:
+        if weather_service.locations():
+            st.warning(f"No forecast location within {weather.WEATHER_NEAREST_MAX_KM:.0f} km of {place.label}.")
+        else:
+            st.warning("No forecast data has been ingested. Add provider files to "
+                       f"{weather.WEATHER_DATA_DIR} or run `python weather.py sample`.")
+    elif forecast is not None:
+        render_forecast(place, forecast, st.session_state.weather_km)
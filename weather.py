@@ -0,0 +1,436 @@
+import argparse
+import datetime
+import glob
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+
+# --- Weather Configuration ---
+# Forecast files dropped into WEATHER_DATA_DIR by the (local stand-in)
+# provider are compiled into one columnar store, rebuilt when they change.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WEATHER_DATA_DIR = os.environ.get('AGRIZEN_WEATHER_DIR', os.path.join(BASE_DIR, 'weather_data'))
+WEATHER_STORE_PATH = os.environ.get('AGRIZEN_WEATHER_STORE', os.path.join(BASE_DIR, 'weather_store.npz'))
+WEATHER_TTL_SECONDS = float(os.environ.get('AGRIZEN_WEATHER_TTL_SECONDS', '600'))
+WEATHER_CACHE_MAX_ENTRIES = int(os.environ.get('AGRIZEN_WEATHER_CACHE_MAX_ENTRIES', '4096'))
+# How often a lookup may stat the data directory for new forecast files
+WEATHER_RESCAN_SECONDS = float(os.environ.get('AGRIZEN_WEATHER_RESCAN_SECONDS', '30'))
+# Places without their own forecast borrow the nearest location's within this distance
+WEATHER_NEAREST_MAX_KM = float(os.environ.get('AGRIZEN_WEATHER_NEAREST_MAX_KM', '150'))
+FORECAST_EXTENSIONS = ('.csv', '.nc')
+
+VARIABLES = ['temperature', 'humidity', 'wind', 'rain_mm']
+CONDITIONS = ["Sunny", "Partly Cloudy", "Cloudy", "Light Rain", "Rain", "Thunderstorm"]
+RAINY_CONDITIONS = {"Light Rain", "Rain", "Thunderstorm"}
+FORMAT_VERSION = 2
+# Forecast.daily() columns and their headings on the weather pages
+DAILY_COLUMNS = {'date': "Day", 'condition': "Condition", 'temperature_min': "Min °C", 'temperature_max': "Max °C",
+                 'humidity': "Humidity %", 'wind_max': "Wind km/h", 'rain_mm': "Rain mm"}
+
+
+def normalize_location(location):
+    """Lookup key for a place name: case, punctuation and spacing are ignored."""
+    return ' '.join(re.findall(r'\w+', str(location).casefold()))
+
+
+def derive_conditions(rain_mm, humidity):
+    """Condition codes for rows whose provider sent no condition text."""
+    return np.select([rain_mm >= 10, rain_mm >= 2, rain_mm >= 0.2, humidity >= 80, humidity >= 60],
+                     [5, 4, 3, 2, 1], default=0).astype(np.uint8)
+
+
+# --- Ingest ---
+def read_forecast_file(path):
+    """Rows of one provider file as a DataFrame with location, time and VARIABLES columns."""
+    import pandas as pd
+    if path.lower().endswith('.nc'):
+        try:
+            import xarray
+        except ImportError:
+            raise RuntimeError(f"Reading {path} needs xarray and a NetCDF backend (pip install xarray netCDF4)")
+        with xarray.open_dataset(path) as dataset:
+            frame = dataset.to_dataframe().reset_index()
+    else:
+        frame = pd.read_csv(path)
+    frame.columns = [str(c).strip().lower() for c in frame.columns]
+    missing = [c for c in ['location', 'time'] + VARIABLES if c not in frame.columns]
+    if missing:
+        raise ValueError(f"{path}: missing columns {', '.join(missing)}")
+    return frame
+
+
+def compile_store(paths):
+    """Columnar store: rows sorted by (location, time), addressed through per-location offsets.
+
+    Where files overlap on a (location, time), the most recently modified
+    file wins, so a newer forecast run replaces the older one.
+    """
+    import pandas as pd
+    paths = sorted(paths, key=lambda p: (os.stat(p).st_mtime_ns, p))
+    frames = [read_forecast_file(p) for p in paths]
+    frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['location', 'time'] + VARIABLES)
+    frame['key'] = frame['location'].map(normalize_location)
+    frame['time'] = pd.to_datetime(frame['time'], utc=True).astype('int64') // 10**9
+    frame = frame.drop_duplicates(['key', 'time'], keep='last').sort_values(['key', 'time'], kind='stable')
+
+    keys, starts = np.unique(frame['key'].to_numpy(dtype=str), return_index=True)
+    store = {
+        'version': np.int64(FORMAT_VERSION),
+        'keys': keys,
+        # Display name as written in the newest file for that place
+        'names': frame.groupby('key', sort=True)['location'].last().to_numpy(dtype=str),
+        'offsets': np.append(starts, len(frame)).astype(np.int64),
+        'time': frame['time'].to_numpy(dtype=np.int64),
+    }
+    store['latitude'], store['longitude'] = location_coordinates(frame, store['names'])
+    for variable in VARIABLES:
+        store[variable] = frame[variable].to_numpy(dtype=np.float32)
+    if 'condition' in frame.columns:
+        lookup = {c.lower(): i for i, c in enumerate(CONDITIONS)}
+        coded = frame['condition'].astype(str).str.strip().str.lower().map(lookup)
+        derived = derive_conditions(store['rain_mm'], store['humidity'])
+        store['condition'] = np.where(coded.isna(), derived, coded.fillna(0)).astype(np.uint8)
+    else:
+        store['condition'] = derive_conditions(store['rain_mm'], store['humidity'])
+    return store
+
+
+def location_coordinates(frame, names):
+    """Per-location coordinates from the files' latitude/longitude columns, else from the gazetteer."""
+    if {'latitude', 'longitude'} <= set(frame.columns):
+        grouped = frame.groupby('key', sort=True)
+        return (grouped['latitude'].last().to_numpy(dtype=np.float32),
+                grouped['longitude'].last().to_numpy(dtype=np.float32))
+    from gazetteer import get_gazetteer
+    gazetteer = get_gazetteer()
+    latitudes = np.full(len(names), np.nan, dtype=np.float32)
+    longitudes = np.full(len(names), np.nan, dtype=np.float32)
+    for i, name in enumerate(names.tolist()):
+        place = gazetteer.resolve(name)
+        if place is not None:
+            latitudes[i], longitudes[i] = place.latitude, place.longitude
+    return latitudes, longitudes
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    phi1, phi2 = np.radians(latitude), np.radians(latitudes)
+    a = (np.sin((phi2 - phi1) / 2) ** 2
+         + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(longitudes - longitude) / 2) ** 2)
+    return 2 * 6371.0 * np.arcsin(np.sqrt(a))
+
+
+def save_store(store, path=WEATHER_STORE_PATH):
+    # Per-process name so concurrent ingests never write into the same file
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, **store)
+    os.replace(tmp, path)
+
+
+def forecast_files(directory=WEATHER_DATA_DIR):
+    return sorted(p for p in glob.glob(os.path.join(directory, '**', '*'), recursive=True)
+                  if p.lower().endswith(FORECAST_EXTENSIONS))
+
+
+def files_fingerprint(paths):
+    fingerprint = []
+    for path in paths:
+        stat = os.stat(path)
+        fingerprint.append(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}")
+    return np.array(fingerprint, dtype=str)
+
+
+# --- Store ---
+class Forecast:
+    """One location's time series, as column slices of the store."""
+
+    def __init__(self, name, time, columns):
+        self.name = name
+        self.time = time
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.time)
+
+    def current(self, now=None):
+        """The row in effect at `now`: the latest one not after it, else the first."""
+        now = time.time() if now is None else now
+        i = max(int(np.searchsorted(self.time, now, side='right')) - 1, 0)
+        row = {variable: round(float(self.columns[variable][i]), 2) for variable in VARIABLES}
+        row['condition'] = CONDITIONS[self.columns['condition'][i]]
+        row['time'] = datetime.datetime.fromtimestamp(int(self.time[i]), datetime.timezone.utc)
+        return row
+
+    def daily(self, days=7, now=None):
+        """Per-day summary from today on: temperatures, mean humidity, peak wind, total rain, worst sky."""
+        import pandas as pd
+        now = time.time() if now is None else now
+        day = self.time // 86400
+        start = np.searchsorted(day, int(now) // 86400)
+        end = np.searchsorted(day, int(now) // 86400 + days)
+        day = day[start:end]
+        if not len(day):
+            return pd.DataFrame(columns=list(DAILY_COLUMNS))
+        bounds = np.flatnonzero(np.diff(day, prepend=day[0] - 1))
+        column = {name: values[start:end].astype(np.float64) for name, values in self.columns.items()
+                  if name != 'condition'}
+        counts = np.diff(np.append(bounds, len(day)))
+        return pd.DataFrame({
+            'date': [datetime.datetime.fromtimestamp(int(d) * 86400, datetime.timezone.utc).date().isoformat()
+                     for d in day[bounds]],
+            'condition': [CONDITIONS[c] for c in np.maximum.reduceat(self.columns['condition'][start:end], bounds)],
+            'temperature_min': np.minimum.reduceat(column['temperature'], bounds).round(1),
+            'temperature_max': np.maximum.reduceat(column['temperature'], bounds).round(1),
+            'humidity': (np.add.reduceat(column['humidity'], bounds) / counts).round(0),
+            'wind_max': np.maximum.reduceat(column['wind'], bounds).round(1),
+            'rain_mm': np.add.reduceat(column['rain_mm'], bounds).round(1),
+        })
+
+
+def daily_table(forecast, days=7):
+    """Forecast.daily() with page headings and readable day names."""
+    import pandas as pd
+    table = forecast.daily(days)
+    table['date'] = pd.to_datetime(table['date']).dt.strftime("%a, %b %d")
+    return table.rename(columns=DAILY_COLUMNS)
+
+
+class WeatherStore:
+    def __init__(self, store):
+        self.store = store
+        self.keys = store['keys']
+        self.names = store['names']
+        self.offsets = store['offsets']
+
+    @classmethod
+    def load(cls, path=WEATHER_STORE_PATH):
+        with np.load(path) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def locations(self):
+        return self.names.tolist()
+
+    def lookup(self, location):
+        """Forecast for a place name, or None; a binary search over the sorted location keys."""
+        key = normalize_location(location)
+        i = int(np.searchsorted(self.keys, key))
+        if i == len(self.keys) or self.keys[i] != key:
+            return None
+        start, end = self.offsets[i], self.offsets[i + 1]
+        columns = {name: self.store[name][start:end] for name in VARIABLES + ['condition']}
+        return Forecast(str(self.names[i]), self.store['time'][start:end], columns)
+
+    def nearest(self, latitude, longitude):
+        """(name, km) of the forecast location closest to a point, or None if none has coordinates."""
+        distances = haversine_km(latitude, longitude, self.store['latitude'].astype(np.float64),
+                                 self.store['longitude'].astype(np.float64))
+        if not len(distances) or np.isnan(distances).all():
+            return None
+        i = int(np.nanargmin(distances))
+        return str(self.names[i]), float(distances[i])
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class LocalForecastProvider:
+    """Stand-in for a forecast API: serves the store compiled from the local data directory."""
+
+    def __init__(self, directory=WEATHER_DATA_DIR, store_path=WEATHER_STORE_PATH,
+                 rescan_seconds=WEATHER_RESCAN_SECONDS):
+        self.directory = directory
+        self.store_path = store_path
+        self.rescan_seconds = rescan_seconds
+        self._store = None
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()
+
+    def store(self):
+        now = time.monotonic()
+        if self._store is not None and now - self._scanned_at < self.rescan_seconds:
+            return self._store
+        with self._lock:
+            if self._store is None or now - self._scanned_at >= self.rescan_seconds:
+                self._store = self._refresh()
+                self._scanned_at = time.monotonic()
+        return self._store
+
+    def _refresh(self):
+        paths = forecast_files(self.directory)
+        fingerprint = files_fingerprint(paths)
+        current = self._store
+        if current is not None and np.array_equal(current.store.get('source'), fingerprint):
+            return current
+        try:
+            store = WeatherStore.load(self.store_path)
+            if int(store.store['version']) == FORMAT_VERSION and np.array_equal(store.store['source'], fingerprint):
+                return store
+        except (OSError, KeyError, ValueError):
+            pass
+        compiled = compile_store(paths)
+        compiled['source'] = fingerprint
+        if paths:
+            save_store(compiled, self.store_path)
+        return WeatherStore(compiled)
+
+    def fetch(self, location):
+        return self.store().lookup(location)
+
+    def nearest(self, latitude, longitude):
+        return self.store().nearest(latitude, longitude)
+
+    def locations(self):
+        return self.store().locations()
+
+
+# --- Cached Lookups ---
+class WeatherService:
+    """TTL cache in front of a provider; concurrent misses for one place share a single fetch."""
+
+    def __init__(self, provider, ttl_seconds=WEATHER_TTL_SECONDS, max_entries=WEATHER_CACHE_MAX_ENTRIES):
+        self.provider = provider
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def forecast(self, location):
+        """Forecast for a place name, or None if the provider has no data for it."""
+        key = normalize_location(location)
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and now - item[0] <= self.ttl_seconds:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            pending = self._inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return pending.result()
+
+        try:
+            value = self.provider.fetch(key)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            self._items[key] = (time.monotonic(), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+            del self._inflight[key]
+        pending.set_result(value)
+        return value
+
+    def locations(self):
+        return self.provider.locations()
+
+    def nearest(self, latitude, longitude):
+        return self.provider.nearest(latitude, longitude)
+
+    def forecast_near(self, place, max_km=WEATHER_NEAREST_MAX_KM):
+        """(forecast, km) for the forecast location nearest a gazetteer place; (None, None) past max_km."""
+        nearest = self.nearest(place.latitude, place.longitude)
+        if nearest is None or nearest[1] > max_km:
+            return None, None
+        return self.forecast(nearest[0]), nearest[1]
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._items), 'hits': self.hits, 'misses': self.misses,
+                    'coalesced': self.coalesced}
+
+
+_weather_service = None
+_weather_service_lock = threading.Lock()
+
+
+def get_weather_service():
+    global _weather_service
+    if _weather_service is None:
+        with _weather_service_lock:
+            if _weather_service is None:
+                _weather_service = WeatherService(LocalForecastProvider())
+    return _weather_service
+
+
+# --- Sample Provider Data ---
+SAMPLE_LOCATIONS = ["Pune", "Nagpur", "Delhi", "Lucknow", "Patna", "Kolkata", "Hyderabad", "Bengaluru",
+                    "Chennai", "Coimbatore", "Ludhiana", "Jaipur", "Indore", "Guwahati"]
+
+
+def write_sample(directory=WEATHER_DATA_DIR, locations=SAMPLE_LOCATIONS, days=7, step_hours=3, start=None):
+    """Write a deterministic 3-hourly forecast CSV in the provider's format; returns its path."""
+    import pandas as pd
+    start = start or datetime.datetime.now(datetime.timezone.utc).replace(hour=0, minute=0, second=0,
+                                                                          microsecond=0)
+    hours = np.arange(0, days * 24, step_hours)
+    frames = []
+    for location in locations:
+        rng = np.random.default_rng(zlib.crc32(normalize_location(location).encode()))
+        base, wet = rng.uniform(22, 34), rng.uniform(0, 1)
+        diurnal = np.sin((hours % 24 - 9) / 24 * 2 * np.pi)
+        rain = np.where(rng.random(len(hours)) < 0.15 * wet, rng.gamma(1.5, 4, len(hours)), 0.0)
+        frames.append(pd.DataFrame({
+            'location': location,
+            'time': [(start + datetime.timedelta(hours=int(h))).isoformat() for h in hours],
+            'temperature': (base + 5 * diurnal + rng.normal(0, 1, len(hours))).round(1),
+            'humidity': np.clip(55 + 30 * wet - 15 * diurnal + rng.normal(0, 5, len(hours)), 10, 100).round(0),
+            'wind': np.abs(rng.normal(12, 6, len(hours))).round(1),
+            'rain_mm': rain.round(1),
+        }))
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"forecast_{start:%Y%m%d}.csv")
+    pd.concat(frames, ignore_index=True).to_csv(path, index=False)
+    return path
+
+
+# --- Command Line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the local weather forecast store.")
+    parser.add_argument('command', choices=['ingest', 'sample', 'show'])
+    parser.add_argument('location', nargs='?', help="place to show")
+    parser.add_argument('--data-dir', default=WEATHER_DATA_DIR)
+    parser.add_argument('-o', '--output', default=WEATHER_STORE_PATH)
+    parser.add_argument('--days', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    if args.command == 'sample':
+        print(f"Wrote {write_sample(args.data_dir, days=args.days)}")
+    paths = forecast_files(args.data_dir)
+    start = time.perf_counter()
+    store = compile_store(paths)
+    store['source'] = files_fingerprint(paths)
+    save_store(store, args.output)
+    print(f"Compiled {len(paths)} files, {len(store['keys'])} locations, {len(store['time'])} rows "
+          f"in {time.perf_counter() - start:.2f}s -> {args.output}")
+    if args.command == 'show':
+        forecast = WeatherStore(store).lookup(args.location or '')
+        if forecast is None:
+            print(f"No forecast for {args.location!r}", file=sys.stderr)
+            return 1
+        print(forecast.name, forecast.current())
+        print(daily_table(forecast, args.days).to_string(index=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())